@@ -0,0 +1,111 @@
+"""Admission control for the threaded server.
+
+``AdmissionInterceptor`` (app/interceptors.py) asks ``AdmissionController``
+as each call arrives, before it queues for an executor thread, so queued
+calls count against the limit along with running ones. Calls beyond the current limit are refused
+with RESOURCE_EXHAUSTED and a ``grpc-retry-pushback-ms`` hint instead of
+queueing for a database connection until the client gives up.
+
+* The limit adapts (AIMD): every unary call that is not a bulk call reports
+  its latency, measured from arrival so time spent queued for an executor
+  thread counts. Streams (either way) and bulk calls never do. A call
+  slower than the target cuts the limit by ``backoff`` (at most once per
+  target interval); a fast one while the limit is in use adds ``1 / limit``,
+  about one slot per limit's worth of calls.
+* Reads may use the whole limit; writes and bulk calls only their share of
+  it, so under pressure bulk work is shed first and reads last.
+* Some methods (imports, full streams) also have fixed per-method caps.
+
+The executor queue itself is bounded by ``maximum_concurrent_rpcs`` on the
+server (GRPC_MAX_CONCURRENT_RPCS), which gRPC enforces before a thread is
+involved. The adaptive limit tops out below that bound (less the watchers'
+share), so admission sheds with a retry hint before gRPC refuses blankly.
+"""
+import threading
+import time
+from collections import Counter
+
+READ, WRITE, BULK = "read", "write", "bulk"
+BULK_METHODS = frozenset({
+    "ImportBooks", "ImportMembers", "StreamBooks", "StreamMembers", "BorrowBooks", "ReturnBooks",
+})
+# long-lived streams have their own cap (MAX_WATCHERS) and no meaningful latency
+EXEMPT_METHODS = frozenset({"WatchInventory"})
+
+
+def method_class(method: str) -> str:
+    if method in BULK_METHODS:
+        return BULK
+    if method.startswith(("List", "Get", "Search")):
+        return READ
+    return WRITE
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit; callers serialize access."""
+
+    def __init__(self, initial: float, min_limit: float, max_limit: float, target_latency: float,
+                 backoff: float = 0.9):
+        self.limit = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._last_decrease = float("-inf")
+
+    def update(self, latency: float, in_flight: int, now: float):
+        if latency > self.target_latency:
+            # one slow burst is one congestion signal, not one per call in it
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif in_flight * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionController:
+    def __init__(self, limit: AdaptiveLimit, shares: dict, method_limits: dict, clock=time.monotonic):
+        self.adaptive = limit
+        self.shares = shares
+        self.method_limits = method_limits
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._in_flight_by_method = Counter()
+        self.rejected = Counter()
+        # smoothed unary latency in seconds, the basis of the retry hint
+        self.latency = limit.target_latency
+
+    def try_acquire(self, method: str) -> bool:
+        kind = method_class(method)
+        with self._lock:
+            cap = self.method_limits.get(method)
+            if (self.in_flight >= self.adaptive.limit * self.shares.get(kind, 1.0)
+                    or (cap is not None and self._in_flight_by_method[method] >= cap)):
+                self.rejected[kind] += 1
+                return False
+            self.in_flight += 1
+            self._in_flight_by_method[method] += 1
+            return True
+
+    def release(self, method: str, latency: float = None):
+        """End an admitted call; ``latency`` (unary calls only) feeds the adaptive limit."""
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            self._in_flight_by_method[method] -= 1
+            if latency is not None:
+                self.latency += 0.2 * (latency - self.latency)
+                self.adaptive.update(latency, in_flight, self._clock())
+
+    def retry_after_ms(self) -> int:
+        return int(min(5000, max(10, self.latency * 1000)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": round(self.adaptive.limit, 2),
+                "in_flight": self.in_flight,
+                "latency_seconds": round(self.latency, 4),
+                **{f"rejected_{kind}": self.rejected[kind] for kind in (READ, WRITE, BULK)},
+            }
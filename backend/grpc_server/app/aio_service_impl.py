@@ -0,0 +1,320 @@
+"""grpc.aio servicer backed by AsyncSession.
+
+Only the core catalog and loan RPCs below are native coroutines. Everything
+else (imports, search, batch borrow/return, stats, delta sync, history, loan
+lists, fines) is inherited from LibraryServiceImpl unchanged: grpc.aio runs
+those plain handlers on the server's migration thread pool, with the
+synchronous ``SessionLocal`` pool.
+"""
+import generated.library_pb2 as library_pb2
+import grpc
+from google.protobuf import empty_pb2
+from app import validators
+from app.services.aio import book_service, member_service, borrowing_service
+from app.service_impl import (
+    LibraryServiceImpl, _book_to_pb, _member_to_pb, _page,
+    _validate_borrowed_books_request, _borrowed_books_response,
+    _event_to_pb, _validate_watch_request,
+)
+from app.events import EventsLost, inventory_events
+from app.logging_config import logger
+from app import constants
+from app.cache import catalog_cache, catalog_version
+
+class AsyncLibraryServiceImpl(LibraryServiceImpl):
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    async def CreateBook(self, request, context):
+        try:
+            validators.validate_required_str('title', request.title)
+            validators.validate_required_str('author', request.author)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.Book()
+
+        async with self._session_factory() as db:
+            try:
+                book = await book_service.create_book(db, request.title, request.author)
+                return _book_to_pb(book)
+            except Exception as e:
+                logger.exception("CreateBook failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.Book()
+
+    async def ListBooks(self, request, context):
+        return await self._list_books(request, context, only_available=False)
+
+    async def ListAvailableBooks(self, request, context):
+        return await self._list_books(request, context, only_available=True)
+
+    async def _list_books(self, request, context, only_available):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            validators.validate_non_negative_int('after_id', request.after_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BookList()
+
+        version = catalog_version.token("books")
+        if request.if_version == version:
+            return library_pb2.BookList(version=version, not_modified=True)
+        key = ("books", version, only_available, request.after_id, request.page_size)
+        cached = catalog_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = catalog_cache.generation
+        async with self._session_factory() as db:
+            limit = request.page_size + 1 if request.page_size else None
+            books = await book_service.list_books(db, only_available=only_available, after_id=request.after_id, limit=limit)
+            books, next_after_id = _page(books, request.page_size)
+            response = library_pb2.BookList(books=[_book_to_pb(b) for b in books], next_after_id=next_after_id, version=version)
+        catalog_cache.put(key, response, generation)
+        return response
+
+    async def StreamBooks(self, request, context):
+        async with self._session_factory() as db:
+            async for b in book_service.iter_books(db, only_available=request.only_available, after_id=request.after_id):
+                yield _book_to_pb(b)
+
+    async def BorrowBook(self, request, context):
+        try:
+            validators.validate_positive_int('book_id', request.book_id)
+            validators.validate_positive_int('member_id', request.member_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.Empty()
+
+        async with self._session_factory() as db:
+            try:
+                borrowing = await borrowing_service.borrow_book_by_id(db, request.book_id, request.member_id)
+                if borrowing is None:
+                    missing_member = await member_service.get_member(db, request.member_id) is None
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_MEMBER_NOT_FOUND if missing_member
+                                        else constants.MSG_BOOK_NOT_AVAILABLE)
+                    return library_pb2.Empty()
+                return library_pb2.Empty()
+            except Exception as e:
+                logger.exception("BorrowBook failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.Empty()
+
+    async def AddMember(self, request, context):
+        try:
+            validators.validate_required_str('name', request.name)
+            validators.validate_required_str('contact', request.contact)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.Member()
+
+        async with self._session_factory() as db:
+            try:
+                member = await member_service.create_member(db, request.name, request.contact)
+                return _member_to_pb(member)
+            except Exception as e:
+                logger.exception("AddMember failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.Member()
+
+    async def ListMembers(self, request, context):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            validators.validate_non_negative_int('after_id', request.after_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.MemberList()
+
+        version = catalog_version.token("members")
+        if request.if_version == version:
+            return library_pb2.MemberList(version=version, not_modified=True)
+        key = ("members", version, request.after_id, request.page_size)
+        cached = catalog_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = catalog_cache.generation
+        async with self._session_factory() as db:
+            limit = request.page_size + 1 if request.page_size else None
+            members = await member_service.list_members(db, after_id=request.after_id, limit=limit)
+            members, next_after_id = _page(members, request.page_size)
+            response = library_pb2.MemberList(members=[_member_to_pb(m) for m in members], next_after_id=next_after_id, version=version)
+        catalog_cache.put(key, response, generation)
+        return response
+
+    async def StreamMembers(self, request, context):
+        async with self._session_factory() as db:
+            async for m in member_service.iter_members(db, after_id=request.after_id):
+                yield _member_to_pb(m)
+
+    async def ListBorrowedBooks(self, request, context):
+        try:
+            _validate_borrowed_books_request(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BorrowedBooksResponse()
+
+        async with self._session_factory() as db:
+            limit = request.page_size + 1 if request.page_size else None
+            rows = await borrowing_service.list_current_borrowing_rows(
+                db, member_id=request.member_id, book_id=request.book_id, after_id=request.after_id, limit=limit,
+            )
+            return _borrowed_books_response(rows, request.page_size)
+
+    async def ReturnBook(self, request, context):
+        try:
+            validators.validate_positive_int('borrowing_id', request.borrowing_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return empty_pb2.Empty()
+
+        async with self._session_factory() as db:
+            try:
+                if await borrowing_service.return_borrowing_by_id(db, request.borrowing_id) is None:
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_BORROWING_NOT_FOUND)
+                    return empty_pb2.Empty()
+                return empty_pb2.Empty()
+            except Exception as e:
+                logger.exception("ReturnBook failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return empty_pb2.Empty()
+
+    async def UpdateBook(self, request, context):
+        try:
+            validators.validate_positive_int('id', request.id)
+            validators.validate_required_str('title', request.title)
+            validators.validate_required_str('author', request.author)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.Book()
+
+        async with self._session_factory() as db:
+            try:
+                updated = await book_service.update_book_by_id(db, request.id, request.title, request.author)
+                if updated is None:
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_BOOK_NOT_FOUND)
+                    return library_pb2.Book()
+                return _book_to_pb(updated)
+            except Exception as e:
+                logger.exception("UpdateBook failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.Book()
+
+    async def DeleteBook(self, request, context):
+        try:
+            validators.validate_positive_int('id', request.id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return empty_pb2.Empty()
+
+        async with self._session_factory() as db:
+            try:
+                if await book_service.delete_book_by_id(db, request.id) is None:
+                    if await book_service.get_book(db, request.id) is None:
+                        context.set_code(grpc.StatusCode.NOT_FOUND)
+                        context.set_details(constants.MSG_BOOK_NOT_FOUND)
+                    else:
+                        context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                        context.set_details(constants.MSG_CANNOT_DELETE_BORROWED)
+                return empty_pb2.Empty()
+            except Exception as e:
+                logger.exception("DeleteBook failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return empty_pb2.Empty()
+
+    async def UpdateMember(self, request, context):
+        try:
+            validators.validate_positive_int('id', request.id)
+            validators.validate_required_str('name', request.name)
+            validators.validate_required_str('contact', request.contact)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.Member()
+
+        async with self._session_factory() as db:
+            try:
+                updated = await member_service.update_member_by_id(db, request.id, request.name, request.contact)
+                if updated is None:
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_MEMBER_NOT_FOUND)
+                    return library_pb2.Member()
+                return _member_to_pb(updated)
+            except Exception as e:
+                logger.exception("UpdateMember failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.Member()
+
+    async def DeleteMember(self, request, context):
+        try:
+            validators.validate_positive_int('id', request.id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return empty_pb2.Empty()
+
+        async with self._session_factory() as db:
+            try:
+                member = await member_service.get_member(db, request.id)
+                if not member:
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_MEMBER_NOT_FOUND)
+                    return empty_pb2.Empty()
+                # prevent deletion if active borrowings
+                if await borrowing_service.has_active_borrowings(db, member.id):
+                    context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                    context.set_details(constants.MSG_CANNOT_DELETE_MEMBER_WITH_BORROWED)
+                    return empty_pb2.Empty()
+                await member_service.delete_member(db, member)
+                return empty_pb2.Empty()
+            except Exception as e:
+                logger.exception("DeleteMember failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return empty_pb2.Empty()
+
+    async def WatchInventory(self, request, context):
+        # waits on the event loop, so watchers cost no threads and need no cap;
+        # a client disconnect cancels this coroutine at the await
+        try:
+            _validate_watch_request(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return
+        if request.epoch and request.epoch != inventory_events.epoch:
+            context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+            context.set_details(constants.MSG_EVENTS_LOST)
+            return
+        after_seq = request.after_seq or inventory_events.last_seq
+        entities = set(request.entities)
+        # see LibraryServiceImpl.WatchInventory
+        await context.send_initial_metadata(())
+        while True:
+            try:
+                events = await inventory_events.read_async(after_seq, timeout=constants.WATCH_POLL_SECONDS)
+            except EventsLost:
+                context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+                context.set_details(constants.MSG_EVENTS_LOST)
+                return
+            for event in events:
+                after_seq = event.seq
+                if not entities or event.entity in entities:
+                    yield _event_to_pb(event, inventory_events.epoch)
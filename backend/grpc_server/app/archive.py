@@ -0,0 +1,61 @@
+"""Moves returned borrowings past the retention window into ``borrowings_archive``.
+
+Open-loan scans and the DeleteMember check only ever need the hot table, so
+keeping it to open and recent loans keeps them cheap as history grows. The
+job works in batches (``borrowing_service.archive_returned_batch``), each its
+own short transaction, and pauses between them so borrows and returns are
+never queued behind the whole backlog. GetBorrowingHistory reads both tables.
+
+Servers run it every ARCHIVE_INTERVAL_SECONDS; ``python -m app.archive`` runs
+one pass by hand.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, UTC
+from app import constants
+from app.logging_config import logger
+from app.services import borrowing_service
+
+
+def archive_returned(session_factory, retention_days: float = None, batch_size: int = None,
+                     pause: float = None, stop: threading.Event = None) -> int:
+    """Archive every loan returned more than ``retention_days`` ago; returns rows moved."""
+    retention_days = constants.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or constants.ARCHIVE_BATCH_SIZE
+    pause = constants.ARCHIVE_BATCH_PAUSE_SECONDS if pause is None else pause
+    # fixed for the whole pass so loans returned meanwhile cannot keep it going
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+    total = 0
+    while stop is None or not stop.is_set():
+        db = session_factory()
+        try:
+            moved = borrowing_service.archive_returned_batch(db, cutoff, batch_size)
+        finally:
+            db.close()
+        total += moved
+        if moved < batch_size:
+            break
+        time.sleep(pause)
+    if total:
+        logger.info("Borrowings archived", extra={"archived_count": total, "cutoff": cutoff.isoformat()})
+    return total
+
+
+def start_archiver(session_factory, interval: float):
+    """Archive every ``interval`` seconds from a daemon thread; returns a stop Event."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                archive_returned(session_factory, stop=stop)
+            except Exception:
+                logger.exception("Borrowing archival failed")
+
+    threading.Thread(target=run, name="borrowing-archiver", daemon=True).start()
+    return stop
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+    print(f"archived {archive_returned(SessionLocal)} borrowings")
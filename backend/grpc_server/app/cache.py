@@ -0,0 +1,137 @@
+"""In-process read-through cache for catalog list responses, and the catalog
+version tokens clients use to skip re-downloading an unchanged list."""
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from app import constants
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after they are stored.
+
+    Keys are tuples whose first element is a namespace (e.g. ``"books"``) so a
+    write can drop every cached page of one entity with ``invalidate(namespace)``.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # bumped on every invalidation; loads that started earlier are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, generation: int):
+        """Store ``value`` unless the cache was invalidated since ``generation`` was read."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = loader()
+        self.put(key, value, generation)
+        return value
+
+    def invalidate(self, namespace=None):
+        with self._lock:
+            self._generation += 1
+            if namespace is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+class CatalogVersion:
+    """Per-namespace write counters, rendered as ``"<epoch>.<count>"`` tokens.
+
+    The counters live in shared memory allocated at import, before the prefork
+    supervisor forks, so a write in any worker changes the token every worker
+    hands out. ``epoch`` is fixed at the same moment; a restarted server starts
+    counting from zero again under a new epoch, so old tokens never match.
+    The wall-clock time of each namespace's last write is shared the same way.
+    """
+
+    NAMESPACES = ("books", "members")
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:12]
+        self._counters = multiprocessing.Array("q", len(self.NAMESPACES))
+        self._written_at = multiprocessing.Array("d", len(self.NAMESPACES))
+
+    def bump(self, namespace: str):
+        index = self.NAMESPACES.index(namespace)
+        with self._counters.get_lock():
+            self._counters[index] += 1
+            self._written_at[index] = time.time()
+
+    def seconds_since_write(self, namespace: str) -> float:
+        return time.time() - self._written_at[self.NAMESPACES.index(namespace)]
+
+    def current(self, namespace: str) -> int:
+        return self._counters[self.NAMESPACES.index(namespace)]
+
+    def token(self, namespace: str) -> str:
+        return f"{self.epoch}.{self.current(namespace)}"
+
+# shared cache for ListBooks / ListAvailableBooks / ListMembers responses
+catalog_cache = TTLCache(
+    max_entries=constants.CATALOG_CACHE_MAX_ENTRIES,
+    ttl=constants.CATALOG_CACHE_TTL_SECONDS,
+)
+
+catalog_version = CatalogVersion()
+
+def invalidate_books():
+    catalog_version.bump("books")
+    catalog_cache.invalidate("books")
+
+def invalidate_members():
+    catalog_version.bump("members")
+    catalog_cache.invalidate("members")
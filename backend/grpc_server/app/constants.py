@@ -2,10 +2,134 @@
 import os
 
 DEFAULT_GRPC_PORT = int(os.getenv('GRPC_PORT', 50051))
+# apply pending app/migrations at server start-up
+DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', '1').lower() in ('1', 'true', 'yes')
+# Prometheus text endpoint for the threaded server; 0 disables it
+METRICS_PORT = int(os.getenv('METRICS_PORT', 9100))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+# opt-in grpc.aio server (app/server.py:serve_async)
+GRPC_ASYNC = os.getenv('GRPC_ASYNC', '').lower() in ('1', 'true', 'yes')
+# threads per server process; the DB pool defaults to the same size
+GRPC_MAX_WORKERS = int(os.getenv('GRPC_MAX_WORKERS', 10))
+# pre-fork mode: worker processes sharing GRPC_PORT via SO_REUSEPORT; 1 keeps a single process
+GRPC_WORKERS = int(os.getenv('GRPC_WORKERS', 1))
+GRPC_SHUTDOWN_GRACE_SECONDS = float(os.getenv('GRPC_SHUTDOWN_GRACE_SECONDS', 10))
+# pause before restarting a worker that exited unexpectedly
+WORKER_RESTART_DELAY_SECONDS = float(os.getenv('WORKER_RESTART_DELAY_SECONDS', 1))
+
+# connection pool (QueuePool); checkout beyond size + overflow waits up to the timeout
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', GRPC_MAX_WORKERS))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 5))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', 30))
+# connections older than this are replaced on checkout; -1 keeps them forever
+DB_POOL_RECYCLE_SECONDS = int(os.getenv('DB_POOL_RECYCLE_SECONDS', 1800))
+# ping a connection on checkout only if it sat idle this long; 0 pings every checkout, -1 never
+DB_PRE_PING_IDLE_SECONDS = float(os.getenv('DB_PRE_PING_IDLE_SECONDS', 30))
+
+# how often GetLibraryStats counters are recounted from the database; 0 only at start-up
+STATS_RECONCILE_SECONDS = float(os.getenv('STATS_RECONCILE_SECONDS', 300))
+
+# borrowing archival (app/archive.py): returned loans older than the retention move to
+# borrowings_archive in batches of ARCHIVE_BATCH_SIZE, each its own short transaction,
+# with a pause between batches for other writers; an interval of 0 disables the job
+ARCHIVE_RETENTION_DAYS = float(os.getenv('ARCHIVE_RETENTION_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+ARCHIVE_BATCH_PAUSE_SECONDS = float(os.getenv('ARCHIVE_BATCH_PAUSE_SECONDS', 0.1))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv('ARCHIVE_INTERVAL_SECONDS', 3600))
+
+# loans and fines (app/fines.py): a loan is due LOAN_PERIOD_DAYS after it is borrowed and
+# each full day overdue costs FINE_PER_DAY_CENTS, up to MAX_FINE_CENTS per loan. The
+# scanner re-assesses open loans every OVERDUE_SCAN_SECONDS (0 disables it)
+LOAN_PERIOD_DAYS = int(os.getenv('LOAN_PERIOD_DAYS', 14))
+FINE_PER_DAY_CENTS = int(os.getenv('FINE_PER_DAY_CENTS', 25))
+MAX_FINE_CENTS = int(os.getenv('MAX_FINE_CENTS', 1000))
+OVERDUE_SCAN_SECONDS = float(os.getenv('OVERDUE_SCAN_SECONDS', 3600))
+OVERDUE_SCAN_BATCH_SIZE = int(os.getenv('OVERDUE_SCAN_BATCH_SIZE', 1000))
+
+# idempotency keys (app/idempotency.py): CreateBook / AddMember / BorrowBook calls carrying
+# an "idempotency-key" metadata entry are answered once; repeats within the TTL get the first
+# response. IDEMPOTENCY_DB also records keys in the database, so every GRPC_WORKERS process
+# and a restarted server see them
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv('IDEMPOTENCY_TTL_SECONDS', 86400))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv('IDEMPOTENCY_MAX_KEYS', 10000))
+IDEMPOTENCY_DB = os.getenv('IDEMPOTENCY_DB', '').lower() in ('1', 'true', 'yes')
+# how long a repeat waits for the first call with its key to finish
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', 10))
+# a database claim without a response this old belongs to a call that died; a repeat takes it
+# over. Keep it a few times longer than the longest deadline clients set on guarded calls
+IDEMPOTENCY_CLAIM_LEASE_SECONDS = float(os.getenv('IDEMPOTENCY_CLAIM_LEASE_SECONDS', 60))
+
+# admission control (app/admission.py): calls beyond an adaptive concurrency limit fail fast
+# with RESOURCE_EXHAUSTED. Calls count from arrival, queued for a thread or running. The limit
+# starts at GRPC_MAX_WORKERS and moves between ADMISSION_MIN_LIMIT and GRPC_MAX_CONCURRENT_RPCS
+# less MAX_WATCHERS, shrinking when unary calls (queue time included) take longer than the
+# target; writes and bulk calls (imports, full streams, batch borrow/return) may only use
+# their share of it
+ADMISSION_CONTROL = os.getenv('ADMISSION_CONTROL', '1').lower() in ('1', 'true', 'yes')
+ADMISSION_TARGET_LATENCY_MS = float(os.getenv('ADMISSION_TARGET_LATENCY_MS', 250))
+ADMISSION_MIN_LIMIT = int(os.getenv('ADMISSION_MIN_LIMIT', 2))
+ADMISSION_WRITE_SHARE = float(os.getenv('ADMISSION_WRITE_SHARE', 0.8))
+ADMISSION_BULK_SHARE = float(os.getenv('ADMISSION_BULK_SHARE', 0.5))
+# fixed caps for single methods, "Method=limit,..."
+ADMISSION_METHOD_LIMITS = {
+    name.strip(): int(limit)
+    for name, _, limit in (
+        item.partition('=') for item in os.getenv('ADMISSION_METHOD_LIMITS', 'ImportBooks=2,ImportMembers=2').split(',')
+    )
+    if name.strip()
+}
+# RPCs accepted per process, running or queued for a thread; gRPC refuses the rest before
+# they reach the executor. 0 leaves it unbounded
+GRPC_MAX_CONCURRENT_RPCS = int(os.getenv('GRPC_MAX_CONCURRENT_RPCS', GRPC_MAX_WORKERS * 4))
+
+# read replicas (DATABASE_REPLICA_URLS, app/database.py): how far replicas may lag the
+# primary. A caller's reads stay on the primary this long after its last write, and cached
+# catalog lists are only loaded from a replica once their entity saw no write for as long
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))
+
+# WatchInventory: events kept for resuming clients, and concurrent watchers on the
+# threaded server (each holds an executor thread; grpc.aio watchers do not)
+EVENT_BUFFER_SIZE = int(os.getenv('EVENT_BUFFER_SIZE', 10000))
+MAX_WATCHERS = int(os.getenv('MAX_WATCHERS', max(1, GRPC_MAX_WORKERS // 2)))
+# how often an idle watch stream checks that its client is still connected
+WATCH_POLL_SECONDS = float(os.getenv('WATCH_POLL_SECONDS', 1))
+
+# list paging / streaming
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+# ListBooksSince / ListMembersSince: default page, and how long a change waits
+# before it is handed out (covers transactions still committing an older updated_at)
+DEFAULT_SYNC_PAGE_SIZE = int(os.getenv('DEFAULT_SYNC_PAGE_SIZE', 500))
+SYNC_SETTLE_SECONDS = float(os.getenv('SYNC_SETTLE_SECONDS', 1))
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+
+# SearchBooks page size when the request leaves page_size at 0
+DEFAULT_SEARCH_PAGE_SIZE = int(os.getenv('DEFAULT_SEARCH_PAGE_SIZE', 50))
+
+# GetBorrowingHistory / ListMemberLoans / ListBookLoans / ListOverdueLoans page size when the request leaves page_size at 0
+DEFAULT_HISTORY_PAGE_SIZE = int(os.getenv('DEFAULT_HISTORY_PAGE_SIZE', 100))
+
+# bulk import: rows per multi-row INSERT / commit
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))
+
+# largest id list accepted by BorrowBooks / ReturnBooks
+MAX_BATCH_ITEMS = int(os.getenv('MAX_BATCH_ITEMS', 500))
+
+# catalog list cache (app/cache.py); a TTL or size of 0 disables it
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv('CATALOG_CACHE_TTL_SECONDS', 30))
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv('CATALOG_CACHE_MAX_ENTRIES', 256))
 
 MSG_BOOK_NOT_FOUND = "Book not found"
 MSG_BOOK_NOT_AVAILABLE = "Book not available"
 MSG_BORROWING_NOT_FOUND = "Borrowing record not found"
 MSG_MEMBER_NOT_FOUND = "Member not found"
+MSG_DUPLICATE_ITEM = "Duplicate id in batch"
+MSG_BATCH_ROLLED_BACK = "Not applied: another item in the batch failed"
+MSG_DUPLICATE_BOOK = "Book with this title and author already exists"
+MSG_DUPLICATE_MEMBER = "Member with this contact already exists"
 MSG_CANNOT_DELETE_BORROWED = "Cannot delete a borrowed book"
 MSG_CANNOT_DELETE_MEMBER_WITH_BORROWED = "Cannot delete member with borrowed books"
+MSG_EVENTS_LOST = "Events after this position are no longer available; re-list and watch from now"
+MSG_TOO_MANY_WATCHERS = "Too many WatchInventory streams on this server"
+MSG_IDEMPOTENCY_KEY_REUSED = "Idempotency key was already used for a different request"
+MSG_IDEMPOTENT_CALL_IN_PROGRESS = "A call with this idempotency key is still in progress"
+MSG_OVERLOADED = "Server is overloaded; retry after the time in grpc-retry-pushback-ms"
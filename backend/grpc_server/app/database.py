@@ -1,26 +1,313 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import contextvars
+import itertools
 import os
+import threading
+import time
 from typing import Optional
+from app import constants
 
 # Database utilities - expose helpers so tests can create an in-memory engine
 DATABASE_URL = os.getenv("DATABASE_URL") or "sqlite:///./library.db"
+# optional comma-separated read replicas of DATABASE_URL (see RoutingSession)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+
+class PoolTelemetry:
+	"""Counters for checkout waits and connection churn, read by ``pool_stats``."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.checkouts = 0
+		self.checkout_wait_seconds_sum = 0.0
+		self.checkout_wait_seconds_max = 0.0
+		self.checkout_timeouts = 0
+		self.connects = 0
+		self.closes = 0
+		self.invalidations = 0
+		self.pings = 0
+		self.ping_failures = 0
+
+	def record_wait(self, seconds: float, timed_out: bool = False):
+		with self._lock:
+			if timed_out:
+				self.checkout_timeouts += 1
+				return
+			self.checkouts += 1
+			self.checkout_wait_seconds_sum += seconds
+			self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, seconds)
+
+	def incr(self, name: str):
+		with self._lock:
+			setattr(self, name, getattr(self, name) + 1)
+
+	def snapshot(self) -> dict:
+		with self._lock:
+			return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+
+class _TimedCheckout:
+	"""Pool mixin timing how long ``connect()`` waits for a free connection."""
+
+	telemetry = None
+
+	def _do_get(self):
+		start = time.perf_counter()
+		try:
+			conn = super()._do_get()
+		except exc.TimeoutError:
+			if self.telemetry is not None:
+				self.telemetry.record_wait(time.perf_counter() - start, timed_out=True)
+			raise
+		if self.telemetry is not None:
+			self.telemetry.record_wait(time.perf_counter() - start)
+		return conn
+
+	def recreate(self):
+		# dispose() swaps in a fresh pool; keep counting into the same telemetry
+		pool = super().recreate()
+		pool.telemetry = self.telemetry
+		return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+	pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+	pass
+
+
+def _pool_args(database_url: str, poolclass) -> dict:
+	url = make_url(database_url)
+	if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+		# in-memory SQLite keeps one connection per thread; queue settings do not apply
+		return {}
+	return {
+		"poolclass": poolclass,
+		"pool_size": constants.DB_POOL_SIZE,
+		"max_overflow": constants.DB_MAX_OVERFLOW,
+		"pool_timeout": constants.DB_POOL_TIMEOUT_SECONDS,
+		"pool_recycle": constants.DB_POOL_RECYCLE_SECONDS,
+	}
+
+def _instrument_pool(engine, idle_ping_seconds: float = None):
+	"""Attach telemetry and idle-based liveness checks to ``engine``'s pool.
+
+	Unlike ``pool_pre_ping``, which costs a round trip on every checkout, a
+	connection is only pinged when it has been idle for ``idle_ping_seconds``;
+	a failed ping makes the pool discard it and connect again.
+	"""
+	if idle_ping_seconds is None:
+		idle_ping_seconds = constants.DB_PRE_PING_IDLE_SECONDS
+	telemetry = PoolTelemetry()
+	engine.pool.telemetry = telemetry
+
+	@event.listens_for(engine, "connect")
+	def _on_connect(dbapi_connection, record):
+		telemetry.incr("connects")
+
+	@event.listens_for(engine, "close")
+	def _on_close(dbapi_connection, record):
+		telemetry.incr("closes")
+
+	@event.listens_for(engine, "invalidate")
+	def _on_invalidate(dbapi_connection, record, exception):
+		telemetry.incr("invalidations")
+
+	@event.listens_for(engine, "checkin")
+	def _on_checkin(dbapi_connection, record):
+		record.info["checked_in_at"] = time.monotonic()
+
+	@event.listens_for(engine, "checkout")
+	def _on_checkout(dbapi_connection, record, proxy):
+		if idle_ping_seconds < 0:
+			return
+		checked_in_at = record.info.get("checked_in_at")
+		if checked_in_at is None or time.monotonic() - checked_in_at < idle_ping_seconds:
+			return
+		telemetry.incr("pings")
+		try:
+			cursor = dbapi_connection.cursor()
+			try:
+				cursor.execute("SELECT 1")
+			finally:
+				cursor.close()
+		except Exception as e:
+			telemetry.incr("ping_failures")
+			raise exc.DisconnectionError() from e
+	return engine
+
+class RequestDeadline:
+	"""Deadline (a ``time.monotonic()`` value, or None) and liveness of the request a thread serves."""
+
+	def __init__(self, deadline: Optional[float] = None, is_active=lambda: True):
+		self.deadline = deadline
+		self.is_active = is_active
+
+	def remaining(self) -> Optional[float]:
+		return None if self.deadline is None else self.deadline - time.monotonic()
+
+	def abandoned(self) -> bool:
+		return not self.is_active() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+
+class RequestAbandoned(Exception):
+	"""A statement was about to run for a request whose deadline passed or whose client went away."""
+
+
+# Set around an RPC by interceptors.DeadlineInterceptor. Transactions begun
+# meanwhile are bounded by its deadline, and its statements stop once it is
+# abandoned, so the connection goes back to the pool instead of finishing
+# work nobody will read.
+request_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+# SQLite VM instructions between two checks of the request by the progress handler
+_PROGRESS_STEPS = 1000
+
+
+@event.listens_for(Session, "after_begin")
+def _bound_transaction(session, transaction, connection):
+	request = request_deadline.get()
+	if request is None:
+		return
+	backend = connection.dialect.name
+	if backend == "sqlite":
+		# returning True from the handler interrupts the running statement
+		connection.connection.dbapi_connection.set_progress_handler(request.abandoned, _PROGRESS_STEPS)
+		return
+	remaining = request.remaining()
+	if backend == "postgresql" and remaining is not None:
+		# ends with the transaction, so pooled connections never keep it
+		connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(remaining * 1000))}")
+
+
+def _enforce_deadlines(engine):
+	"""Refuse statements of abandoned requests and drop SQLite progress handlers at checkin."""
+
+	@event.listens_for(engine, "before_cursor_execute")
+	def _check_request(conn, cursor, statement, parameters, context, executemany):
+		request = request_deadline.get()
+		if request is not None and request.abandoned():
+			raise RequestAbandoned("request deadline passed or client cancelled")
+
+	if engine.dialect.name == "sqlite":
+		@event.listens_for(engine, "checkin")
+		def _clear_progress_handler(dbapi_connection, record):
+			if dbapi_connection is not None:
+				dbapi_connection.set_progress_handler(None, 0)
+	return engine
 
 def _create_engine(database_url: str):
 	connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-	return create_engine(database_url, pool_pre_ping=True, connect_args=connect_args)
+	engine = create_engine(database_url, connect_args=connect_args, **_pool_args(database_url, TimedQueuePool))
+	return _enforce_deadlines(_instrument_pool(engine))
+
+class ReplicaPool:
+	"""Round-robin over the engines of the read replicas."""
+
+	def __init__(self, engines):
+		self.engines = list(engines)
+		self._next = itertools.cycle(self.engines)
+		self._lock = threading.Lock()
+
+	def __bool__(self):
+		return bool(self.engines)
+
+	def next(self):
+		with self._lock:
+			return next(self._next)
+
+
+# Set by interceptors.ReplicaRoutingInterceptor while serving a read that
+# may see data up to REPLICA_MAX_LAG_SECONDS old.
+replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+class RoutingSession(Session):
+	"""Session that reads from a replica while ``replica_reads`` is set.
+
+	The replica is picked once per session, so all reads of a request see one
+	snapshot; flushes and INSERT / UPDATE / DELETE always go to the primary
+	(the session's ``bind``).
+	"""
+
+	def __init__(self, *args, replicas: Optional[ReplicaPool] = None, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.replicas = replicas
+		self.replica = None
+
+	def get_bind(self, mapper=None, clause=None, **kw):
+		if (self.replicas and replica_reads.get() and not self._flushing
+				and not getattr(clause, "is_dml", False)):
+			if self.replica is None:
+				self.replica = self.replicas.next()
+			return self.replica
+		return super().get_bind(mapper, clause=clause, **kw)
+
 
 # default engine used by the application
 engine = _create_engine(DATABASE_URL)
+replica_pool = ReplicaPool(_create_engine(url) for url in DATABASE_REPLICA_URLS)
 
-# default sessionmaker
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# default sessionmaker. Sessions live for one RPC and every write already
+# knows its values (python-side defaults, ids from INSERT ... RETURNING), so
+# commit does not expire them and reading them back costs no extra SELECT.
+SessionLocal = sessionmaker(
+	class_=RoutingSession, replicas=replica_pool,
+	autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+)
 
 # helper for tests to create a sessionmaker from a custom engine/url
 def get_engine(database_url: Optional[str] = None):
 	url = database_url or DATABASE_URL
 	return _create_engine(url)
 
-def get_sessionmaker_from_engine(engine):
-	return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_sessionmaker_from_engine(engine, replica_engines=()):
+	return sessionmaker(
+		class_=RoutingSession, replicas=ReplicaPool(replica_engines),
+		autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+	)
+
+
+# asyncio variants used by the grpc.aio server (app/aio_service_impl.py).
+# Created on demand so the threaded server never needs asyncpg/aiosqlite.
+def _async_url(database_url: str) -> str:
+	if database_url.startswith("postgresql://"):
+		return "postgresql+asyncpg://" + database_url[len("postgresql://"):]
+	if database_url.startswith("sqlite://"):
+		return "sqlite+aiosqlite://" + database_url[len("sqlite://"):]
+	return database_url
+
+def get_async_engine(database_url: Optional[str] = None):
+	url = _async_url(database_url or DATABASE_URL)
+	engine = create_async_engine(url, **_pool_args(url, TimedAsyncQueuePool))
+	_instrument_pool(engine.sync_engine)
+	return engine
+
+def get_async_sessionmaker_from_engine(engine):
+	# objects are read after commit outside the greenlet, so never expire them
+	return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
+def pool_stats(engine=None) -> dict:
+	"""Snapshot of connection-pool occupancy and telemetry (QueuePool; other pools report what they can)."""
+	engine = engine or globals()["engine"]
+	pool = getattr(engine, "sync_engine", engine).pool
+	stats = {}
+	for name in ("size", "checkedin", "checkedout", "overflow"):
+		fn = getattr(pool, name, None)
+		if callable(fn):
+			stats[name] = fn()
+	if isinstance(pool, QueuePool):
+		# share of the hard limit (size + max_overflow) currently checked out
+		capacity = pool.size() + max(pool._max_overflow, 0)
+		stats["capacity"] = capacity
+		stats["saturation"] = stats["checkedout"] / capacity if capacity else 0.0
+	telemetry = getattr(pool, "telemetry", None)
+	if telemetry is not None:
+		stats.update(telemetry.snapshot())
+	return stats
@@ -0,0 +1,102 @@
+"""In-process inventory change feed behind WatchInventory.
+
+Write paths publish each change once, after commit; every subscriber reads
+the same bounded ring buffer, so fan-out costs no per-subscriber copies.
+Sequence numbers are per process and start at 1; ``epoch`` identifies the
+process so a client resuming against a restarted (or different) server can
+tell its sequence number no longer means anything. Each pre-fork worker
+calls ``reset`` after the fork, so every worker has its own epoch and a
+resume that lands on another worker is refused with OUT_OF_RANGE.
+"""
+import asyncio
+import itertools
+import threading
+import uuid
+from collections import deque, namedtuple
+from typing import List
+from app import constants
+
+Event = namedtuple("Event", "seq entity action id data")
+
+class EventsLost(Exception):
+    """The requested position has been pruned from the buffer (or never existed)."""
+
+class EventBus:
+    def __init__(self, capacity: int):
+        self.epoch = uuid.uuid4().hex[:16]
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=capacity)
+        self._seq = 0
+        # (loop, asyncio.Event) pairs of grpc.aio subscribers waiting for a publish
+        self._async_waiters = set()
+
+    def reset(self):
+        """Drop every buffered event and start over under a new epoch."""
+        with self._cond:
+            self.epoch = uuid.uuid4().hex[:16]
+            self._events.clear()
+            self._seq = 0
+            self._async_waiters = set()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, entity: str, action: str, entity_id: int, **data) -> int:
+        with self._cond:
+            self._seq += 1
+            self._events.append(Event(self._seq, entity, action, entity_id, data))
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, set()
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass  # that subscriber's loop has already shut down
+        return self._seq
+
+    def _since(self, after_seq: int) -> List[Event]:
+        # caller holds the lock; the buffer always holds seqs (_seq - len, _seq]
+        first = self._seq - len(self._events) + 1
+        if after_seq > self._seq or after_seq + 1 < first:
+            raise EventsLost(after_seq)
+        return list(itertools.islice(self._events, after_seq + 1 - first, None))
+
+    def read(self, after_seq: int, timeout: float = None) -> List[Event]:
+        """Events after ``after_seq``, blocking up to ``timeout`` for the next one."""
+        with self._cond:
+            if after_seq == self._seq:
+                self._cond.wait(timeout)
+            return self._since(after_seq)
+
+    async def read_async(self, after_seq: int, timeout: float = None) -> List[Event]:
+        """``read`` for coroutines: waits on the event loop instead of a thread."""
+        with self._cond:
+            if after_seq != self._seq:
+                return self._since(after_seq)
+            waiter = asyncio.Event()
+            entry = (asyncio.get_running_loop(), waiter)
+            self._async_waiters.add(entry)
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(entry)
+        with self._cond:
+            return self._since(after_seq)
+
+inventory_events = EventBus(constants.EVENT_BUFFER_SIZE)
+
+def publish(entity: str, action: str, entity_id: int, **data) -> int:
+    return inventory_events.publish(entity, action, entity_id, **data)
+
+def publish_book(action: str, book) -> int:
+    return publish("book", action, book.id, title=book.title, author=book.author, available=bool(book.available))
+
+def publish_member(action: str, member) -> int:
+    return publish("member", action, member.id, name=member.name, contact=member.contact)
+
+def publish_borrowing(action: str, borrowing_id: int, book_id: int, member_id: int) -> int:
+    return publish("borrowing", action, borrowing_id, book_id=book_id, member_id=member_id)
@@ -0,0 +1,107 @@
+"""Due dates, overdue days and fines.
+
+A loan is due LOAN_PERIOD_DAYS after it is borrowed; every full day past due
+costs FINE_PER_DAY_CENTS, capped at MAX_FINE_CENTS per loan. The amounts are
+stored on the borrowing:
+
+* open loans are re-assessed by ``scan_overdue``, which walks
+  ``ix_borrowings_open_due`` in batches, one short transaction each, and
+  writes back only the loans whose amounts changed with one executemany
+  UPDATE per batch; it runs once at start-up and then every interval;
+* a late return fixes the final amount in the return transaction.
+
+ListOverdueLoans and GetMemberFines read open loans through
+``with_current_fines``, so what a member owes never depends on when the
+scanner last ran.
+"""
+import threading
+from datetime import datetime, timedelta, UTC
+from types import SimpleNamespace
+from typing import Iterable, List, Optional, Tuple
+from app import constants
+from app.logging_config import logger
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite (and Postgres TIMESTAMP) columns come back naive; they are stored in UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def due_date(borrowed_at: datetime) -> datetime:
+    return borrowed_at + timedelta(days=constants.LOAN_PERIOD_DAYS)
+
+
+def assess(due_at: Optional[datetime], as_of: datetime) -> Tuple[int, int]:
+    """``(overdue_days, fine_cents)`` of a loan due at ``due_at``, as of ``as_of``."""
+    if due_at is None:
+        return 0, 0
+    days = max(0, (_utc(as_of) - _utc(due_at)).days)
+    return days, min(days * constants.FINE_PER_DAY_CENTS, constants.MAX_FINE_CENTS)
+
+
+def with_current_fines(rows: Iterable, as_of: datetime) -> list:
+    """Loan rows with the amounts of still-open loans assessed as of ``as_of`` rather than
+    as of the last scan; returned loans keep their final amounts."""
+    current = []
+    for row in rows:
+        if row.returned_at is None:
+            days, fine = assess(row.due_at, as_of)
+            row = SimpleNamespace(**{**row._asdict(), "overdue_days": days, "fine_cents": fine})
+        current.append(row)
+    return current
+
+
+def assessments(rows: Iterable, as_of: datetime) -> List[dict]:
+    """Parameter sets for ``borrowing_service.apply_assessments`` from
+    ``(id, due_at, overdue_days, fine_cents)`` rows, skipping loans whose amounts are unchanged."""
+    changed = []
+    for loan_id, due_at, overdue_days, fine_cents in rows:
+        days, fine = assess(due_at, as_of)
+        if (days, fine) != (overdue_days, fine_cents):
+            changed.append({"loan_id": loan_id, "overdue_days": days, "fine_cents": fine})
+    return changed
+
+
+def scan_overdue(session_factory, batch_size: int = None, as_of: datetime = None,
+                 stop: threading.Event = None) -> int:
+    """Re-assess every open loan past its due date; returns the number of loans updated."""
+    from app.services import borrowing_service
+    batch_size = batch_size or constants.OVERDUE_SCAN_BATCH_SIZE
+    as_of = as_of or datetime.now(UTC)
+    position, updated = None, 0
+    while stop is None or not stop.is_set():
+        db = session_factory()
+        try:
+            rows = borrowing_service.overdue_assessment_batch(db, as_of, position, batch_size)
+            changed = assessments(rows, as_of)
+            if changed:
+                borrowing_service.apply_assessments(db, changed, open_only=True)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        updated += len(changed)
+        if len(rows) < batch_size:
+            break
+        position = (rows[-1].due_at, rows[-1].id)
+    if updated:
+        logger.info("Overdue loans assessed", extra={"updated_count": updated})
+    return updated
+
+
+def start_scanner(session_factory, interval: float):
+    """Scan now and then every ``interval`` seconds from a daemon thread; returns a stop Event."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.is_set():
+            try:
+                scan_overdue(session_factory, stop=stop)
+            except Exception:
+                logger.exception("Overdue scan failed")
+            stop.wait(interval)
+
+    threading.Thread(target=run, name="overdue-scanner", daemon=True).start()
+    return stop
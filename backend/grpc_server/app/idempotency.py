@@ -0,0 +1,187 @@
+"""Idempotency keys for write RPCs: a repeated call gets the first call's response.
+
+``IdempotencyInterceptor`` (app/interceptors.py) looks for an
+``idempotency-key`` metadata entry on the methods it guards. The first call
+with a key claims it and runs; if it succeeds its serialized response is kept
+for IDEMPOTENCY_TTL_SECONDS. A repeat with the same key and request gets that
+response back without running the handler, and a repeat that arrives while
+the first call is still running waits for it. Failed calls release the key so
+the client can simply retry. Reusing a key for a different request is refused.
+
+Keys live in a bounded in-memory TTL cache. With a ``session_factory``
+(IDEMPOTENCY_DB) they are also written to ``idempotency_keys``, so a retry that
+lands on another pre-fork worker or a restarted server still finds them. The
+response is recorded after the handler's transaction commits; a crash in that
+gap lets one retry repeat the work. A claim the database holds without a
+response for longer than ``claim_lease`` seconds is taken to belong to a call
+that died with its process, and the next repeat takes it over instead of
+failing with ABORTED until the TTL runs out. The lease must outlast the
+slowest call, or a repeat can run alongside it.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Optional, Tuple
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from app.cache import TTLCache
+from app.logging_config import logger
+from app.models import IdempotencyKey
+
+DONE, CLAIMED, MISMATCH, BUSY = "done", "claimed", "mismatch", "busy"
+# how often a repeat polls the database for a claim held by another process
+_DB_POLL_SECONDS = 0.05
+
+
+class IdempotencyStore:
+    def __init__(self, ttl: float, max_entries: int, session_factory=None, wait_seconds: float = 10.0,
+                 claim_lease: float = 60.0):
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.claim_lease = claim_lease
+        self._session_factory = session_factory
+        self._cache = TTLCache(max_entries, ttl)
+        self._lock = threading.Lock()
+        # key -> Event set when the call holding the claim in this process ends
+        self._running = {}
+        self.replays = 0
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[bytes]]:
+        """Claim ``key`` or find how its first call went.
+
+        Returns ``(DONE, response)``, ``(CLAIMED, None)`` (run the call, then
+        ``finish`` or ``abort``), ``(MISMATCH, None)`` for a key used with a
+        different request, or ``(BUSY, None)`` if the first call did not finish
+        within ``wait_seconds``.
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            with self._lock:
+                found = self._lookup(key, fingerprint)
+                if found is not None:
+                    return found
+                running = self._running.get(key)
+                if running is None:
+                    self._running[key] = threading.Event()
+                    break
+            if not running.wait(max(0.0, deadline - time.monotonic())):
+                return BUSY, None
+        if self._session_factory is None:
+            return CLAIMED, None
+        try:
+            outcome = self._claim_in_db(key, fingerprint, deadline)
+        except Exception:
+            self._release(key)
+            raise
+        if outcome[0] != CLAIMED:
+            self._release(key)
+        return outcome
+
+    def finish(self, key: str, fingerprint: str, response: bytes):
+        """Record the successful response of the claiming call."""
+        try:
+            self._cache.put(key, (fingerprint, response), self._cache.generation)
+            if self._session_factory is not None:
+                db = self._session_factory()
+                try:
+                    db.execute(update(IdempotencyKey).where(IdempotencyKey.key == key).values(response=response))
+                    db.commit()
+                finally:
+                    db.close()
+        finally:
+            self._release(key)
+
+    def abort(self, key: str):
+        """Give up the claim of a call that failed, so a retry runs it again."""
+        try:
+            if self._session_factory is not None:
+                db = self._session_factory()
+                try:
+                    db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.response == None))
+                    db.commit()
+                finally:
+                    db.close()
+        finally:
+            self._release(key)
+
+    def _lookup(self, key, fingerprint):
+        # caller holds the lock
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] != fingerprint:
+            return MISMATCH, None
+        self.replays += 1
+        return DONE, entry[1]
+
+    def _release(self, key):
+        with self._lock:
+            running = self._running.pop(key, None)
+        if running is not None:
+            running.set()
+
+    def _claim_in_db(self, key, fingerprint, deadline):
+        while True:
+            db = self._session_factory()
+            try:
+                # a response older than the TTL no longer counts, nor a claim past its lease
+                db.execute(delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    or_(
+                        IdempotencyKey.created_at < _expired_before(self.ttl),
+                        and_(IdempotencyKey.response == None,
+                             IdempotencyKey.created_at < _expired_before(self.claim_lease)),
+                    ),
+                ))
+                db.execute(insert(IdempotencyKey).values(key=key, fingerprint=fingerprint, created_at=datetime.now(UTC)))
+                db.commit()
+                return CLAIMED, None
+            except IntegrityError:
+                db.rollback()
+                row = db.execute(
+                    select(IdempotencyKey.fingerprint, IdempotencyKey.response).where(IdempotencyKey.key == key)
+                ).first()
+            finally:
+                db.close()
+            if row is None:
+                continue  # released since our insert failed; try again
+            if row.fingerprint != fingerprint:
+                return MISMATCH, None
+            if row.response is not None:
+                self._cache.put(key, (fingerprint, row.response), self._cache.generation)
+                with self._lock:
+                    self.replays += 1
+                return DONE, row.response
+            if time.monotonic() >= deadline:
+                return BUSY, None
+            time.sleep(_DB_POLL_SECONDS)
+
+
+def _expired_before(ttl: float) -> datetime:
+    return datetime.now(UTC) - timedelta(seconds=ttl)
+
+
+def purge_expired(session_factory, ttl: float) -> int:
+    """Delete database keys older than ``ttl`` seconds; returns the number removed."""
+    db = session_factory()
+    try:
+        removed = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < _expired_before(ttl))).rowcount
+        db.commit()
+        return removed
+    finally:
+        db.close()
+
+
+def start_purger(session_factory, ttl: float, interval: float):
+    """Purge expired database keys every ``interval`` seconds; returns a stop Event."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                purge_expired(session_factory, ttl)
+            except Exception:
+                logger.exception("Idempotency key purge failed")
+
+    threading.Thread(target=run, name="idempotency-purger", daemon=True).start()
+    return stop
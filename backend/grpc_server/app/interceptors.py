@@ -0,0 +1,303 @@
+"""gRPC server interceptors for the threaded server."""
+import hashlib
+import time
+import weakref
+import grpc
+from app import admission, constants, idempotency, validators
+from app.cache import TTLCache, catalog_version
+from app.database import RequestDeadline, replica_reads, request_deadline
+from app.logging_config import logger
+from app.metrics import rpc_metrics
+
+def wrap_handler(handler, wrap):
+    """Return a copy of ``handler`` whose behavior is ``wrap(behavior, streams_response)``."""
+    if handler is None:
+        return None
+    if handler.unary_unary:
+        return grpc.unary_unary_rpc_method_handler(
+            wrap(handler.unary_unary, False),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+    if handler.unary_stream:
+        return grpc.unary_stream_rpc_method_handler(
+            wrap(handler.unary_stream, True),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+    if handler.stream_unary:
+        return grpc.stream_unary_rpc_method_handler(
+            wrap(handler.stream_unary, False),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+    return grpc.stream_stream_rpc_method_handler(
+        wrap(handler.stream_stream, True),
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+def _code_name(context, failed=False):
+    code = context.code()
+    if code is None:
+        code = grpc.StatusCode.UNKNOWN if failed else grpc.StatusCode.OK
+    return code.name
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Records count, status code, in-flight gauge and latency for every RPC."""
+
+    def __init__(self, metrics=rpc_metrics):
+        self._metrics = metrics
+
+    def intercept_service(self, continuation, handler_call_details):
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        metrics = self._metrics
+
+        def wrap(behavior, streams_response):
+            if streams_response:
+                def observed_stream(request, context):
+                    metrics.started(method)
+                    start, failed = time.perf_counter(), True
+                    try:
+                        yield from behavior(request, context)
+                        failed = False
+                    finally:
+                        metrics.finished(method, _code_name(context, failed), time.perf_counter() - start)
+                return observed_stream
+
+            def observed(request, context):
+                metrics.started(method)
+                start, failed = time.perf_counter(), True
+                try:
+                    response = behavior(request, context)
+                    failed = False
+                    return response
+                finally:
+                    metrics.finished(method, _code_name(context, failed), time.perf_counter() - start)
+            return observed
+
+        return wrap_handler(continuation(handler_call_details), wrap)
+
+IDEMPOTENCY_METADATA_KEY = "idempotency-key"
+# the stored key is "<method>:<client key>" in a VARCHAR(255)
+MAX_IDEMPOTENCY_KEY_LENGTH = 200
+
+class IdempotencyInterceptor(grpc.ServerInterceptor):
+    """Answers repeated calls of unary ``methods`` (name -> response class) that carry
+    the same ``idempotency-key`` metadata with the first call's response; see app/idempotency.py."""
+
+    def __init__(self, store, methods):
+        self._store = store
+        self._methods = methods
+
+    def intercept_service(self, continuation, handler_call_details):
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        handler = continuation(handler_call_details)
+        response_class = self._methods.get(method)
+        key = dict(handler_call_details.invocation_metadata or ()).get(IDEMPOTENCY_METADATA_KEY)
+        if response_class is None or not key:
+            return handler
+        store, scoped = self._store, f"{method}:{key}"
+
+        def wrap(behavior, streams_response):
+            def deduplicated(request, context):
+                try:
+                    validators.validate_max_length(IDEMPOTENCY_METADATA_KEY, key, MAX_IDEMPOTENCY_KEY_LENGTH)
+                except ValueError as e:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+                    context.set_details(str(e))
+                    return response_class()
+                fingerprint = hashlib.sha256(request.SerializeToString(deterministic=True)).hexdigest()
+                state, stored = store.begin(scoped, fingerprint)
+                if state == idempotency.DONE:
+                    return response_class.FromString(stored)
+                if state != idempotency.CLAIMED:
+                    context.set_code(grpc.StatusCode.INVALID_ARGUMENT if state == idempotency.MISMATCH
+                                     else grpc.StatusCode.ABORTED)
+                    context.set_details(constants.MSG_IDEMPOTENCY_KEY_REUSED if state == idempotency.MISMATCH
+                                        else constants.MSG_IDEMPOTENT_CALL_IN_PROGRESS)
+                    return response_class()
+                try:
+                    response = behavior(request, context)
+                except Exception:
+                    store.abort(scoped)
+                    raise
+                if context.code() not in (None, grpc.StatusCode.OK):
+                    store.abort(scoped)
+                    return response
+                try:
+                    store.finish(scoped, fingerprint, response.SerializeToString())
+                except Exception:
+                    # the write itself succeeded; only a later retry would repeat it
+                    logger.exception("Recording idempotent response failed")
+                return response
+            return deduplicated
+
+        return wrap_handler(handler, wrap)
+
+RETRY_PUSHBACK_METADATA_KEY = "grpc-retry-pushback-ms"
+
+class AdmissionInterceptor(grpc.ServerInterceptor):
+    """Sheds calls the ``controller`` will not admit with RESOURCE_EXHAUSTED; see app/admission.py.
+
+    The decision is taken in ``intercept_service``, as the call arrives, so
+    calls still queued for an executor thread count against the limit and
+    shedding starts before that queue grows. The refusal itself is sent from
+    the executor, where the status and pushback trailer can be set. gRPC
+    never runs the behavior of a call cancelled while it queued; its slot is
+    returned once gRPC drops the handler.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    def intercept_service(self, continuation, handler_call_details):
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        handler = continuation(handler_call_details)
+        if handler is None or method in admission.EXEMPT_METHODS:
+            return handler
+        controller, arrived = self._controller, time.perf_counter()
+        # an upload's duration is the client's pace and a bulk call's its size; neither is load
+        steers_limit = not handler.request_streaming and method not in admission.BULK_METHODS
+        admitted = controller.try_acquire(method)
+        # one release per admitted call, whether the behavior ran or the call died queued
+        held = [admitted]
+
+        def release(latency=None):
+            if held and held.pop():
+                controller.release(method, latency)
+
+        def admit(context):
+            if not admitted:
+                context.set_trailing_metadata(((RETRY_PUSHBACK_METADATA_KEY, str(controller.retry_after_ms())),))
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, constants.MSG_OVERLOADED)
+            remaining = context.time_remaining()
+            if remaining is not None and remaining <= 0:
+                # the client gave up while the call queued; do not do the work anyway
+                context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline expired before the call started")
+
+        def wrap(behavior, streams_response):
+            if streams_response:
+                def admitted_stream(request, context):
+                    try:
+                        admit(context)
+                        yield from behavior(request, context)
+                    finally:
+                        # stream length says nothing about load either
+                        release()
+                weakref.finalize(admitted_stream, release)
+                return admitted_stream
+
+            def admitted_call(request, context):
+                try:
+                    admit(context)
+                    return behavior(request, context)
+                finally:
+                    release(time.perf_counter() - arrived if steers_limit else None)
+            weakref.finalize(admitted_call, release)
+            return admitted_call
+        return wrap_handler(handler, wrap)
+
+# time_remaining() of a call without a deadline is this far out, or more
+_NO_DEADLINE_SECONDS = 10 ** 8
+
+class DeadlineInterceptor(grpc.ServerInterceptor):
+    """Bounds the database work of each RPC by its deadline; see ``database.request_deadline``.
+
+    A handler that failed because its RPC was abandoned reports
+    DEADLINE_EXCEEDED or CANCELLED instead of INTERNAL.
+    """
+
+    def intercept_service(self, continuation, handler_call_details):
+        def bound(context):
+            remaining = context.time_remaining()
+            deadline = time.monotonic() + remaining if remaining < _NO_DEADLINE_SECONDS else None
+            return RequestDeadline(deadline, context.is_active)
+
+        def report_abandoned(context, request):
+            if request.abandoned() and context.code() in (None, grpc.StatusCode.INTERNAL, grpc.StatusCode.UNKNOWN):
+                expired = request.deadline is not None and request.remaining() <= 0
+                context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED if expired else grpc.StatusCode.CANCELLED)
+                context.set_details("Deadline exceeded" if expired else "Cancelled by the client")
+
+        def wrap(behavior, streams_response):
+            if streams_response:
+                def bounded_stream(request_or_iterator, context):
+                    request = bound(context)
+                    token = request_deadline.set(request)
+                    try:
+                        yield from behavior(request_or_iterator, context)
+                    finally:
+                        request_deadline.reset(token)
+                        report_abandoned(context, request)
+                return bounded_stream
+
+            def bounded(request_or_iterator, context):
+                request = bound(context)
+                token = request_deadline.set(request)
+                try:
+                    return behavior(request_or_iterator, context)
+                finally:
+                    request_deadline.reset(token)
+                    report_abandoned(context, request)
+            return bounded
+
+        return wrap_handler(continuation(handler_call_details), wrap)
+
+CALLER_METADATA_KEY = "caller-id"
+# most callers remembered as recent writers; the oldest are forgotten first
+_MAX_TRACKED_CALLERS = 10000
+_READ_PREFIXES = ("List", "Get", "Search", "Stream", "Watch")
+
+class ReplicaRoutingInterceptor(grpc.ServerInterceptor):
+    """Lets the unary read ``methods`` (name -> catalog namespace or None) use read replicas.
+
+    A caller is identified by its ``caller-id`` metadata, or else its peer
+    address. Its reads stay on the primary for ``max_lag`` seconds after it
+    last called a writing RPC, so it always sees its own writes. A method
+    mapped to a catalog namespace (the cached, version-tokened lists) also
+    stays on the primary until that namespace saw no write for ``max_lag``
+    seconds, or a replica could hand out rows older than the token.
+    """
+
+    def __init__(self, methods, max_lag: float, versions=None):
+        self._methods = methods
+        self._max_lag = max_lag
+        self._versions = versions or catalog_version
+        self._recent_writers = TTLCache(_MAX_TRACKED_CALLERS, max_lag)
+
+    def _caller(self, handler_call_details, context):
+        return dict(handler_call_details.invocation_metadata or ()).get(CALLER_METADATA_KEY) or context.peer()
+
+    def intercept_service(self, continuation, handler_call_details):
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        handler = continuation(handler_call_details)
+        recent_writers = self._recent_writers
+        if method in self._methods:
+            namespace = self._methods[method]
+
+            def wrap(behavior, streams_response):
+                def routed(request, context):
+                    use_replica = (
+                        recent_writers.get(self._caller(handler_call_details, context)) is None
+                        and (namespace is None or self._versions.seconds_since_write(namespace) >= self._max_lag)
+                    )
+                    token = replica_reads.set(use_replica)
+                    try:
+                        return behavior(request, context)
+                    finally:
+                        replica_reads.reset(token)
+                return routed
+            return wrap_handler(handler, wrap)
+        if method.startswith(_READ_PREFIXES):
+            return handler
+
+        def wrap(behavior, streams_response):
+            def remembered(request_or_iterator, context):
+                try:
+                    return behavior(request_or_iterator, context)
+                finally:
+                    # failed writes may have committed part of their work, so they count too
+                    recent_writers.put(self._caller(handler_call_details, context), True, recent_writers.generation)
+            return remembered
+        return wrap_handler(handler, wrap)
@@ -0,0 +1,134 @@
+"""Per-RPC metrics in Prometheus text format.
+
+Recording costs one lock round trip at RPC start and one at RPC end; the text
+exposition is only built when the endpoint is scraped.
+"""
+import bisect
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RpcMetrics:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)          # (method, code) -> count
+        self._in_flight = defaultdict(int)         # method -> gauge
+        self._bucket_counts = {}                   # method -> [count per bucket + +Inf]
+        self._latency_sum = defaultdict(float)     # method -> seconds
+        # extra gauges collected at scrape time: callables returning {name: {labels_tuple: value}}
+        self._collectors = []
+
+    def started(self, method: str):
+        with self._lock:
+            self._in_flight[method] += 1
+
+    def finished(self, method: str, code: str, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._in_flight[method] -= 1
+            self._requests[(method, code)] += 1
+            counts = self._bucket_counts.get(method)
+            if counts is None:
+                counts = self._bucket_counts[method] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._latency_sum[method] += seconds
+
+    def add_collector(self, collector):
+        """Register ``collector() -> [(metric_name, help, {label: value} or None, value), ...]``."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            requests = dict(self._requests)
+            in_flight = dict(self._in_flight)
+            bucket_counts = {m: list(c) for m, c in self._bucket_counts.items()}
+            latency_sum = dict(self._latency_sum)
+
+        lines = [
+            "# HELP grpc_server_handled_total RPCs completed, by method and status code.",
+            "# TYPE grpc_server_handled_total counter",
+        ]
+        for (method, code), count in sorted(requests.items()):
+            lines.append(f'grpc_server_handled_total{{grpc_method="{method}",grpc_code="{code}"}} {count}')
+        lines += [
+            "# HELP grpc_server_in_flight RPCs currently being handled.",
+            "# TYPE grpc_server_in_flight gauge",
+        ]
+        for method, value in sorted(in_flight.items()):
+            lines.append(f'grpc_server_in_flight{{grpc_method="{method}"}} {value}')
+        lines += [
+            "# HELP grpc_server_handling_seconds RPC handling latency.",
+            "# TYPE grpc_server_handling_seconds histogram",
+        ]
+        for method, counts in sorted(bucket_counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'grpc_server_handling_seconds_bucket{{grpc_method="{method}",le="{bound}"}} {cumulative}')
+            lines.append(f'grpc_server_handling_seconds_sum{{grpc_method="{method}"}} {latency_sum[method]}')
+            lines.append(f'grpc_server_handling_seconds_count{{grpc_method="{method}"}} {cumulative}')
+
+        seen = set()
+        for collector in self._collectors:
+            for name, help_text, labels, value in collector():
+                if name not in seen:
+                    seen.add(name)
+                    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+                label_text = ",".join(f'{k}="{v}"' for k, v in (labels or {}).items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+def pool_collector(engine):
+    from app.database import pool_stats
+
+    def collect():
+        return [
+            (f"db_pool_{name}", f"SQLAlchemy pool {name}.", None, value)
+            for name, value in pool_stats(engine).items()
+        ]
+    return collect
+
+def cache_collector(cache):
+    def collect():
+        return [
+            (f"catalog_cache_{name}", f"Catalog cache {name}.", None, value)
+            for name, value in cache.stats().items()
+        ]
+    return collect
+
+def admission_collector(controller):
+    def collect():
+        return [
+            (f"admission_{name}", f"Admission control {name}.", None, value)
+            for name, value in controller.stats().items()
+        ]
+    return collect
+
+def start_http_server(metrics: RpcMetrics, port: int, host: str = "127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the HTTPServer."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes would otherwise flood stderr
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+# process-wide metrics fed by app.interceptors.MetricsInterceptor
+rpc_metrics = RpcMetrics()
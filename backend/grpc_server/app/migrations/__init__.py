@@ -0,0 +1,64 @@
+"""Versioned schema migrations for SQLite and Postgres.
+
+Every module in ``app/migrations/versions`` defines ``VERSION`` (an int),
+``DESCRIPTION`` and ``upgrade(conn, dialect)``. ``upgrade(engine)`` applies, in
+order, each migration newer than the highest version recorded in the
+``schema_version`` table, one transaction per migration.
+
+Run ``python -m app.migrations`` to migrate ``DATABASE_URL`` by hand; the
+server also migrates on start-up unless ``DB_AUTO_MIGRATE`` is off.
+"""
+import importlib
+import pkgutil
+from datetime import datetime, UTC
+from sqlalchemy import text
+from app.logging_config import logger
+from app.migrations import versions
+
+# arbitrary key for pg_advisory_xact_lock so concurrent starters migrate one at a time
+_PG_LOCK_KEY = 7_301_992
+
+def load_migrations():
+    """Return the migration modules sorted by VERSION."""
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(versions.__path__)
+    ]
+    modules.sort(key=lambda m: m.VERSION)
+    numbers = [m.VERSION for m in modules]
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise RuntimeError(f"migration versions must be 1..N without gaps, got {numbers}")
+    return modules
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        " version INTEGER PRIMARY KEY,"
+        " description VARCHAR(255) NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL)"
+    ))
+
+def current_version(conn) -> int:
+    _ensure_version_table(conn)
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+
+def upgrade(engine, target=None):
+    """Apply pending migrations up to ``target`` (default: latest). Returns applied versions."""
+    dialect = engine.dialect.name
+    applied = []
+    for migration in load_migrations():
+        if target is not None and migration.VERSION > target:
+            break
+        with engine.begin() as conn:
+            if dialect == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+            if migration.VERSION <= current_version(conn):
+                continue
+            logger.info("Applying migration", extra={"version": migration.VERSION, "description": migration.DESCRIPTION})
+            migration.upgrade(conn, dialect)
+            conn.execute(
+                text("INSERT INTO schema_version (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": migration.VERSION, "d": migration.DESCRIPTION, "t": datetime.now(UTC)},
+            )
+        applied.append(migration.VERSION)
+    return applied
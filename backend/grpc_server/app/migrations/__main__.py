@@ -0,0 +1,6 @@
+from app.database import engine
+from app.migrations import upgrade
+
+if __name__ == "__main__":
+    applied = upgrade(engine)
+    print(f"applied migrations: {applied}" if applied else "schema is up to date")
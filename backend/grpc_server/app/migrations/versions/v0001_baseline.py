@@ -0,0 +1,66 @@
+"""Tables from db/init.sql. IF NOT EXISTS lets existing databases adopt it."""
+from sqlalchemy import text
+
+VERSION = 1
+DESCRIPTION = "baseline schema"
+
+_POSTGRES = [
+    """CREATE TABLE IF NOT EXISTS books (
+        id SERIAL PRIMARY KEY,
+        title VARCHAR(255) NOT NULL,
+        author VARCHAR(255) NOT NULL,
+        available BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+    """CREATE TABLE IF NOT EXISTS members (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        contact VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )""",
+    """CREATE TABLE IF NOT EXISTS borrowings (
+        id SERIAL PRIMARY KEY,
+        book_id INT REFERENCES books(id),
+        member_id INT REFERENCES members(id),
+        borrowed_at TIMESTAMP DEFAULT NOW(),
+        returned_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW()
+    )""",
+]
+
+_SQLITE = [
+    """CREATE TABLE IF NOT EXISTS books (
+        id INTEGER PRIMARY KEY,
+        title VARCHAR(255) NOT NULL,
+        author VARCHAR(255) NOT NULL,
+        available BOOLEAN DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS members (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        contact VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS borrowings (
+        id INTEGER PRIMARY KEY,
+        book_id INTEGER REFERENCES books(id),
+        member_id INTEGER REFERENCES members(id),
+        borrowed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        returned_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+_COMMON = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_books_title_author ON books (LOWER(title), LOWER(author))",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_members_contact ON members (LOWER(contact))",
+]
+
+def upgrade(conn, dialect):
+    for statement in (_POSTGRES if dialect == "postgresql" else _SQLITE) + _COMMON:
+        conn.execute(text(statement))
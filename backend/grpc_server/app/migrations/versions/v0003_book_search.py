@@ -0,0 +1,38 @@
+"""Text index for SearchBooks.
+
+SQLite: an external-content FTS5 table with the trigram tokenizer (substring
+matching, case-insensitive), kept in sync by triggers. Availability flips do
+not touch title/author, so borrow/return never rewrite the index.
+Postgres: pg_trgm GIN indexes, which serve ILIKE '%q%' and 'q%'.
+"""
+from sqlalchemy import text
+
+VERSION = 3
+DESCRIPTION = "text search index on book title and author"
+
+_SQLITE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, content='books', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts (rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+    "INSERT INTO books_fts (books_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_books_author_trgm ON books USING gin (author gin_trgm_ops)",
+]
+
+def upgrade(conn, dialect):
+    for statement in _POSTGRES if dialect == "postgresql" else _SQLITE:
+        conn.execute(text(statement))
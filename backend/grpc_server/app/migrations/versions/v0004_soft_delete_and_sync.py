@@ -0,0 +1,32 @@
+"""Soft-delete tombstones and the (updated_at, id) index behind ListBooksSince / ListMembersSince.
+
+Deleted rows keep their id with ``deleted_at`` set, so delta-sync clients can
+see the delete and borrowing history keeps pointing at a real row. The unique
+indexes become partial so a deleted title/author or contact can be reused.
+"""
+from sqlalchemy import text
+
+VERSION = 4
+DESCRIPTION = "soft delete tombstones and updated_at sync index"
+
+def upgrade(conn, dialect):
+    statements = []
+    for table in ("books", "members"):
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN deleted_at TIMESTAMP",
+            # rows inserted outside the app may lack updated_at; the cursor needs one
+            f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL",
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at_id ON {table} (updated_at, id)",
+        ]
+        if dialect == "sqlite":
+            # CURRENT_TIMESTAMP has no fraction while SQLAlchemy writes microseconds;
+            # the cursor compares these as text, so give every row the same shape
+            statements.append(f"UPDATE {table} SET updated_at = updated_at || '.000000' WHERE length(updated_at) = 19")
+    statements += [
+        "DROP INDEX IF EXISTS uq_books_title_author",
+        "CREATE UNIQUE INDEX uq_books_title_author ON books (LOWER(title), LOWER(author)) WHERE deleted_at IS NULL",
+        "DROP INDEX IF EXISTS uq_members_contact",
+        "CREATE UNIQUE INDEX uq_members_contact ON members (LOWER(contact)) WHERE deleted_at IS NULL",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
@@ -0,0 +1,29 @@
+"""Cold storage for returned borrowings (see app/archive.py).
+
+``borrowings_archive`` keeps the original borrowing ids, so history reads can
+page across both tables on one id. It has no foreign keys: rows only ever
+arrive in bulk from ``borrowings`` and are never updated.
+"""
+from sqlalchemy import text
+
+VERSION = 5
+DESCRIPTION = "borrowings archive table"
+
+def upgrade(conn, dialect):
+    statements = [
+        """CREATE TABLE IF NOT EXISTS borrowings_archive (
+            id INTEGER PRIMARY KEY,
+            book_id INTEGER,
+            member_id INTEGER,
+            borrowed_at TIMESTAMP,
+            returned_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP,
+            archived_at TIMESTAMP NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_archive_member_id ON borrowings_archive (member_id, id)",
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_archive_book_id ON borrowings_archive (book_id, id)",
+        # archival candidates; partial so open-loan queries keep ix_borrowings_open
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_returned_at ON borrowings (returned_at) WHERE returned_at IS NOT NULL",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
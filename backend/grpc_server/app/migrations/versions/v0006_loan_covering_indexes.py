@@ -0,0 +1,22 @@
+"""Covering indexes behind ListMemberLoans / ListBookLoans.
+
+``(member_id, borrowed_at, id, returned_at, book_id)`` and its book-side twin
+serve a newest-first page of one member's (or book's) loans as an index-only
+range scan, including the open/returned filter. They start with the columns
+of ``ix_borrowings_member_id`` / ``ix_borrowings_book_id``, which are dropped
+so a borrow does not pay for both.
+"""
+from sqlalchemy import text
+
+VERSION = 6
+DESCRIPTION = "covering indexes for per-member and per-book loan lists"
+
+def upgrade(conn, dialect):
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_member_loans ON borrowings (member_id, borrowed_at, id, returned_at, book_id)",
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_book_loans ON borrowings (book_id, borrowed_at, id, returned_at, member_id)",
+        "DROP INDEX IF EXISTS ix_borrowings_member_id",
+        "DROP INDEX IF EXISTS ix_borrowings_book_id",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
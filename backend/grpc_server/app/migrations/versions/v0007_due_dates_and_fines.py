@@ -0,0 +1,32 @@
+"""Due dates and fines on borrowings (see app/fines.py).
+
+Open loans get a due date LOAN_PERIOD_DAYS after they were borrowed; returned
+loans keep none and are never fined retroactively. ``ix_borrowings_open_due``
+walks open loans in due order for ListOverdueLoans and the overdue scanner.
+"""
+from sqlalchemy import text
+from app import constants
+
+VERSION = 7
+DESCRIPTION = "loan due dates and fines"
+
+def upgrade(conn, dialect):
+    days = int(constants.LOAN_PERIOD_DAYS)
+    if dialect == "postgresql":
+        due = f"borrowed_at + INTERVAL '{days} days'"
+    else:
+        # same text shape SQLAlchemy writes, so due dates compare correctly
+        due = f"strftime('%Y-%m-%d %H:%M:%S', borrowed_at, '+{days} days') || '.000000'"
+    statements = []
+    for table in ("borrowings", "borrowings_archive"):
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN due_at TIMESTAMP",
+            f"ALTER TABLE {table} ADD COLUMN overdue_days INTEGER NOT NULL DEFAULT 0",
+            f"ALTER TABLE {table} ADD COLUMN fine_cents INTEGER NOT NULL DEFAULT 0",
+        ]
+    statements += [
+        f"UPDATE borrowings SET due_at = {due} WHERE returned_at IS NULL AND borrowed_at IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_open_due ON borrowings (due_at, id) WHERE returned_at IS NULL",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
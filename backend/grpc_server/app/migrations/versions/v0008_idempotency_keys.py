@@ -0,0 +1,22 @@
+"""Optional database backing of the idempotency store (IDEMPOTENCY_DB).
+
+Keys are ``"<method>:<client key>"``; ``created_at`` drives expiry.
+"""
+from sqlalchemy import text
+
+VERSION = 8
+DESCRIPTION = "idempotency keys"
+
+def upgrade(conn, dialect):
+    blob = "BYTEA" if dialect == "postgresql" else "BLOB"
+    statements = [
+        f"""CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key VARCHAR(255) PRIMARY KEY,
+            fingerprint VARCHAR(64) NOT NULL,
+            response {blob},
+            created_at TIMESTAMP NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_idempotency_keys_created_at ON idempotency_keys (created_at)",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
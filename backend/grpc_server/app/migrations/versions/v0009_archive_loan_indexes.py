@@ -0,0 +1,20 @@
+"""Archive twins of the loan-list covering indexes (see v0006).
+
+ListMemberLoans / ListBookLoans with status "returned" or unset also read
+``borrowings_archive``; ``(member_id, borrowed_at, id, returned_at, book_id)``
+and its book-side twin give that side the same index-only newest-first scan.
+The ``(member_id, id)`` / ``(book_id, id)`` indexes stay for history reads,
+which page by id.
+"""
+from sqlalchemy import text
+
+VERSION = 9
+DESCRIPTION = "covering indexes for archived loans in loan lists"
+
+def upgrade(conn, dialect):
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_archive_member_loans ON borrowings_archive (member_id, borrowed_at, id, returned_at, book_id)",
+        "CREATE INDEX IF NOT EXISTS ix_borrowings_archive_book_loans ON borrowings_archive (book_id, borrowed_at, id, returned_at, member_id)",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
@@ -1,15 +1,22 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index, LargeBinary, func, text
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime, UTC
 
 # add timestamps and unique constraints
+# The schema itself is owned by app/migrations; indexes declared here mirror
+# the migrated schema so Base.metadata.create_all() builds the same thing.
 
 Base = declarative_base()
 
 class Book(Base):
     __tablename__ = "books"
-    __table_args__ = (UniqueConstraint('title', 'author', name='uq_books_title_author'),)
+    __table_args__ = (
+        Index('uq_books_title_author', func.lower(text('title')), func.lower(text('author')), unique=True,
+              sqlite_where=text('deleted_at IS NULL'), postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_books_available', 'id', sqlite_where=text('available = 1'), postgresql_where=text('available')),
+        Index('ix_books_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
@@ -17,30 +24,89 @@ class Book(Base):
     available = Column(Boolean, default=True)
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+    # soft delete: tombstones stay for delta sync and loan history
+    deleted_at = Column(DateTime)
     borrowings = relationship("Borrowing", back_populates="book")
 
 class Borrowing(Base):
     __tablename__ = "borrowings"
+    __table_args__ = (
+        Index('ix_borrowings_open', 'id', sqlite_where=text('returned_at IS NULL'), postgresql_where=text('returned_at IS NULL')),
+        Index('ix_borrowings_returned_at', 'returned_at',
+              sqlite_where=text('returned_at IS NOT NULL'), postgresql_where=text('returned_at IS NOT NULL')),
+        # covering indexes for ListMemberLoans / ListBookLoans: keyed in (borrowed_at, id)
+        # page order with every listed borrowings column, so the scan never visits the table
+        Index('ix_borrowings_member_loans', 'member_id', 'borrowed_at', 'id', 'returned_at', 'book_id'),
+        Index('ix_borrowings_book_loans', 'book_id', 'borrowed_at', 'id', 'returned_at', 'member_id'),
+        # open loans in due order: ListOverdueLoans and the overdue scanner
+        Index('ix_borrowings_open_due', 'due_at', 'id', sqlite_where=text('returned_at IS NULL'),
+              postgresql_where=text('returned_at IS NULL')),
+    )
     id = Column(Integer, primary_key=True)
     book_id = Column(Integer, ForeignKey("books.id"))
     member_id = Column(Integer, ForeignKey("members.id"))
     borrowed_at = Column(DateTime, default=datetime.utcnow)
     returned_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    due_at = Column(DateTime)
+    # last assessment by app/fines.py; final once the loan is returned
+    overdue_days = Column(Integer, nullable=False, default=0)
+    fine_cents = Column(Integer, nullable=False, default=0)
     book = relationship("Book", back_populates="borrowings")
     member = relationship("Member", back_populates="borrowings")
 
+class ArchivedBorrowing(Base):
+    """Returned borrowing moved out of ``borrowings`` by app/archive.py, keeping its id."""
+    __tablename__ = "borrowings_archive"
+    __table_args__ = (
+        Index('ix_borrowings_archive_member_id', 'member_id', 'id'),
+        Index('ix_borrowings_archive_book_id', 'book_id', 'id'),
+        # archived side of ListMemberLoans / ListBookLoans, as ix_borrowings_member_loans
+        Index('ix_borrowings_archive_member_loans', 'member_id', 'borrowed_at', 'id', 'returned_at', 'book_id'),
+        Index('ix_borrowings_archive_book_loans', 'book_id', 'borrowed_at', 'id', 'returned_at', 'member_id'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    book_id = Column(Integer)
+    member_id = Column(Integer)
+    borrowed_at = Column(DateTime)
+    returned_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime)
+    due_at = Column(DateTime)
+    overdue_days = Column(Integer, nullable=False, default=0)
+    fine_cents = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime, nullable=False)
+
 class Member(Base):
     __tablename__ = "members"
-    __table_args__ = (UniqueConstraint('contact', name='uq_members_contact'),)
+    __table_args__ = (
+        Index('uq_members_contact', func.lower(text('contact')), unique=True,
+              sqlite_where=text('deleted_at IS NULL'), postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_members_updated_at_id', 'updated_at', 'id'),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     contact = Column(String, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+    deleted_at = Column(DateTime)
     borrowings = relationship("Borrowing", back_populates="member")
 
+class IdempotencyKey(Base):
+    """Database backing of the idempotency store (app/idempotency.py).
+
+    A row with no ``response`` is a claim: the first call with that key is
+    still running (or died, once ``created_at`` is past the claim lease).
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index('ix_idempotency_keys_created_at', 'created_at'),
+    )
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    response = Column(LargeBinary)
+    created_at = Column(DateTime, nullable=False)
+
 # helpful indexes
 Index('ix_books_title', Book.title)
 Index('ix_members_contact', Member.contact)
\ No newline at end of file
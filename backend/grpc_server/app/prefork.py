@@ -0,0 +1,81 @@
+"""Supervisor for the pre-fork server mode (see app/server.py:serve_prefork)."""
+import multiprocessing
+import threading
+import time
+from app.logging_config import logger
+
+
+class Supervisor:
+    """Run ``target(index)`` in ``workers`` forked processes and keep them running.
+
+    A worker that exits while the supervisor is running is restarted in the
+    same slot after ``restart_delay`` seconds. ``stop()`` (safe to call from a
+    signal handler) sends SIGTERM to every worker, waits up to ``grace``
+    seconds for them to drain, then SIGKILLs whatever is left.
+    """
+
+    def __init__(self, target, workers: int, restart_delay: float = 1.0, grace: float = 10.0,
+                 poll_interval: float = 0.2):
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.grace = grace
+        self.poll_interval = poll_interval
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("fork")
+        self._procs = {}
+        self._pending = {}
+        self._stopping = threading.Event()
+
+    def _spawn(self, index: int):
+        proc = self._ctx.Process(target=self.target, args=(index,), name=f"grpc-worker-{index}")
+        proc.start()
+        self._procs[index] = proc
+        logger.info(f"Started worker {index} (pid {proc.pid})")
+
+    def _reap(self):
+        now = time.monotonic()
+        for index, proc in list(self._procs.items()):
+            if proc.is_alive():
+                continue
+            proc.join()
+            del self._procs[index]
+            logger.warning(f"Worker {index} (pid {proc.pid}) exited with code {proc.exitcode}; restarting")
+            self._pending[index] = now + self.restart_delay
+        for index, due in list(self._pending.items()):
+            if due <= now and not self._stopping.is_set():
+                del self._pending[index]
+                self.restarts += 1
+                self._spawn(index)
+
+    def pids(self):
+        return [proc.pid for proc in self._procs.values()]
+
+    def run(self):
+        """Start the workers and supervise them until ``stop()`` is called."""
+        for index in range(self.workers):
+            self._spawn(index)
+        try:
+            while not self._stopping.wait(self.poll_interval):
+                self._reap()
+        finally:
+            self._shutdown()
+
+    def stop(self):
+        self._stopping.set()
+
+    def _shutdown(self):
+        procs = list(self._procs.values())
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + self.grace
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                logger.warning(f"Worker pid {proc.pid} did not stop within {self.grace}s; killing")
+                proc.kill()
+                proc.join()
+        self._procs.clear()
+        self._pending.clear()
+        logger.info("All workers stopped")
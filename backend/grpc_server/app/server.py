@@ -1,21 +1,197 @@
 import grpc
+import asyncio
 from concurrent import futures
 import os, sys
+import signal
 # ensure generated protobuf modules can be imported (library_pb2, etc.)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'generated')))
-from app.service_impl import LibraryServiceImpl
+from app.service_impl import IDEMPOTENT_METHODS, REPLICA_METHODS, LibraryServiceImpl
+from app import constants, migrations
+from app.cache import catalog_cache
+from app.database import engine, replica_pool
+from app.interceptors import (
+    AdmissionInterceptor, DeadlineInterceptor, IdempotencyInterceptor, MetricsInterceptor, ReplicaRoutingInterceptor,
+)
+from app import admission, archive, events, fines, idempotency, metrics, stats
+from app.database import SessionLocal
 import generated.library_pb2_grpc as library_pb2_grpc
 
+def migrate():
+    if constants.DB_AUTO_MIGRATE:
+        migrations.upgrade(engine)
+
+def start_stats():
+    """Count the library once, then keep recounting in the background."""
+    stats.reconcile(SessionLocal)
+    if constants.STATS_RECONCILE_SECONDS > 0:
+        stats.start_reconciler(SessionLocal, constants.STATS_RECONCILE_SECONDS)
+
+def start_jobs():
+    """Borrowing archival and the overdue scanner; both write, so one process runs them."""
+    if constants.ARCHIVE_INTERVAL_SECONDS > 0:
+        archive.start_archiver(SessionLocal, constants.ARCHIVE_INTERVAL_SECONDS)
+    if constants.OVERDUE_SCAN_SECONDS > 0:
+        fines.start_scanner(SessionLocal, constants.OVERDUE_SCAN_SECONDS)
+    if constants.IDEMPOTENCY_DB:
+        idempotency.start_purger(SessionLocal, constants.IDEMPOTENCY_TTL_SECONDS,
+                                 interval=min(constants.IDEMPOTENCY_TTL_SECONDS, 3600))
+
+def idempotency_store():
+    return idempotency.IdempotencyStore(
+        constants.IDEMPOTENCY_TTL_SECONDS, constants.IDEMPOTENCY_MAX_KEYS,
+        session_factory=SessionLocal if constants.IDEMPOTENCY_DB else None,
+        wait_seconds=constants.IDEMPOTENCY_WAIT_SECONDS,
+        claim_lease=constants.IDEMPOTENCY_CLAIM_LEASE_SECONDS,
+    )
+
+def admission_controller():
+    """The AdmissionController for one server process, or None with ADMISSION_CONTROL off."""
+    if not constants.ADMISSION_CONTROL:
+        return None
+    # queued calls count as well, so the limit may grow up to what gRPC accepts, less the
+    # watchers that hold part of that and are never admitted here
+    accepted = constants.GRPC_MAX_CONCURRENT_RPCS or constants.GRPC_MAX_WORKERS * 4
+    ceiling = max(constants.GRPC_MAX_WORKERS, accepted - constants.MAX_WATCHERS)
+    return admission.AdmissionController(
+        admission.AdaptiveLimit(
+            initial=constants.GRPC_MAX_WORKERS,
+            min_limit=min(constants.ADMISSION_MIN_LIMIT, constants.GRPC_MAX_WORKERS),
+            max_limit=ceiling,
+            target_latency=constants.ADMISSION_TARGET_LATENCY_MS / 1000,
+        ),
+        shares={
+            admission.READ: 1.0,
+            admission.WRITE: constants.ADMISSION_WRITE_SHARE,
+            admission.BULK: constants.ADMISSION_BULK_SHARE,
+        },
+        method_limits=constants.ADMISSION_METHOD_LIMITS,
+    )
+
+def build_server(address: str, options=None, controller=None):
+    """Create the threaded server bound to ``address``; returns ``(server, bound_port)``."""
+    interceptors = [MetricsInterceptor(metrics.rpc_metrics)]
+    if controller is not None:
+        # before idempotency, so a shed call never claims its key
+        interceptors.append(AdmissionInterceptor(controller))
+    interceptors.append(DeadlineInterceptor())
+    if replica_pool:
+        interceptors.append(ReplicaRoutingInterceptor(REPLICA_METHODS, constants.REPLICA_MAX_LAG_SECONDS))
+    interceptors.append(IdempotencyInterceptor(idempotency_store(), IDEMPOTENT_METHODS))
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=constants.GRPC_MAX_WORKERS),
+        interceptors=interceptors,
+        options=options,
+        maximum_concurrent_rpcs=constants.GRPC_MAX_CONCURRENT_RPCS or None,
+    )
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(LibraryServiceImpl(), server)
+    bound_port = server.add_insecure_port(address)
+    return server, bound_port
+
 def serve():
     port = os.getenv("GRPC_PORT", "50051")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    library_pb2_grpc.add_LibraryServiceServicer_to_server(LibraryServiceImpl(), server)
-    server.add_insecure_port(f"[::]:{port}")
+    migrate()
+    start_stats()
+    start_jobs()
+    controller = admission_controller()
+    server, _ = build_server(f"[::]:{port}", controller=controller)
     server.start()
     # use structured logger instead of print
     from app.logging_config import logger
     logger.info(f"gRPC Server running on port {port}")
+    if constants.METRICS_PORT:
+        _start_metrics(constants.METRICS_PORT, controller)
+    server.wait_for_termination()
+
+def _start_metrics(port: int, controller=None):
+    from app.logging_config import logger
+    metrics.rpc_metrics.add_collector(metrics.pool_collector(engine))
+    metrics.rpc_metrics.add_collector(metrics.cache_collector(catalog_cache))
+    if controller is not None:
+        metrics.rpc_metrics.add_collector(metrics.admission_collector(controller))
+    metrics.start_http_server(metrics.rpc_metrics, port, constants.METRICS_HOST)
+    logger.info(f"Metrics endpoint on http://{constants.METRICS_HOST}:{port}/metrics")
+
+def _reset_after_fork():
+    """Give a forked worker its own copy of the per-process state it inherited."""
+    # the pool copied from the parent holds its connections; start a fresh one in this process
+    engine.dispose(close=False)
+    for replica in replica_pool.engines:
+        replica.dispose(close=False)
+    # event sequence numbers are per process; a shared epoch would let a client
+    # resume on another worker and silently skip or repeat events
+    events.inventory_events.reset()
+
+def _run_worker(index: int):
+    """Entry point of one pre-fork worker process."""
+    from app.logging_config import logger
+    # Ctrl-C reaches the whole process group; only the supervisor reacts to it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _reset_after_fork()
+    if index == 0:
+        # one set of jobs per deployment; concurrent archival passes would pick the same rows
+        start_jobs()
+        # the counters are shared, so one recount serves every worker
+        if constants.STATS_RECONCILE_SECONDS > 0:
+            stats.start_reconciler(SessionLocal, constants.STATS_RECONCILE_SECONDS)
+    port = os.getenv("GRPC_PORT", "50051")
+    controller = admission_controller()
+    server, _ = build_server(f"[::]:{port}", options=[("grpc.so_reuseport", 1)], controller=controller)
+    server.start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop(constants.GRPC_SHUTDOWN_GRACE_SECONDS))
+    logger.info(f"gRPC worker {index} (pid {os.getpid()}) running on port {port}")
+    if constants.METRICS_PORT:
+        # one endpoint per worker: counters are per process
+        _start_metrics(constants.METRICS_PORT + index, controller)
     server.wait_for_termination()
 
+def serve_prefork(workers: int):
+    """Run ``workers`` threaded servers in forked processes sharing one port via SO_REUSEPORT.
+
+    Migrations run once in the supervisor, which then forks without having
+    started any gRPC machinery; each worker builds its own server and pool.
+    """
+    from app.logging_config import logger
+    from app.prefork import Supervisor
+    migrate()
+    # counted before the fork, into the shared counters every worker reads
+    stats.reconcile(SessionLocal)
+    engine.dispose()
+    supervisor = Supervisor(
+        _run_worker, workers,
+        restart_delay=constants.WORKER_RESTART_DELAY_SECONDS,
+        grace=constants.GRPC_SHUTDOWN_GRACE_SECONDS,
+    )
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: supervisor.stop())
+    logger.info(f"Starting {workers} gRPC worker processes")
+    supervisor.run()
+
+async def serve_async():
+    """Run the grpc.aio server; RPCs share one event loop and AsyncSession pool."""
+    from app.aio_service_impl import AsyncLibraryServiceImpl
+    from app.database import get_async_engine, get_async_sessionmaker_from_engine
+    from app.logging_config import logger
+    port = os.getenv("GRPC_PORT", "50051")
+    migrate()
+    start_stats()
+    start_jobs()
+    async_engine = get_async_engine()
+    # the thread pool only serves RPCs without an async override
+    server = grpc.aio.server(migration_thread_pool=futures.ThreadPoolExecutor(max_workers=constants.GRPC_MAX_WORKERS))
+    servicer = AsyncLibraryServiceImpl(get_async_sessionmaker_from_engine(async_engine))
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(servicer, server)
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    logger.info(f"gRPC asyncio server running on port {port}")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await async_engine.dispose()
+
 if __name__ == "__main__":
-    serve()
+    if constants.GRPC_WORKERS > 1:
+        serve_prefork(constants.GRPC_WORKERS)
+    elif constants.GRPC_ASYNC:
+        asyncio.run(serve_async())
+    else:
+        serve()
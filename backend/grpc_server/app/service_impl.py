@@ -1,14 +1,150 @@
 import generated.library_pb2 as library_pb2
 import generated.library_pb2_grpc as library_pb2_grpc
 from app.database import SessionLocal
-from app.models import Book, Member, Borrowing
 import grpc
-from datetime import datetime
+from datetime import datetime, UTC
 from google.protobuf import empty_pb2
 from app import validators
-from app.services import book_service, member_service, borrowing_service
+from app.services import book_service, member_service, borrowing_service, sync
 from app.logging_config import logger
 from app import constants
+from app.cache import catalog_cache, catalog_version
+from app.stats import library_stats
+from app.events import EventsLost, inventory_events
+import threading
+
+def _book_to_pb(book):
+    return library_pb2.Book(id=book.id, title=book.title, author=book.author, available=book.available)
+
+def _member_to_pb(member):
+    return library_pb2.Member(id=member.id, name=member.name, contact=member.contact)
+
+# write RPCs that honour an idempotency-key (app/interceptors.py), with their response types
+IDEMPOTENT_METHODS = {
+    "CreateBook": library_pb2.Book,
+    "AddMember": library_pb2.Member,
+    "BorrowBook": library_pb2.Empty,
+    "BorrowBooks": library_pb2.BatchResult,
+}
+
+# read RPCs that may be served by a read replica (app/interceptors.py), with the catalog
+# namespace whose version token their response carries
+REPLICA_METHODS = {
+    "ListBooks": "books",
+    "ListAvailableBooks": "books",
+    "ListMembers": "members",
+    "SearchBooks": None,
+    "ListBorrowedBooks": None,
+    "GetBorrowingHistory": None,
+    "ListMemberLoans": None,
+    "ListBookLoans": None,
+    "ListOverdueLoans": None,
+    "GetMemberFines": None,
+}
+
+WATCH_ENTITIES = {"book", "member", "borrowing"}
+# each threaded WatchInventory stream pins an executor thread for its lifetime
+_watch_slots = threading.BoundedSemaphore(constants.MAX_WATCHERS)
+
+def _event_to_pb(event, epoch):
+    pb = library_pb2.InventoryEvent(
+        seq=event.seq, epoch=epoch, entity=event.entity, action=event.action, id=event.id,
+    )
+    if event.entity == "book":
+        pb.book.CopyFrom(library_pb2.Book(id=event.id, **event.data))
+    elif event.entity == "member":
+        pb.member.CopyFrom(library_pb2.Member(id=event.id, **event.data))
+    else:
+        pb.book_id = event.data["book_id"]
+        pb.member_id = event.data["member_id"]
+    return pb
+
+def _validate_watch_request(request):
+    validators.validate_non_negative_int('after_seq', request.after_seq)
+    validators.validate_choices('entities', request.entities, WATCH_ENTITIES)
+
+def _import_result(created, failures):
+    return library_pb2.ImportResult(
+        created=created,
+        failed=len(failures),
+        failures=[library_pb2.ImportFailure(index=i, message=m) for i, m in failures],
+    )
+
+def _batch_result(results, committed):
+    return library_pb2.BatchResult(
+        results=[
+            library_pb2.BatchItemResult(id=i, ok=ok, message=message, borrowing_id=borrowing_id)
+            for i, ok, message, borrowing_id in results
+        ],
+        committed=committed,
+    )
+
+def _page(rows, page_size, cursor=lambda row: row.id):
+    """Trim a ``page_size + 1`` result to one page and return it with the next cursor (0 when done)."""
+    if page_size and len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, cursor(rows[-1])
+    return rows, 0
+
+def _validate_borrowed_books_request(request):
+    validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+    validators.validate_non_negative_int('after_id', request.after_id)
+    validators.validate_non_negative_int('member_id', request.member_id)
+    validators.validate_non_negative_int('book_id', request.book_id)
+
+def _borrowing_record(row, archived=False):
+    # loan-list rows come from a covering index and carry no due date / fine columns
+    due_at = getattr(row, "due_at", None)
+    return library_pb2.BorrowingRecord(
+        borrowing_id=row.borrowing_id,
+        book_id=row.book_id or 0,
+        book_title=row.book_title or "",
+        member_id=row.member_id or 0,
+        member_name=row.member_name or "",
+        borrowed_at=row.borrowed_at.isoformat() if row.borrowed_at else "",
+        returned_at=row.returned_at.isoformat() if row.returned_at else "",
+        archived=archived,
+        due_at=due_at.isoformat() if due_at else "",
+        overdue_days=getattr(row, "overdue_days", 0) or 0,
+        fine_cents=getattr(row, "fine_cents", 0) or 0,
+    )
+
+def _borrowing_history_response(rows, page_size):
+    rows, next_after_id = _page(rows, page_size, cursor=lambda row: row.borrowing_id)
+    return library_pb2.BorrowingHistory(
+        records=[_borrowing_record(row, bool(row.archived)) for row in rows],
+        next_after_id=next_after_id,
+    )
+
+def _validate_loans_request(request, owner_field):
+    validators.validate_positive_int(owner_field, getattr(request, owner_field))
+    validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+    validators.validate_choices('status', [request.status] if request.status else [], borrowing_service.LOAN_STATUSES)
+    return sync.decode_cursor(request.cursor)
+
+def _loan_list(rows, page_size, position=lambda row: (row.borrowed_at, row.borrowing_id)):
+    rows, next_cursor = _page(rows, page_size, cursor=lambda row: sync.encode_cursor(*position(row)))
+    # member / book loan lists merge in the archive; overdue rows are always hot
+    loans = [_borrowing_record(row, bool(getattr(row, "archived", False))) for row in rows]
+    return library_pb2.LoanList(loans=loans, next_cursor=next_cursor or "")
+
+def _borrowed_books_response(rows, page_size):
+    """Map projection rows from ``list_current_borrowing_rows`` straight to messages."""
+    rows, next_after_id = _page(rows, page_size, cursor=lambda row: row.borrowing_id)
+    return library_pb2.BorrowedBooksResponse(
+        borrowed_books=[
+            library_pb2.BorrowedBook(
+                borrowing_id=borrowing_id,
+                book_id=book_id,
+                book_title=book_title,
+                member_id=member_id,
+                member_name=member_name,
+                borrowing_date=borrowed_at.date().isoformat(),
+            )
+            for borrowing_id, book_id, book_title, member_id, member_name, borrowed_at in rows
+        ],
+        next_after_id=next_after_id,
+    )
 
 class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
     def CreateBook(self, request, context):
@@ -23,7 +159,7 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
         db = SessionLocal()
         try:
             book = book_service.create_book(db, request.title, request.author)
-            return library_pb2.Book(id=book.id, title=book.title, author=book.author, available=book.available)
+            return _book_to_pb(book)
         except Exception as e:
             logger.exception("CreateBook failed")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -33,24 +169,80 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
             db.close()
 
     def ListBooks(self, request, context):
+        return self._list_books(request, context, only_available=False)
+    
+    def ListAvailableBooks(self, request, context):
+        return self._list_books(request, context, only_available=True)
+
+    def _list_books(self, request, context, only_available):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            validators.validate_non_negative_int('after_id', request.after_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BookList()
+
+        # read before loading: a write racing the load then changes the token
+        # and the caller's next poll reloads
+        version = catalog_version.token("books")
+        if request.if_version == version:
+            return library_pb2.BookList(version=version, not_modified=True)
+        key = ("books", version, only_available, request.after_id, request.page_size)
+        return catalog_cache.get_or_load(key, lambda: self._load_books(only_available, request.after_id, request.page_size, version))
+
+    def _load_books(self, only_available, after_id, page_size, version):
         db = SessionLocal()
         try:
-            books = book_service.list_books(db, only_available=False)
-            return library_pb2.BookList(books=[
-                library_pb2.Book(id=b.id, title=b.title, author=b.author, available=b.available)
-                for b in books
-            ])
+            # fetch one extra row to know whether another page follows
+            limit = page_size + 1 if page_size else None
+            books = book_service.list_books(db, only_available=only_available, after_id=after_id, limit=limit)
+            books, next_after_id = _page(books, page_size)
+            return library_pb2.BookList(books=[_book_to_pb(b) for b in books], next_after_id=next_after_id, version=version)
         finally:
             db.close()
-    
-    def ListAvailableBooks(self, request, context):
+
+    def StreamBooks(self, request, context):
         db = SessionLocal()
         try:
-            books = book_service.list_books(db, only_available=True)
-            return library_pb2.BookList(books=[
-                library_pb2.Book(id=b.id, title=b.title, author=b.author, available=b.available)
-                for b in books
-            ])
+            for b in book_service.iter_books(db, only_available=request.only_available, after_id=request.after_id):
+                yield _book_to_pb(b)
+        finally:
+            db.close()
+
+    def ImportBooks(self, request_iterator, context):
+        db = SessionLocal()
+        try:
+            rows = ((r.title, r.author) for r in request_iterator)
+            created, failures = book_service.import_books(db, rows)
+            return _import_result(created, failures)
+        except Exception as e:
+            logger.exception("ImportBooks failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.ImportResult()
+        finally:
+            db.close()
+
+    def SearchBooks(self, request, context):
+        try:
+            validators.validate_required_str('query', request.query)
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            validators.validate_non_negative_int('after_id', request.after_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BookList()
+
+        db = SessionLocal()
+        try:
+            page_size = request.page_size or constants.DEFAULT_SEARCH_PAGE_SIZE
+            books = book_service.search_books(
+                db, request.query, prefix=request.prefix, available_only=request.available_only,
+                after_id=request.after_id, limit=page_size + 1,
+            )
+            books, next_after_id = _page(books, page_size)
+            return library_pb2.BookList(books=[_book_to_pb(b) for b in books], next_after_id=next_after_id)
         finally:
             db.close()
 
@@ -65,12 +257,14 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
         db = SessionLocal()
         try:
-            book = book_service.get_book(db, request.book_id)
-            if not book or not book.available:
+            borrowing = borrowing_service.borrow_book_by_id(db, request.book_id, request.member_id)
+            if borrowing is None:
+                # the claim failed; only now tell a missing member from a missing or borrowed book
+                missing_member = member_service.get_member(db, request.member_id) is None
                 context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details(constants.MSG_BOOK_NOT_AVAILABLE)
+                context.set_details(constants.MSG_MEMBER_NOT_FOUND if missing_member
+                                    else constants.MSG_BOOK_NOT_AVAILABLE)
                 return library_pb2.Empty()
-            borrowing = borrowing_service.borrow_book(db, book, request.member_id)
             return library_pb2.Empty()
         except Exception as e:
             logger.exception("BorrowBook failed")
@@ -94,7 +288,7 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
         db = SessionLocal()
         try:
             member = member_service.create_member(db, request.name, request.contact)
-            return library_pb2.Member(id=member.id, name=member.name, contact=member.contact)
+            return _member_to_pb(member)
         except Exception as e:
             logger.exception("AddMember failed")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -105,32 +299,170 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
     # List Members
     def ListMembers(self, request, context):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            validators.validate_non_negative_int('after_id', request.after_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.MemberList()
+
+        version = catalog_version.token("members")
+        if request.if_version == version:
+            return library_pb2.MemberList(version=version, not_modified=True)
+        key = ("members", version, request.after_id, request.page_size)
+        return catalog_cache.get_or_load(key, lambda: self._load_members(request.after_id, request.page_size, version))
+
+    def _load_members(self, after_id, page_size, version):
         db = SessionLocal()
         try:
-            members = member_service.list_members(db)
-            return library_pb2.MemberList(members=[
-                library_pb2.Member(id=m.id, name=m.name, contact=m.contact) for m in members
-            ])
+            limit = page_size + 1 if page_size else None
+            members = member_service.list_members(db, after_id=after_id, limit=limit)
+            members, next_after_id = _page(members, page_size)
+            return library_pb2.MemberList(members=[_member_to_pb(m) for m in members], next_after_id=next_after_id, version=version)
+        finally:
+            db.close()
+
+    def StreamMembers(self, request, context):
+        db = SessionLocal()
+        try:
+            for m in member_service.iter_members(db, after_id=request.after_id):
+                yield _member_to_pb(m)
         finally:
             db.close()
     
+    def ImportMembers(self, request_iterator, context):
+        db = SessionLocal()
+        try:
+            rows = ((r.name, r.contact) for r in request_iterator)
+            created, failures = member_service.import_members(db, rows)
+            return _import_result(created, failures)
+        except Exception as e:
+            logger.exception("ImportMembers failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.ImportResult()
+        finally:
+            db.close()
+
     def ListBorrowedBooks(self, request, context):
+        try:
+            _validate_borrowed_books_request(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BorrowedBooksResponse()
+
+        db = SessionLocal()
+        try:
+            limit = request.page_size + 1 if request.page_size else None
+            rows = borrowing_service.list_current_borrowing_rows(
+                db, member_id=request.member_id, book_id=request.book_id, after_id=request.after_id, limit=limit,
+            )
+            return _borrowed_books_response(rows, request.page_size)
+        finally:
+            db.close()
+
+    def GetBorrowingHistory(self, request, context):
+        try:
+            _validate_borrowed_books_request(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BorrowingHistory()
+
+        page_size = request.page_size or constants.DEFAULT_HISTORY_PAGE_SIZE
+        db = SessionLocal()
+        try:
+            rows = borrowing_service.borrowing_history(
+                db, member_id=request.member_id, book_id=request.book_id, after_id=request.after_id, limit=page_size + 1,
+            )
+            return _borrowing_history_response(rows, page_size)
+        except Exception as e:
+            logger.exception("GetBorrowingHistory failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.BorrowingHistory()
+        finally:
+            db.close()
+
+    def ListMemberLoans(self, request, context):
+        return self._list_loans(request, context, 'member_id', borrowing_service.list_member_loans)
+
+    def ListBookLoans(self, request, context):
+        return self._list_loans(request, context, 'book_id', borrowing_service.list_book_loans)
+
+    def _list_loans(self, request, context, owner_field, list_loans):
+        try:
+            position = _validate_loans_request(request, owner_field)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.LoanList()
+
+        page_size = request.page_size or constants.DEFAULT_HISTORY_PAGE_SIZE
+        db = SessionLocal()
+        try:
+            rows = list_loans(db, getattr(request, owner_field), request.status, position, limit=page_size + 1)
+            return _loan_list(rows, page_size)
+        except Exception as e:
+            logger.exception("List loans failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.LoanList()
+        finally:
+            db.close()
+
+    def ListOverdueLoans(self, request, context):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            position = sync.decode_cursor(request.cursor)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.LoanList()
+
+        page_size = request.page_size or constants.DEFAULT_HISTORY_PAGE_SIZE
+        db = SessionLocal()
+        try:
+            rows = borrowing_service.list_overdue_loans(db, datetime.now(UTC), position, limit=page_size + 1)
+            return _loan_list(rows, page_size, position=lambda row: (row.due_at, row.borrowing_id))
+        except Exception as e:
+            logger.exception("ListOverdueLoans failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.LoanList()
+        finally:
+            db.close()
+
+    def GetMemberFines(self, request, context):
+        try:
+            validators.validate_positive_int('member_id', request.member_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.MemberFines()
+
         db = SessionLocal()
         try:
-            borrowings = borrowing_service.list_current_borrowings(db)
-            borrowed_books = []
-            for b in borrowings:
-                borrowed_books.append(
-                    library_pb2.BorrowedBook(
-                        borrowing_id=b.id,
-                        book_id=b.book.id,
-                        book_title=b.book.title,
-                        member_id=b.member.id,
-                        member_name=b.member.name,
-                        borrowing_date=b.borrowed_at.strftime("%Y-%m-%d %H:%M:%S")[:10],
-                    )
-                )
-            return library_pb2.BorrowedBooksResponse(borrowed_books=borrowed_books)
+            if member_service.get_member(db, request.member_id) is None:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details(constants.MSG_MEMBER_NOT_FOUND)
+                return library_pb2.MemberFines()
+            rows = borrowing_service.member_fines(db, request.member_id, datetime.now(UTC))
+            open_rows = [row for row in rows if row.returned_at is None]
+            return library_pb2.MemberFines(
+                member_id=request.member_id,
+                total_cents=sum(row.fine_cents for row in rows),
+                open_cents=sum(row.fine_cents for row in open_rows),
+                overdue_loans=len(open_rows),
+                loans=[_borrowing_record(row, bool(getattr(row, "archived", False))) for row in rows],
+            )
+        except Exception as e:
+            logger.exception("GetMemberFines failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.MemberFines()
         finally:
             db.close()
 
@@ -144,12 +476,10 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
         db = SessionLocal()
         try:
-            borrowing = db.query(Borrowing).filter(Borrowing.id == request.borrowing_id).first()
-            if not borrowing:
+            if borrowing_service.return_borrowing_by_id(db, request.borrowing_id) is None:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 context.set_details(constants.MSG_BORROWING_NOT_FOUND)
                 return empty_pb2.Empty()
-            borrowing_service.return_borrowing(db, borrowing)
             return empty_pb2.Empty()
         except Exception as e:
             logger.exception("ReturnBook failed")
@@ -159,6 +489,172 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
         finally:
             db.close()
     
+    def BorrowBooks(self, request, context):
+        try:
+            validators.validate_positive_int('member_id', request.member_id)
+            validators.validate_id_list('book_ids', list(request.book_ids), constants.MAX_BATCH_ITEMS)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BatchResult()
+
+        db = SessionLocal()
+        try:
+            results, committed = borrowing_service.borrow_books(
+                db, list(request.book_ids), request.member_id, all_or_nothing=request.all_or_nothing,
+            )
+            if not committed and member_service.get_member(db, request.member_id) is None:
+                context.set_code(grpc.StatusCode.NOT_FOUND)
+                context.set_details(constants.MSG_MEMBER_NOT_FOUND)
+                return library_pb2.BatchResult()
+            return _batch_result(results, committed)
+        except Exception as e:
+            logger.exception("BorrowBooks failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.BatchResult()
+        finally:
+            db.close()
+
+    def ReturnBooks(self, request, context):
+        try:
+            validators.validate_id_list('borrowing_ids', list(request.borrowing_ids), constants.MAX_BATCH_ITEMS)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BatchResult()
+
+        db = SessionLocal()
+        try:
+            results, committed = borrowing_service.return_borrowings(
+                db, list(request.borrowing_ids), all_or_nothing=request.all_or_nothing,
+            )
+            return _batch_result(results, committed)
+        except Exception as e:
+            logger.exception("ReturnBooks failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.BatchResult()
+        finally:
+            db.close()
+
+    def GetLibraryStats(self, request, context):
+        try:
+            validators.validate_non_negative_int('member_id', request.member_id)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.LibraryStats()
+
+        stats = library_stats.snapshot()
+        reconciled_at = stats.pop("reconciled_at")
+        if request.member_id:
+            # per-member counts are not kept in shared memory; one index range answers it
+            db = SessionLocal()
+            try:
+                stats["member_open_loans"] = borrowing_service.count_open_loans(db, request.member_id)
+            except Exception as e:
+                logger.exception("GetLibraryStats failed")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                return library_pb2.LibraryStats()
+            finally:
+                db.close()
+        return library_pb2.LibraryStats(
+            reconciled_at=reconciled_at.isoformat() if reconciled_at else "",
+            **stats,
+        )
+
+    def WatchInventory(self, request, context):
+        try:
+            _validate_watch_request(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return
+        if request.epoch and request.epoch != inventory_events.epoch:
+            context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+            context.set_details(constants.MSG_EVENTS_LOST)
+            return
+        if not _watch_slots.acquire(blocking=False):
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(constants.MSG_TOO_MANY_WATCHERS)
+            return
+        try:
+            after_seq = request.after_seq or inventory_events.last_seq
+            entities = set(request.entities)
+            # headers now tell the client its position is fixed: every later write reaches it
+            context.send_initial_metadata(())
+            while context.is_active():
+                try:
+                    events = inventory_events.read(after_seq, timeout=constants.WATCH_POLL_SECONDS)
+                except EventsLost:
+                    context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+                    context.set_details(constants.MSG_EVENTS_LOST)
+                    return
+                for event in events:
+                    after_seq = event.seq
+                    if not entities or event.entity in entities:
+                        yield _event_to_pb(event, inventory_events.epoch)
+        finally:
+            _watch_slots.release()
+
+    def ListBooksSince(self, request, context):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            sync.decode_cursor(request.cursor)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.BookChanges()
+
+        db = SessionLocal()
+        try:
+            rows, next_cursor, has_more = book_service.list_books_since(
+                db, request.cursor, request.page_size or constants.DEFAULT_SYNC_PAGE_SIZE,
+            )
+            return library_pb2.BookChanges(
+                books=[_book_to_pb(b) for b in rows if b.deleted_at is None],
+                deleted_ids=[b.id for b in rows if b.deleted_at is not None],
+                next_cursor=next_cursor,
+                has_more=has_more,
+            )
+        except Exception as e:
+            logger.exception("ListBooksSince failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.BookChanges()
+        finally:
+            db.close()
+
+    def ListMembersSince(self, request, context):
+        try:
+            validators.validate_page_size(request.page_size, constants.MAX_PAGE_SIZE)
+            sync.decode_cursor(request.cursor)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return library_pb2.MemberChanges()
+
+        db = SessionLocal()
+        try:
+            rows, next_cursor, has_more = member_service.list_members_since(
+                db, request.cursor, request.page_size or constants.DEFAULT_SYNC_PAGE_SIZE,
+            )
+            return library_pb2.MemberChanges(
+                members=[_member_to_pb(m) for m in rows if m.deleted_at is None],
+                deleted_ids=[m.id for m in rows if m.deleted_at is not None],
+                next_cursor=next_cursor,
+                has_more=has_more,
+            )
+        except Exception as e:
+            logger.exception("ListMembersSince failed")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return library_pb2.MemberChanges()
+        finally:
+            db.close()
+
     # Update Book
     def UpdateBook(self, request, context):
         try:
@@ -172,13 +668,12 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
         db = SessionLocal()
         try:
-            book = book_service.get_book(db, request.id)
-            if not book:
+            updated = book_service.update_book_by_id(db, request.id, request.title, request.author)
+            if updated is None:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 context.set_details(constants.MSG_BOOK_NOT_FOUND)
                 return library_pb2.Book()
-            updated = book_service.update_book(db, book, request.title, request.author)
-            return library_pb2.Book(id=updated.id, title=updated.title, author=updated.author, available=updated.available)
+            return _book_to_pb(updated)
         except Exception as e:
             logger.exception("UpdateBook failed")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -198,16 +693,13 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
         db = SessionLocal()
         try:
-            book = book_service.get_book(db, request.id)
-            if not book:
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details(constants.MSG_BOOK_NOT_FOUND)
-                return empty_pb2.Empty()
-            if not book.available:
-                context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
-                context.set_details(constants.MSG_CANNOT_DELETE_BORROWED)
-                return empty_pb2.Empty()
-            book_service.delete_book(db, book)
+            if book_service.delete_book_by_id(db, request.id) is None:
+                if book_service.get_book(db, request.id) is None:
+                    context.set_code(grpc.StatusCode.NOT_FOUND)
+                    context.set_details(constants.MSG_BOOK_NOT_FOUND)
+                else:
+                    context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+                    context.set_details(constants.MSG_CANNOT_DELETE_BORROWED)
             return empty_pb2.Empty()
         except Exception as e:
             logger.exception("DeleteBook failed")
@@ -230,13 +722,12 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
 
         db = SessionLocal()
         try:
-            member = member_service.get_member(db, request.id)
-            if not member:
+            updated = member_service.update_member_by_id(db, request.id, request.name, request.contact)
+            if updated is None:
                 context.set_code(grpc.StatusCode.NOT_FOUND)
                 context.set_details(constants.MSG_MEMBER_NOT_FOUND)
                 return library_pb2.Member()
-            updated = member_service.update_member(db, member, request.name, request.contact)
-            return library_pb2.Member(id=updated.id, name=updated.name, contact=updated.contact)
+            return _member_to_pb(updated)
         except Exception as e:
             logger.exception("UpdateMember failed")
             context.set_code(grpc.StatusCode.INTERNAL)
@@ -262,7 +753,7 @@ class LibraryServiceImpl(library_pb2_grpc.LibraryServiceServicer):
                 context.set_details(constants.MSG_MEMBER_NOT_FOUND)
                 return empty_pb2.Empty()
             # prevent deletion if active borrowings
-            if db.query(Borrowing).filter(Borrowing.member_id == member.id, Borrowing.returned_at == None).first():
+            if borrowing_service.has_active_borrowings(db, member.id):
                 context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
                 context.set_details(constants.MSG_CANNOT_DELETE_MEMBER_WITH_BORROWED)
                 return empty_pb2.Empty()
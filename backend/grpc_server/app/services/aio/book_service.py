@@ -0,0 +1,77 @@
+"""asyncio counterpart of app.services.book_service for AsyncSession."""
+from datetime import datetime, UTC
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Book
+from app.logging_config import logger
+from app.cache import invalidate_books
+from app.stats import library_stats
+from app.events import publish_book
+from app.constants import STREAM_BATCH_SIZE
+from app.services.book_service import book_delete, book_update
+
+async def create_book(db: AsyncSession, title: str, author: str) -> Book:
+    book = Book(title=title.strip(), author=author.strip())
+    db.add(book)
+    try:
+        await db.commit()
+        invalidate_books()
+        library_stats.books_added()
+        publish_book("created", book)
+        logger.info("Created book", extra={"book_id": book.id, "title": book.title})
+        return book
+    except IntegrityError as e:
+        await db.rollback()
+        logger.exception("Failed to create book", exc_info=e)
+        raise
+
+def _books_select(only_available: bool, after_id: int):
+    stmt = select(Book).where(Book.deleted_at == None)
+    if only_available:
+        stmt = stmt.where(Book.available == True)
+    if after_id:
+        stmt = stmt.where(Book.id > after_id)
+    return stmt.order_by(Book.id)
+
+async def list_books(db: AsyncSession, only_available: bool = False, after_id: int = 0, limit: Optional[int] = None):
+    stmt = _books_select(only_available, after_id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return (await db.scalars(stmt)).all()
+
+async def iter_books(db: AsyncSession, only_available: bool = False, after_id: int = 0, batch_size: int = STREAM_BATCH_SIZE):
+    stmt = _books_select(only_available, after_id).execution_options(yield_per=batch_size)
+    async for book in await db.stream_scalars(stmt):
+        yield book
+
+async def get_book(db: AsyncSession, book_id: int):
+    return await db.scalar(select(Book).where(Book.id == book_id, Book.deleted_at == None))
+
+async def update_book_by_id(db: AsyncSession, book_id: int, title: str, author: str) -> Optional[Book]:
+    """See ``book_service.update_book_by_id``."""
+    try:
+        book = (await db.scalars(book_update(book_id, title, author))).one_or_none()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    if book is not None:
+        invalidate_books()
+        publish_book("updated", book)
+    return book
+
+async def delete_book_by_id(db: AsyncSession, book_id: int) -> Optional[Book]:
+    """See ``book_service.delete_book_by_id``."""
+    try:
+        book = (await db.scalars(book_delete(book_id, datetime.now(UTC)))).one_or_none()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    if book is not None:
+        invalidate_books()
+        library_stats.book_removed()
+        publish_book("deleted", book)
+    return book
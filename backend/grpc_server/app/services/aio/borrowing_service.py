@@ -0,0 +1,72 @@
+"""asyncio counterpart of the borrowing_service functions the grpc.aio servicer overrides.
+
+Statements come from app.services.borrowing_service, so both paths share one
+set of guards; only the awaiting differs. Relationships are never lazy-loaded
+here (that would need IO outside the event loop).
+"""
+from datetime import datetime, UTC
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Borrowing
+from app.logging_config import logger
+from app.cache import invalidate_books
+from app.stats import library_stats
+from app.events import publish_book, publish_borrowing
+from app.services.borrowing_service import (
+    assessment_update, claim_books_update, close_loans_update, current_borrowings_select, final_fines,
+    has_active_borrowings_select, loan_insert, release_books_update,
+)
+
+async def borrow_book_by_id(db: AsyncSession, book_id: int, member_id: int) -> Optional[Borrowing]:
+    """See ``borrowing_service.borrow_book_by_id``."""
+    try:
+        claimed = (await db.execute(claim_books_update([book_id], member_id))).first()
+        if claimed is None:
+            await db.rollback()
+            return None
+        borrowing = await db.scalar(loan_insert(book_id, member_id, datetime.now(UTC)))
+        await db.commit()
+        invalidate_books()
+        library_stats.borrowed()
+        publish_book("updated", claimed)
+        publish_borrowing("borrowed", borrowing.id, book_id, member_id)
+        logger.info("Book borrowed", extra={"book_id": book_id, "borrowing_id": borrowing.id})
+        return borrowing
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to create borrowing record")
+        raise
+
+async def list_current_borrowing_rows(db: AsyncSession, member_id: Optional[int] = None, book_id: Optional[int] = None,
+                                      after_id: int = 0, limit: Optional[int] = None):
+    stmt = current_borrowings_select(member_id, book_id, after_id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return (await db.execute(stmt)).all()
+
+async def has_active_borrowings(db: AsyncSession, member_id: int) -> bool:
+    return (await db.scalar(has_active_borrowings_select(member_id))) is not None
+
+async def return_borrowing_by_id(db: AsyncSession, borrowing_id: int, return_time=None) -> Optional[int]:
+    """See ``borrowing_service.return_borrowing_by_id``."""
+    return_time = return_time or datetime.now(UTC)
+    try:
+        closed = (await db.execute(close_loans_update([borrowing_id], return_time))).first()
+        if closed is None:
+            await db.rollback()
+            return None
+        released = (await db.execute(release_books_update([closed.book_id]))).first()
+        final = final_fines([closed], return_time)
+        if final:
+            await db.execute(assessment_update(open_only=False), final)
+        await db.commit()
+        invalidate_books()
+        library_stats.returned()
+        if released is not None:
+            publish_book("updated", released)
+        publish_borrowing("returned", borrowing_id, closed.book_id, closed.member_id)
+        return closed.book_id
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to return borrowing")
+        raise
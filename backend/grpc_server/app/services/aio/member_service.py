@@ -0,0 +1,74 @@
+"""asyncio counterpart of app.services.member_service for AsyncSession."""
+from datetime import datetime, UTC
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Member
+from app.logging_config import logger
+from app.cache import invalidate_members
+from app.stats import library_stats
+from app.events import publish_member
+from app.constants import STREAM_BATCH_SIZE
+from app.services.member_service import member_update
+
+async def create_member(db: AsyncSession, name: str, contact: str) -> Member:
+    member = Member(name=name.strip(), contact=contact.strip())
+    db.add(member)
+    try:
+        await db.commit()
+        invalidate_members()
+        library_stats.members_added()
+        publish_member("created", member)
+        logger.info("Created member", extra={"member_id": member.id, "member_name": member.name})
+        return member
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to create member")
+        raise
+
+def _members_select(after_id: int):
+    stmt = select(Member).where(Member.deleted_at == None)
+    if after_id:
+        stmt = stmt.where(Member.id > after_id)
+    return stmt.order_by(Member.id)
+
+async def list_members(db: AsyncSession, after_id: int = 0, limit: Optional[int] = None):
+    stmt = _members_select(after_id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return (await db.scalars(stmt)).all()
+
+async def iter_members(db: AsyncSession, after_id: int = 0, batch_size: int = STREAM_BATCH_SIZE):
+    stmt = _members_select(after_id).execution_options(yield_per=batch_size)
+    async for member in await db.stream_scalars(stmt):
+        yield member
+
+async def get_member(db: AsyncSession, member_id: int):
+    return await db.scalar(select(Member).where(Member.id == member_id, Member.deleted_at == None))
+
+async def update_member_by_id(db: AsyncSession, member_id: int, name: str, contact: str) -> Optional[Member]:
+    """See ``member_service.update_member_by_id``."""
+    try:
+        member = (await db.scalars(member_update(member_id, name, contact))).one_or_none()
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    if member is not None:
+        invalidate_members()
+        publish_member("updated", member)
+    return member
+
+async def delete_member(db: AsyncSession, member: Member):
+    """See ``member_service.delete_member``."""
+    now = datetime.now(UTC)
+    member.deleted_at = now
+    member.updated_at = now
+    try:
+        await db.commit()
+        invalidate_members()
+        library_stats.member_removed()
+        publish_member("deleted", member)
+    except Exception:
+        await db.rollback()
+        raise
@@ -1,14 +1,26 @@
+from sqlalchemy import column, or_, select, table, update
 from sqlalchemy.exc import IntegrityError
+from typing import Iterable, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models import Book
 from app.logging_config import logger
+from app.cache import invalidate_books
+from app.stats import library_stats
+from app.events import publish_book
+from app.constants import STREAM_BATCH_SIZE, IMPORT_BATCH_SIZE, MSG_DUPLICATE_BOOK
+from app.services.sync import changes_since
+from datetime import datetime, UTC
+from app.services.bulk import chunked, insert_ignoring_conflicts
+from app import validators
 
 def create_book(db: Session, title: str, author: str) -> Book:
     book = Book(title=title.strip(), author=author.strip())
     db.add(book)
     try:
         db.commit()
-        db.refresh(book)
+        invalidate_books()
+        library_stats.books_added()
+        publish_book("created", book)
         logger.info("Created book", extra={"book_id": book.id, "title": book.title})
         return book
     except IntegrityError as e:
@@ -16,30 +28,162 @@ def create_book(db: Session, title: str, author: str) -> Book:
         logger.exception("Failed to create book", exc_info=e)
         raise
 
-def list_books(db: Session, only_available: bool = False):
-    q = db.query(Book)
+def _books_query(db: Session, only_available: bool, after_id: int):
+    q = db.query(Book).filter(Book.deleted_at == None)
     if only_available:
         q = q.filter(Book.available == True)
-    return q.order_by(Book.id).all()
+    if after_id:
+        q = q.filter(Book.id > after_id)
+    return q.order_by(Book.id)
+
+def list_books(db: Session, only_available: bool = False, after_id: int = 0, limit: Optional[int] = None):
+    """Return books ordered by id, optionally as a keyset page after ``after_id``."""
+    q = _books_query(db, only_available, after_id)
+    if limit:
+        q = q.limit(limit)
+    return q.all()
+
+def iter_books(db: Session, only_available: bool = False, after_id: int = 0, batch_size: int = STREAM_BATCH_SIZE):
+    """Yield books ordered by id, fetching ``batch_size`` rows at a time."""
+    return _books_query(db, only_available, after_id).yield_per(batch_size)
+
+# SQLite FTS5 index created by migration 0003 (rowid = books.id)
+_books_fts = table("books_fts", column("rowid"), column("books_fts"))
+# trigram index needs at least three characters to look anything up
+_MIN_TRIGRAM_QUERY = 3
+
+def _like_pattern(query: str, prefix: bool) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+def search_books(db: Session, query: str, prefix: bool = False, available_only: bool = False,
+                 after_id: int = 0, limit: Optional[int] = None):
+    """Books whose title or author contains (or, with ``prefix``, starts with) ``query``, by id.
+
+    On SQLite candidates come from the FTS5 trigram index in rowid order, so a
+    page stops reading as soon as it is full; on Postgres the ILIKE filter is
+    served by the pg_trgm GIN indexes.
+    """
+    query = query.strip()
+    pattern = _like_pattern(query, prefix)
+    matches = or_(Book.title.ilike(pattern, escape="\\"), Book.author.ilike(pattern, escape="\\"))
+    stmt = select(Book).where(Book.deleted_at == None)
+    order = Book.id
+    if db.get_bind().dialect.name == "sqlite" and len(query) >= _MIN_TRIGRAM_QUERY:
+        phrase = '"' + query.replace('"', '""') + '"'
+        stmt = stmt.join(_books_fts, _books_fts.c.rowid == Book.id).where(_books_fts.c.books_fts.op("MATCH")(phrase))
+        # ordering and paging on the FTS rowid lets SQLite walk the index in
+        # order and stop at the limit instead of sorting every match
+        order = _books_fts.c.rowid
+        if prefix:
+            stmt = stmt.where(matches)
+    else:
+        stmt = stmt.where(matches)
+    if available_only:
+        stmt = stmt.where(Book.available == True)
+    if after_id:
+        stmt = stmt.where(order > after_id)
+    stmt = stmt.order_by(order)
+    if limit:
+        stmt = stmt.limit(limit)
+    return db.scalars(stmt).all()
 
 def get_book(db: Session, book_id: int):
-    return db.query(Book).filter(Book.id == book_id).first()
+    return db.query(Book).filter(Book.id == book_id, Book.deleted_at == None).first()
 
-def update_book(db: Session, book: Book, title: str, author: str):
-    book.title = title
-    book.author = author
+def list_books_since(db: Session, cursor: str, limit: int, settle_seconds: Optional[float] = None):
+    """Books created, changed or deleted after ``cursor``; see app/services/sync.py."""
+    return changes_since(db, Book, cursor, limit, settle_seconds)
+
+def book_update(book_id: int, title: str, author: str):
+    return (
+        update(Book)
+        .where(Book.id == book_id, Book.deleted_at == None)
+        .values(title=title, author=author)
+        .returning(Book)
+    )
+
+def update_book_by_id(db: Session, book_id: int, title: str, author: str) -> Optional[Book]:
+    """Update one book with a single ``UPDATE ... RETURNING``; None if it does not exist."""
     try:
+        book = db.scalars(book_update(book_id, title, author)).one_or_none()
         db.commit()
-        db.refresh(book)
-        return book
     except Exception:
         db.rollback()
         raise
+    if book is not None:
+        invalidate_books()
+        publish_book("updated", book)
+    return book
 
-def delete_book(db: Session, book: Book):
-    db.delete(book)
+def book_delete(book_id: int, deleted_at: datetime):
+    """Soft delete of a book that is neither borrowed nor already deleted; ``available = false``
+    keeps the tombstone out of ix_books_available and unborrowable."""
+    return (
+        update(Book)
+        .where(Book.id == book_id, Book.available == True, Book.deleted_at == None)
+        .values(deleted_at=deleted_at, updated_at=deleted_at, available=False)
+        .returning(Book)
+    )
+
+def delete_book_by_id(db: Session, book_id: int) -> Optional[Book]:
+    """Soft delete with a single conditional ``UPDATE ... RETURNING``: the row stays as a
+    tombstone for delta sync and loan history. None if the book does not exist or is borrowed."""
     try:
+        book = db.scalars(book_delete(book_id, datetime.now(UTC))).one_or_none()
         db.commit()
     except Exception:
         db.rollback()
         raise
+    if book is not None:
+        invalidate_books()
+        library_stats.book_removed()
+        publish_book("deleted", book)
+    return book
+
+def import_books(db: Session, rows: Iterable[Tuple[str, str]], batch_size: int = IMPORT_BATCH_SIZE):
+    """Insert ``(title, author)`` rows in multi-row batches, one commit per batch.
+
+    Invalid rows and rows that collide with ``uq_books_title_author`` (in the
+    database or earlier in the same import) are reported instead of aborting
+    the import. Returns ``(created, failures)`` where failures are
+    ``(index, message)`` pairs indexed by position in ``rows``.
+    """
+    created, failures, seen = 0, [], set()
+    for chunk in chunked(enumerate(rows), batch_size):
+        params, keys = [], []
+        for index, (title, author) in chunk:
+            try:
+                validators.validate_required_str('title', title)
+                validators.validate_required_str('author', author)
+            except ValueError as e:
+                failures.append((index, str(e)))
+                continue
+            title, author = title.strip(), author.strip()
+            key = (title.lower(), author.lower())
+            if key in seen:
+                failures.append((index, MSG_DUPLICATE_BOOK))
+                continue
+            seen.add(key)
+            params.append({"title": title, "author": author})
+            keys.append((index, key))
+        if not params:
+            continue
+        stmt = insert_ignoring_conflicts(db, Book).returning(Book.id, Book.title, Book.author, Book.available)
+        try:
+            rows = db.execute(stmt, params).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to import books")
+            raise
+        inserted = {(row.title.lower(), row.author.lower()) for row in rows}
+        if inserted:
+            invalidate_books()
+            library_stats.books_added(len(inserted))
+            for row in rows:
+                publish_book("created", row)
+        created += len(inserted)
+        failures.extend((index, MSG_DUPLICATE_BOOK) for index, key in keys if key not in inserted)
+    logger.info("Imported books", extra={"created_count": created, "failed_count": len(failures)})
+    return created, sorted(failures)
@@ -1,40 +1,467 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, literal, or_, select, tuple_, union_all, update
 from sqlalchemy.orm import Session
-from app.models import Borrowing, Book
+from app.models import ArchivedBorrowing, Borrowing, Book, Member
 from app.logging_config import logger
+from app.cache import invalidate_books
+from app.stats import library_stats
+from app.events import publish_book, publish_borrowing
+from app import fines
+from app.constants import (
+    MSG_BOOK_NOT_AVAILABLE, MSG_BORROWING_NOT_FOUND, MSG_DUPLICATE_ITEM, MSG_BATCH_ROLLED_BACK,
+)
 from datetime import datetime, UTC
 
-def borrow_book(db: Session, book: Book, member_id: int):
-    if not book.available:
-        return None
-    book.available = False
-    borrowing = Borrowing(book_id=book.id, member_id=member_id, borrowed_at=datetime.now(UTC))
-    db.add(borrowing)
+# what publish_book needs of each book a borrow or return changed
+_BOOK_EVENT_COLUMNS = (Book.id, Book.title, Book.author, Book.available)
+
+def claim_books_update(book_ids: List[int], member_id: int):
+    """``UPDATE books SET available = false WHERE id IN (...) AND available AND EXISTS (member)
+    RETURNING ...``: the availability and member check of every borrow path, so a member
+    deleted concurrently cannot borrow."""
+    member_exists = select(Member.id).where(Member.id == member_id, Member.deleted_at == None).exists()
+    return (
+        update(Book)
+        .where(Book.id.in_(book_ids), Book.available == True, member_exists)
+        .values(available=False)
+        .returning(*_BOOK_EVENT_COLUMNS)
+    )
+
+def loan_insert(book_id: int, member_id: int, borrowed_at: datetime):
+    return (
+        insert(Borrowing)
+        .values(book_id=book_id, member_id=member_id, borrowed_at=borrowed_at, due_at=fines.due_date(borrowed_at))
+        .returning(Borrowing)
+    )
+
+def borrow_book_by_id(db: Session, book_id: int, member_id: int) -> Optional[Borrowing]:
+    """Atomically claim the book and record the borrowing in one transaction.
+
+    The conditional ``UPDATE ... WHERE available`` is the availability check, so
+    concurrent callers cannot both win. Returns None if the book does not exist
+    or is already borrowed, or the member does not exist.
+    """
     try:
+        claimed = db.execute(claim_books_update([book_id], member_id)).first()
+        if claimed is None:
+            db.rollback()
+            return None
+        borrowing = db.scalar(loan_insert(book_id, member_id, datetime.now(UTC)))
+        borrowing_id = borrowing.id
         db.commit()
-        db.refresh(borrowing)
-        logger.info("Book borrowed", extra={"book_id": book.id, "borrowing_id": borrowing.id})
+        invalidate_books()
+        library_stats.borrowed()
+        publish_book("updated", claimed)
+        publish_borrowing("borrowed", borrowing.id, book_id, member_id)
+        logger.info("Book borrowed", extra={"book_id": book_id, "borrowing_id": borrowing_id})
         return borrowing
     except Exception:
         db.rollback()
         logger.exception("Failed to create borrowing record")
         raise
 
-def list_current_borrowings(db: Session):
+def _split_duplicates(ids):
+    """Return (unique ids in request order, set of ids that were repeated)."""
+    unique, seen, repeated = [], set(), set()
+    for i in ids:
+        if i in seen:
+            repeated.add(i)
+        else:
+            seen.add(i)
+            unique.append(i)
+    return unique, repeated
+
+def _batch_results(ids, done: dict, failure_message: str, repeated: set, committed: bool):
+    """Per-item ``(id, ok, message, borrowing_id)`` in request order."""
+    results, reported = [], set()
+    for i in ids:
+        if i in reported:
+            results.append((i, False, MSG_DUPLICATE_ITEM, 0))
+        elif i in done and committed:
+            results.append((i, True, "", done[i]))
+        elif i in done:
+            results.append((i, False, MSG_BATCH_ROLLED_BACK, 0))
+        else:
+            results.append((i, False, failure_message, 0))
+        reported.add(i)
+    return results
+
+def borrow_books(db: Session, book_ids: List[int], member_id: int,
+                 all_or_nothing: bool = False) -> Tuple[list, bool]:
+    """Borrow several books for one member with set-based SQL in one transaction.
+
+    One ``UPDATE ... WHERE id IN (...) AND available RETURNING id`` claims every
+    free book and one multi-row INSERT records the loans; nothing is claimed if
+    the member does not exist. Returns ``(results, committed)`` with results as
+    in ``_batch_results``.
+    """
+    unique, repeated = _split_duplicates(book_ids)
+    try:
+        claimed = {book.id: book for book in db.execute(claim_books_update(unique, member_id))}
+        if not claimed or (all_or_nothing and (len(claimed) < len(unique) or repeated)):
+            db.rollback()
+            return _batch_results(book_ids, {i: 0 for i in claimed}, MSG_BOOK_NOT_AVAILABLE, repeated, False), False
+        now = datetime.now(UTC)
+        inserted = db.execute(
+            insert(Borrowing).returning(Borrowing.book_id, Borrowing.id),
+            [{"book_id": i, "member_id": member_id, "borrowed_at": now, "due_at": fines.due_date(now)}
+             for i in unique if i in claimed],
+        )
+        done = {book_id: borrowing_id for book_id, borrowing_id in inserted}
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to borrow books")
+        raise
+    invalidate_books()
+    library_stats.borrowed(len(done))
+    for book_id, borrowing_id in done.items():
+        publish_book("updated", claimed[book_id])
+        publish_borrowing("borrowed", borrowing_id, book_id, member_id)
+    logger.info("Books borrowed", extra={"member_id": member_id, "borrowed_count": len(done)})
+    return _batch_results(book_ids, done, MSG_BOOK_NOT_AVAILABLE, repeated, True), True
+
+def return_borrowings(db: Session, borrowing_ids: List[int], all_or_nothing: bool = False,
+                      return_time=None) -> Tuple[list, bool]:
+    """Close several open borrowings and release their books in one transaction."""
+    unique, repeated = _split_duplicates(borrowing_ids)
+    return_time = return_time or datetime.now(UTC)
+    try:
+        closed = db.execute(close_loans_update(unique, return_time)).all()
+        done = {borrowing_id: borrowing_id for borrowing_id, _, _, _ in closed}
+        if not closed or (all_or_nothing and (len(closed) < len(unique) or repeated)):
+            db.rollback()
+            return _batch_results(borrowing_ids, done, MSG_BORROWING_NOT_FOUND, repeated, False), False
+        released = db.execute(release_books_update([book_id for _, book_id, _, _ in closed]))
+        released = {book.id: book for book in released}
+        fix_final_fines(db, closed, return_time)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to return borrowings")
+        raise
+    invalidate_books()
+    library_stats.returned(len(closed))
+    for borrowing_id, book_id, member_id, _ in closed:
+        if book_id in released:
+            publish_book("updated", released[book_id])
+        publish_borrowing("returned", borrowing_id, book_id, member_id)
+    return _batch_results(borrowing_ids, done, MSG_BORROWING_NOT_FOUND, repeated, True), True
+
+def has_active_borrowings_select(member_id: int):
+    return select(Borrowing.id).where(Borrowing.member_id == member_id, Borrowing.returned_at == None).limit(1)
+
+def has_active_borrowings(db: Session, member_id: int) -> bool:
+    return db.scalar(has_active_borrowings_select(member_id)) is not None
+
+def count_open_loans(db: Session, member_id: int) -> int:
+    """Open loans of one member, counted off ``ix_borrowings_member_loans``."""
+    return db.scalar(
+        select(func.count()).select_from(Borrowing)
+        .where(Borrowing.member_id == member_id, Borrowing.returned_at == None)
+    )
+
+def current_borrowings_select(member_id: Optional[int] = None, book_id: Optional[int] = None, after_id: int = 0):
+    """Open loans as flat (borrowing_id, book_id, book_title, member_id, member_name, borrowed_at) rows."""
+    stmt = (
+        select(
+            Borrowing.id.label("borrowing_id"),
+            Book.id.label("book_id"),
+            Book.title.label("book_title"),
+            Member.id.label("member_id"),
+            Member.name.label("member_name"),
+            Borrowing.borrowed_at,
+        )
+        .join(Book, Borrowing.book_id == Book.id)
+        .join(Member, Borrowing.member_id == Member.id)
+        .where(Borrowing.returned_at == None)
+    )
+    if member_id:
+        stmt = stmt.where(Borrowing.member_id == member_id)
+    if book_id:
+        stmt = stmt.where(Borrowing.book_id == book_id)
+    if after_id:
+        stmt = stmt.where(Borrowing.id > after_id)
+    return stmt.order_by(Borrowing.id)
+
+def list_current_borrowing_rows(db: Session, member_id: Optional[int] = None, book_id: Optional[int] = None,
+                                after_id: int = 0, limit: Optional[int] = None):
+    """One joined SELECT for the front-desk loan list; no ORM objects, no lazy loads."""
+    stmt = current_borrowings_select(member_id, book_id, after_id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return db.execute(stmt).all()
+
+_ARCHIVED_COLUMNS = [
+    "id", "book_id", "member_id", "borrowed_at", "returned_at", "created_at", "due_at", "overdue_days", "fine_cents",
+]
+
+def archive_candidates_select(returned_before: datetime, batch_size: int):
+    newest = select(func.max(Borrowing.id)).scalar_subquery()
     return (
-        db.query(Borrowing)
+        select(Borrowing.id)
+        .where(Borrowing.returned_at < returned_before, Borrowing.id < newest)
+        .order_by(Borrowing.returned_at)
+        .limit(batch_size)
+    )
+
+def archive_returned_batch(db: Session, returned_before: datetime, batch_size: int) -> int:
+    """Move up to ``batch_size`` loans returned before ``returned_before`` to the archive.
+
+    One transaction: pick ids via ``ix_borrowings_returned_at``, copy them with
+    INSERT ... SELECT, delete them. Returned loans are never updated again, so
+    nothing can change a row between the copy and the delete. The newest
+    borrowing always stays: SQLite hands out max(id) + 1, and archiving the
+    top id would let a new loan reuse it. Returns the number of rows moved.
+    """
+    try:
+        ids = db.scalars(archive_candidates_select(returned_before, batch_size)).all()
+        if not ids:
+            db.rollback()
+            return 0
+        columns = [getattr(Borrowing, name) for name in _ARCHIVED_COLUMNS]
+        db.execute(insert(ArchivedBorrowing).from_select(
+            _ARCHIVED_COLUMNS + ["archived_at"],
+            select(*columns, literal(datetime.now(UTC), ArchivedBorrowing.archived_at.type)).where(Borrowing.id.in_(ids)),
+        ))
+        db.execute(delete(Borrowing).where(Borrowing.id.in_(ids)))
+        db.commit()
+        return len(ids)
+    except Exception:
+        db.rollback()
+        raise
+
+def history_select(member_id: Optional[int] = None, book_id: Optional[int] = None, after_id: int = 0,
+                   limit: Optional[int] = None):
+    """Loans from ``borrowings`` and ``borrowings_archive`` merged in id order, as flat
+    (borrowing_id, book_id, book_title, member_id, member_name, borrowed_at, returned_at,
+    archived, due_at, overdue_days, fine_cents) rows.
+
+    Each side is filtered and limited on its own index before the merge, so a
+    page costs at most ``2 * limit`` index rows whatever the history size.
+    """
+    def side(model, archived):
+        stmt = select(
+            model.id, model.book_id, model.member_id, model.borrowed_at, model.returned_at,
+            literal(archived).label("archived"), model.due_at, model.overdue_days, model.fine_cents,
+        )
+        if member_id:
+            stmt = stmt.where(model.member_id == member_id)
+        if book_id:
+            stmt = stmt.where(model.book_id == book_id)
+        if after_id:
+            stmt = stmt.where(model.id > after_id)
+        if limit:
+            stmt = stmt.order_by(model.id).limit(limit)
+        return select(stmt.subquery())
+
+    loans = union_all(side(Borrowing, False), side(ArchivedBorrowing, True)).subquery()
+    stmt = (
+        select(
+            loans.c.id.label("borrowing_id"),
+            loans.c.book_id,
+            Book.title.label("book_title"),
+            loans.c.member_id,
+            Member.name.label("member_name"),
+            loans.c.borrowed_at,
+            loans.c.returned_at,
+            loans.c.archived,
+            loans.c.due_at,
+            loans.c.overdue_days,
+            loans.c.fine_cents,
+        )
+        # archive rows carry no foreign keys
+        .outerjoin(Book, Book.id == loans.c.book_id)
+        .outerjoin(Member, Member.id == loans.c.member_id)
+        .order_by(loans.c.id)
+    )
+    return stmt.limit(limit) if limit else stmt
+
+def borrowing_history(db: Session, member_id: Optional[int] = None, book_id: Optional[int] = None,
+                      after_id: int = 0, limit: Optional[int] = None):
+    return db.execute(history_select(member_id, book_id, after_id, limit)).all()
+
+LOAN_STATUSES = {"open", "returned"}
+
+def loans_select(owner_column, owner_id: int, status: str = "", position=None, limit: Optional[int] = None):
+    """One member's or book's loans, newest first, as flat
+    (borrowing_id, book_id, book_title, member_id, member_name, borrowed_at, returned_at, archived) rows.
+
+    ``owner_column`` is ``Borrowing.member_id`` or ``Borrowing.book_id``;
+    ``position`` is the ``(borrowed_at, id)`` of the last row of the previous
+    page. Each table is a range scan of its loan-list covering index
+    (``ix_borrowings_member_loans`` / ``ix_borrowings_archive_member_loans``
+    and the book twins) in page order. Returned loans may have moved to the
+    archive, so unless only open loans are asked for both sides are read,
+    each limited on its own, and merged as in ``history_select``.
+    """
+    def side(model, archived):
+        stmt = (
+            select(
+                model.id.label("borrowing_id"),
+                model.book_id,
+                Book.title.label("book_title"),
+                model.member_id,
+                Member.name.label("member_name"),
+                model.borrowed_at,
+                model.returned_at,
+                literal(archived).label("archived"),
+            )
+            # archive rows carry no foreign keys
+            .outerjoin(Book, Book.id == model.book_id)
+            .outerjoin(Member, Member.id == model.member_id)
+            .where(getattr(model, owner_column.key) == owner_id)
+        )
+        if status == "open":
+            stmt = stmt.where(model.returned_at == None)
+        elif status == "returned":
+            stmt = stmt.where(model.returned_at != None)
+        if position is not None:
+            stmt = stmt.where(tuple_(model.borrowed_at, model.id) < tuple_(*position))
+        stmt = stmt.order_by(model.borrowed_at.desc(), model.id.desc())
+        return stmt.limit(limit) if limit else stmt
+
+    if status == "open":
+        # only returned loans are ever archived
+        return side(Borrowing, False)
+    loans = union_all(
+        select(side(Borrowing, False).subquery()), select(side(ArchivedBorrowing, True).subquery()),
+    ).subquery()
+    stmt = select(loans).order_by(loans.c.borrowed_at.desc(), loans.c.borrowing_id.desc())
+    return stmt.limit(limit) if limit else stmt
+
+def list_member_loans(db: Session, member_id: int, status: str = "", position=None, limit: Optional[int] = None):
+    return db.execute(loans_select(Borrowing.member_id, member_id, status, position, limit)).all()
+
+def list_book_loans(db: Session, book_id: int, status: str = "", position=None, limit: Optional[int] = None):
+    return db.execute(loans_select(Borrowing.book_id, book_id, status, position, limit)).all()
+
+def assessment_update(open_only: bool):
+    # Core executemany: one prepared UPDATE for the whole batch of parameter sets
+    table = Borrowing.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("loan_id"))
+        .values(overdue_days=bindparam("overdue_days"), fine_cents=bindparam("fine_cents"))
+    )
+    return stmt.where(table.c.returned_at == None) if open_only else stmt
+
+def apply_assessments(db: Session, assessments: List[dict], open_only: bool = False):
+    """Write ``fines.assessments`` results; ``open_only`` leaves loans returned meanwhile alone,
+    so a scan cannot overwrite the final amount a return just fixed."""
+    if assessments:
+        db.execute(assessment_update(open_only), assessments)
+
+def final_fines(closed, return_time: datetime) -> List[dict]:
+    """Final overdue days / fine of just-returned ``(id, book_id, member_id, due_at)`` rows, late ones only."""
+    return fines.assessments([(row.id, row.due_at, 0, 0) for row in closed], return_time)
+
+def fix_final_fines(db: Session, closed, return_time: datetime):
+    """Store ``final_fines``: nothing for on-time returns, one executemany UPDATE in
+    the return's own transaction for late ones."""
+    apply_assessments(db, final_fines(closed, return_time))
+
+def _overdue(stmt, as_of: datetime, position=None):
+    # ix_borrowings_open_due, walked in (due_at, id) order
+    stmt = stmt.where(Borrowing.returned_at == None, Borrowing.due_at < as_of)
+    if position is not None:
+        stmt = stmt.where(tuple_(Borrowing.due_at, Borrowing.id) > tuple_(*position))
+    return stmt.order_by(Borrowing.due_at, Borrowing.id)
+
+def overdue_assessment_batch(db: Session, as_of: datetime, position, limit: int):
+    """Next ``limit`` overdue open loans after ``position`` as (id, due_at, overdue_days, fine_cents)."""
+    stmt = select(Borrowing.id, Borrowing.due_at, Borrowing.overdue_days, Borrowing.fine_cents)
+    return db.execute(_overdue(stmt, as_of, position).limit(limit)).all()
+
+def _fined_loan_columns():
+    return (
+        Borrowing.id.label("borrowing_id"),
+        Borrowing.book_id,
+        Book.title.label("book_title"),
+        Borrowing.member_id,
+        Member.name.label("member_name"),
+        Borrowing.borrowed_at,
+        Borrowing.returned_at,
+        Borrowing.due_at,
+        Borrowing.overdue_days,
+        Borrowing.fine_cents,
+    )
+
+def overdue_loans_select(as_of: datetime, position=None, limit: Optional[int] = None):
+    """Open loans past due, longest overdue first; ``position`` is the last (due_at, id) seen."""
+    stmt = (
+        select(*_fined_loan_columns())
+        .join(Book, Borrowing.book_id == Book.id)
+        .join(Member, Borrowing.member_id == Member.id)
+    )
+    stmt = _overdue(stmt, as_of, position)
+    return stmt.limit(limit) if limit else stmt
+
+def list_overdue_loans(db: Session, as_of: datetime, position=None, limit: Optional[int] = None):
+    """``overdue_loans_select`` rows with their fines assessed as of ``as_of``."""
+    return fines.with_current_fines(db.execute(overdue_loans_select(as_of, position, limit)), as_of)
+
+def member_fines_select(member_id: int, as_of: datetime):
+    """A member's fined or overdue loans still in live storage, newest first; open ones are
+    selected by due date, as the scanner may not have assessed them yet."""
+    fined_or_overdue = or_(
+        Borrowing.fine_cents > 0,
+        and_(Borrowing.returned_at == None, Borrowing.due_at < as_of),
+    )
+    return (
+        select(*_fined_loan_columns())
         .join(Book, Borrowing.book_id == Book.id)
-        .filter(Borrowing.returned_at == None)
-        .order_by(Borrowing.id)
-        .all()
+        .join(Member, Borrowing.member_id == Member.id)
+        .where(Borrowing.member_id == member_id, fined_or_overdue)
+        .order_by(Borrowing.borrowed_at.desc(), Borrowing.id.desc())
     )
 
-def return_borrowing(db: Session, borrowing, return_time=None):
-    borrowing.returned_at = return_time or datetime.now(UTC)
-    borrowing.book.available = True
+def member_fines(db: Session, member_id: int, as_of: datetime):
+    """``member_fines_select`` rows with open loans assessed as of ``as_of``; loans that
+    are overdue by less than a day owe nothing yet and are left out."""
+    rows = fines.with_current_fines(db.execute(member_fines_select(member_id, as_of)), as_of)
+    return [row for row in rows if row.fine_cents > 0]
+
+def close_loans_update(borrowing_ids: List[int], return_time: datetime):
+    """Close the still-open loans among ``borrowing_ids``, returning (id, book_id, member_id, due_at)."""
+    return (
+        update(Borrowing)
+        .where(Borrowing.id.in_(borrowing_ids), Borrowing.returned_at == None)
+        .values(returned_at=return_time)
+        .returning(Borrowing.id, Borrowing.book_id, Borrowing.member_id, Borrowing.due_at)
+    )
+
+def release_books_update(book_ids: List[int]):
+    # a deleted book stays unavailable even if a loan of it is closed
+    return (
+        update(Book)
+        .where(Book.id.in_(book_ids), Book.deleted_at == None)
+        .values(available=True)
+        .returning(*_BOOK_EVENT_COLUMNS)
+    )
+
+def return_borrowing_by_id(db: Session, borrowing_id: int, return_time=None) -> Optional[int]:
+    """Close an open borrowing and release its book in one transaction.
+
+    Returns the book id, or None if no open borrowing has that id (so a second
+    return of the same loan cannot free a book someone else has since borrowed).
+    """
+    return_time = return_time or datetime.now(UTC)
     try:
+        closed = db.execute(close_loans_update([borrowing_id], return_time)).first()
+        if closed is None:
+            db.rollback()
+            return None
+        released = db.execute(release_books_update([closed.book_id])).first()
+        fix_final_fines(db, [closed], return_time)
         db.commit()
-        db.refresh(borrowing)
-        return borrowing
+        invalidate_books()
+        library_stats.returned()
+        if released is not None:
+            publish_book("updated", released)
+        publish_borrowing("returned", borrowing_id, closed.book_id, closed.member_id)
+        return closed.book_id
     except Exception:
         db.rollback()
+        logger.exception("Failed to return borrowing")
         raise
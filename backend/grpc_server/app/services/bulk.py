@@ -0,0 +1,27 @@
+"""Helpers shared by the bulk import paths of the service modules."""
+from itertools import islice
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+def chunked(iterable, size: int):
+    """Yield lists of at most ``size`` items without materialising ``iterable``."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def insert_ignoring_conflicts(db: Session, model):
+    """INSERT for ``model`` that skips rows violating any unique index.
+
+    Combined with RETURNING and a list of parameter sets this runs as batched
+    multi-row INSERTs (SQLAlchemy "insertmanyvalues") on both SQLite and Postgres.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model)
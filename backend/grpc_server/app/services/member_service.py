@@ -1,13 +1,25 @@
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models import Member
 from app.logging_config import logger
+from app.cache import invalidate_members
+from app.stats import library_stats
+from app.events import publish_member
+from app.constants import STREAM_BATCH_SIZE, IMPORT_BATCH_SIZE, MSG_DUPLICATE_MEMBER
+from app.services.sync import changes_since
+from datetime import datetime, UTC
+from app.services.bulk import chunked, insert_ignoring_conflicts
+from app import validators
 
 def create_member(db: Session, name: str, contact: str) -> Member:
     member = Member(name=name.strip(), contact=contact.strip())
     db.add(member)
     try:
         db.commit()
-        db.refresh(member)
+        invalidate_members()
+        library_stats.members_added()
+        publish_member("created", member)
         logger.info("Created member", extra={"member_id": member.id, "member_name": member.name})
         return member
     except Exception:
@@ -15,27 +27,106 @@ def create_member(db: Session, name: str, contact: str) -> Member:
         logger.exception("Failed to create member")
         raise
 
-def list_members(db: Session):
-    return db.query(Member).order_by(Member.id).all()
+def _members_query(db: Session, after_id: int):
+    q = db.query(Member).filter(Member.deleted_at == None)
+    if after_id:
+        q = q.filter(Member.id > after_id)
+    return q.order_by(Member.id)
+
+def list_members(db: Session, after_id: int = 0, limit: Optional[int] = None):
+    """Return members ordered by id, optionally as a keyset page after ``after_id``."""
+    q = _members_query(db, after_id)
+    if limit:
+        q = q.limit(limit)
+    return q.all()
+
+def iter_members(db: Session, after_id: int = 0, batch_size: int = STREAM_BATCH_SIZE):
+    """Yield members ordered by id, fetching ``batch_size`` rows at a time."""
+    return _members_query(db, after_id).yield_per(batch_size)
 
 def get_member(db: Session, member_id: int):
-    return db.query(Member).filter(Member.id == member_id).first()
+    return db.query(Member).filter(Member.id == member_id, Member.deleted_at == None).first()
+
+def list_members_since(db: Session, cursor: str, limit: int, settle_seconds: Optional[float] = None):
+    """Members created, changed or deleted after ``cursor``; see app/services/sync.py."""
+    return changes_since(db, Member, cursor, limit, settle_seconds)
+
+def member_update(member_id: int, name: str, contact: str):
+    return (
+        update(Member)
+        .where(Member.id == member_id, Member.deleted_at == None)
+        .values(name=name, contact=contact)
+        .returning(Member)
+    )
 
-def update_member(db: Session, member: Member, name: str, contact: str):
-    member.name = name
-    member.contact = contact
+def update_member_by_id(db: Session, member_id: int, name: str, contact: str) -> Optional[Member]:
+    """Update one member with a single ``UPDATE ... RETURNING``; None if it does not exist."""
     try:
+        member = db.scalars(member_update(member_id, name, contact)).one_or_none()
         db.commit()
-        db.refresh(member)
-        return member
     except Exception:
         db.rollback()
         raise
+    if member is not None:
+        invalidate_members()
+        publish_member("updated", member)
+    return member
 
 def delete_member(db: Session, member: Member):
-    db.delete(member)
+    """Soft delete: the row stays as a tombstone for delta sync and loan history."""
+    now = datetime.now(UTC)
+    member.deleted_at = now
+    member.updated_at = now
     try:
         db.commit()
+        invalidate_members()
+        library_stats.member_removed()
+        publish_member("deleted", member)
     except Exception:
         db.rollback()
         raise
+
+def import_members(db: Session, rows: Iterable[Tuple[str, str]], batch_size: int = IMPORT_BATCH_SIZE):
+    """Insert ``(name, contact)`` rows in multi-row batches, one commit per batch.
+
+    Same contract as ``book_service.import_books``; conflicts are reported
+    against ``uq_members_contact``.
+    """
+    created, failures, seen = 0, [], set()
+    for chunk in chunked(enumerate(rows), batch_size):
+        params, keys = [], []
+        for index, (name, contact) in chunk:
+            try:
+                validators.validate_required_str('name', name)
+                validators.validate_required_str('contact', contact)
+            except ValueError as e:
+                failures.append((index, str(e)))
+                continue
+            name, contact = name.strip(), contact.strip()
+            key = contact.lower()
+            if key in seen:
+                failures.append((index, MSG_DUPLICATE_MEMBER))
+                continue
+            seen.add(key)
+            params.append({"name": name, "contact": contact})
+            keys.append((index, key))
+        if not params:
+            continue
+        stmt = insert_ignoring_conflicts(db, Member).returning(Member.id, Member.name, Member.contact)
+        try:
+            rows = db.execute(stmt, params).all()
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to import members")
+            raise
+        inserted = {row.contact.lower() for row in rows}
+        if inserted:
+            invalidate_members()
+            library_stats.members_added(len(inserted))
+            for row in rows:
+                publish_member("created", row)
+        created += len(inserted)
+        failures.extend((index, MSG_DUPLICATE_MEMBER) for index, key in keys if key not in inserted)
+    logger.info("Imported members", extra={"created_count": created, "failed_count": len(failures)})
+    return created, sorted(failures)
@@ -0,0 +1,44 @@
+"""Delta sync: rows of a soft-deletable model changed after a version cursor.
+
+The cursor is ``"<updated_at ISO>|<id>"`` of the last row a client has seen;
+rows are returned in ``(updated_at, id)`` order, which ``ix_*_updated_at_id``
+serves directly. Rows younger than ``settle_seconds`` are held back: a
+transaction that stamped ``updated_at`` earlier may still be committing, and
+handing out a cursor past it would make clients skip that row for good.
+"""
+from datetime import datetime, timedelta, UTC
+from typing import Optional, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+from app import constants
+
+def encode_cursor(updated_at: datetime, row_id: int) -> str:
+    """Also used for the ``(borrowed_at, id)`` cursors of the per-member/book loan lists."""
+    return f"{updated_at.isoformat()}|{row_id}"
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Parse a cursor from ``encode_cursor``; empty means "from the beginning"."""
+    if not cursor:
+        return None
+    try:
+        updated_at, row_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(updated_at), int(row_id)
+    except ValueError:
+        raise ValueError("cursor is not a value returned by a previous call")
+
+def changes_since_select(model, cursor: str, settle_seconds: float):
+    position = decode_cursor(cursor)
+    stmt = select(model).where(model.updated_at <= datetime.now(UTC) - timedelta(seconds=settle_seconds))
+    if position is not None:
+        stmt = stmt.where(tuple_(model.updated_at, model.id) > tuple_(*position))
+    return stmt.order_by(model.updated_at, model.id)
+
+def changes_since(db: Session, model, cursor: str, limit: int, settle_seconds: Optional[float] = None):
+    """Return ``(changed rows incl. tombstones, next_cursor, has_more)``."""
+    if settle_seconds is None:
+        settle_seconds = constants.SYNC_SETTLE_SECONDS
+    rows = db.scalars(changes_since_select(model, cursor, settle_seconds).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else cursor
+    return rows, next_cursor, has_more
@@ -0,0 +1,110 @@
+"""Library statistics kept current by the write paths, so reads are O(1).
+
+The service functions adjust ``library_stats`` after each commit, next to the
+catalog cache invalidation. The counters live in shared memory allocated at
+import, before the prefork supervisor forks (as ``cache.CatalogVersion``
+does), so a write in any worker shows up in every worker's answer.
+``reconcile`` recounts from the database at start-up and periodically to
+correct any drift (writes made by other deployments, or a crash between
+commit and update). ``members_with_loans`` is only recounted there; a
+member's own open loans are counted per request (see GetLibraryStats).
+"""
+import multiprocessing
+import threading
+from datetime import datetime, UTC
+from sqlalchemy import func, select
+from app.logging_config import logger
+from app.models import Book, Borrowing, Member
+
+
+class LibraryStats:
+    FIELDS = ("books", "available_books", "members", "open_loans", "members_with_loans")
+
+    def __init__(self):
+        self._counters = multiprocessing.Array("q", len(self.FIELDS))
+        # epoch seconds of the last reconcile; 0 until the first one
+        self._reconciled_at = multiprocessing.Value("d", 0.0, lock=False)
+
+    def _add(self, **deltas):
+        with self._counters.get_lock():
+            for field, delta in deltas.items():
+                self._counters[self.FIELDS.index(field)] += delta
+
+    @property
+    def reconciled_at(self):
+        timestamp = self._reconciled_at.value
+        return datetime.fromtimestamp(timestamp, UTC) if timestamp else None
+
+    def books_added(self, count: int = 1):
+        self._add(books=count, available_books=count)
+
+    def book_removed(self):
+        # only an available book can be deleted
+        self._add(books=-1, available_books=-1)
+
+    def members_added(self, count: int = 1):
+        self._add(members=count)
+
+    def member_removed(self):
+        # members with open loans cannot be deleted, so no loans go with them
+        self._add(members=-1)
+
+    def borrowed(self, count: int = 1):
+        self._add(available_books=-count, open_loans=count)
+
+    def returned(self, count: int = 1):
+        self._add(available_books=count, open_loans=-count)
+
+    def snapshot(self) -> dict:
+        with self._counters.get_lock():
+            stats = dict(zip(self.FIELDS, self._counters))
+            stats["reconciled_at"] = self.reconciled_at
+        stats["loans_per_member"] = stats["open_loans"] / stats["members"] if stats["members"] else 0.0
+        return stats
+
+    def reconcile(self, db):
+        """Replace the counters with fresh counts from ``db``; returns the corrections made."""
+        counts = {
+            "books": db.scalar(select(func.count()).select_from(Book).where(Book.deleted_at == None)),
+            "available_books": db.scalar(select(func.count()).select_from(Book).where(Book.available == True)),
+            "members": db.scalar(select(func.count()).select_from(Member).where(Member.deleted_at == None)),
+            "open_loans": db.scalar(select(func.count()).select_from(Borrowing).where(Borrowing.returned_at == None)),
+            "members_with_loans": db.scalar(
+                select(func.count(func.distinct(Borrowing.member_id))).where(Borrowing.returned_at == None)
+            ),
+        }
+        with self._counters.get_lock():
+            drift = {field: counts[field] - self._counters[self.FIELDS.index(field)] for field in self.FIELDS[:4]}
+            for index, field in enumerate(self.FIELDS):
+                self._counters[index] = counts[field]
+            self._reconciled_at.value = datetime.now(UTC).timestamp()
+        return drift
+
+
+library_stats = LibraryStats()
+
+
+def reconcile(session_factory, stats: LibraryStats = library_stats) -> dict:
+    db = session_factory()
+    try:
+        drift = stats.reconcile(db)
+    finally:
+        db.close()
+    if any(drift.values()):
+        logger.info("Library stats reconciled", extra={"drift": drift})
+    return drift
+
+
+def start_reconciler(session_factory, interval: float, stats: LibraryStats = library_stats):
+    """Reconcile every ``interval`` seconds from a daemon thread; returns a stop Event."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                reconcile(session_factory, stats)
+            except Exception:
+                logger.exception("Library stats reconciliation failed")
+
+    threading.Thread(target=run, name="stats-reconciler", daemon=True).start()
+    return stop
@@ -7,3 +7,29 @@ def validate_required_str(field_name: str, value: Optional[str]):
 def validate_positive_int(field_name: str, value: Optional[int]):
     if value is None or not isinstance(value, int) or value <= 0:
         raise ValueError(f"{field_name} must be a positive integer")
+
+def validate_non_negative_int(field_name: str, value: Optional[int]):
+    if value is None or not isinstance(value, int) or value < 0:
+        raise ValueError(f"{field_name} must be a non-negative integer")
+
+def validate_page_size(value: Optional[int], max_size: int):
+    validate_non_negative_int('page_size', value)
+    if value > max_size:
+        raise ValueError(f"page_size must not exceed {max_size}")
+
+def validate_id_list(field_name: str, values, max_items: int):
+    if not values:
+        raise ValueError(f"{field_name} must not be empty")
+    if len(values) > max_items:
+        raise ValueError(f"{field_name} must not contain more than {max_items} ids")
+    for value in values:
+        validate_positive_int(field_name, value)
+
+def validate_choices(field_name: str, values, allowed):
+    for value in values:
+        if value not in allowed:
+            raise ValueError(f"{field_name} must be one of {', '.join(sorted(allowed))}")
+
+def validate_max_length(field_name: str, value: str, max_length: int):
+    if len(value) > max_length:
+        raise ValueError(f"{field_name} must be at most {max_length} characters")
@@ -0,0 +1,180 @@
+"""Load-test the gRPC service in-process and write latency/throughput results as JSON.
+
+    python -m benchmarks.run --workload mixed --books 10000 --members 1000 \
+        --loans 2000 --concurrency 16 --duration 30 --output results.json
+
+The server is the real ``app.server.build_server`` on an ephemeral port, so
+interceptors, caching and the thread pool are all exercised. ``--database-url``
+defaults to a throw-away SQLite file; point it at a local Postgres to compare.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--workload", default="mixed", help="list-heavy, churn, import or mixed")
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=1_000)
+    parser.add_argument("--loans", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads issuing RPCs")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured load first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true", help="disable the catalog cache")
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    return parser.parse_args(argv)
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies, codes, elapsed):
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+        "codes": dict(codes),
+    }
+
+class Recorder:
+    """Collects per-method latencies from all client threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.latencies = defaultdict(list)
+        self.codes = defaultdict(lambda: defaultdict(int))
+
+    def __call__(self, method, fn):
+        import grpc
+        start = time.perf_counter()
+        try:
+            response, code = fn(), "OK"
+        except grpc.RpcError as e:
+            response, code = None, e.code().name
+        elapsed = time.perf_counter() - start
+        if self.enabled:
+            with self._lock:
+                self.latencies[method].append(elapsed)
+                self.codes[method][code] += 1
+        return response
+
+class WorkerState:
+    def __init__(self, worker, book_ids, member_ids):
+        self.worker = worker
+        self.book_ids = book_ids
+        self.member_ids = member_ids
+
+def main(argv=None):
+    args = parse_args(argv)
+    tmpdir = None
+    if not args.database_url:
+        tmpdir = tempfile.TemporaryDirectory(prefix="library-bench-")
+        args.database_url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    # app.database binds its engine at import time, so configure before importing app
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["METRICS_PORT"] = "0"
+    if args.no_cache:
+        os.environ["CATALOG_CACHE_TTL_SECONDS"] = "0"
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "generated")))
+
+    import grpc
+    import generated.library_pb2_grpc as library_pb2_grpc
+    from app import migrations
+    from app.database import SessionLocal, engine
+    from app.server import build_server
+    from benchmarks.seed import seed
+    from benchmarks.workloads import WORKLOADS
+    # per-request info logs would dominate the measurements (and stdout)
+    logging.getLogger("library").setLevel(logging.WARNING)
+
+    if args.workload not in WORKLOADS:
+        raise SystemExit(f"unknown workload {args.workload!r}; choose from {sorted(WORKLOADS)}")
+    operations = WORKLOADS[args.workload]
+    weights = [w for w, _ in operations]
+
+    migrations.upgrade(engine)
+    rng = random.Random(args.seed)
+    seed_start = time.perf_counter()
+    book_ids, member_ids = seed(SessionLocal, args.books, args.members, args.loans, rng)
+    seed_seconds = time.perf_counter() - seed_start
+
+    server, port = build_server("127.0.0.1:0")
+    server.start()
+    recorder = Recorder()
+    stop = threading.Event()
+
+    def client(worker):
+        worker_rng = random.Random(args.seed + worker)
+        state = WorkerState(worker, book_ids, member_ids)
+        with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = library_pb2_grpc.LibraryServiceStub(channel)
+            while not stop.is_set():
+                op = worker_rng.choices(operations, weights)[0][1]
+                op(stub, state, worker_rng, recorder)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            clients = [pool.submit(client, i) for i in range(args.concurrency)]
+            time.sleep(args.warmup)
+            recorder.enabled = True
+            measured_start = time.perf_counter()
+            time.sleep(args.duration)
+            recorder.enabled = False
+            elapsed = time.perf_counter() - measured_start
+            stop.set()
+            for c in clients:
+                c.result()
+    finally:
+        server.stop(None)
+        engine.dispose()
+
+    all_latencies = [v for values in recorder.latencies.values() for v in values]
+    all_codes = defaultdict(int)
+    for codes in recorder.codes.values():
+        for code, count in codes.items():
+            all_codes[code] += count
+    result = {
+        "started_at": datetime.now(UTC).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "database": engine.dialect.name},
+        "seed_seconds": round(seed_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, all_codes, elapsed),
+        "methods": {
+            method: summarize(values, recorder.codes[method], elapsed)
+            for method, values in sorted(recorder.latencies.items())
+        },
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if tmpdir:
+        tmpdir.cleanup()
+    return result
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Bulk seeding of books, members and open loans for benchmark runs."""
+import random
+from datetime import datetime, UTC
+from sqlalchemy import insert, select, update
+from app.models import Book, Borrowing, Member
+from app.services import book_service, member_service
+
+def seed(session_factory, books: int, members: int, loans: int, rng: random.Random):
+    """Insert ``books`` books, ``members`` members and ``loans`` open loans; returns the id ranges."""
+    db = session_factory()
+    try:
+        book_service.import_books(db, ((f"Seed Book {i}", f"Seed Author {i % 997}") for i in range(books)))
+        member_service.import_members(db, ((f"Seed Member {i}", f"seed{i}@bench.local") for i in range(members)))
+        book_ids = list(db.scalars(select(Book.id).order_by(Book.id)))
+        member_ids = list(db.scalars(select(Member.id).order_by(Member.id)))
+        loaned = rng.sample(book_ids, min(loans, len(book_ids))) if member_ids else []
+        now = datetime.now(UTC)
+        for start in range(0, len(loaned), 1000):
+            chunk = loaned[start:start + 1000]
+            db.execute(update(Book).where(Book.id.in_(chunk)).values(available=False))
+            db.execute(insert(Borrowing), [
+                {"book_id": book_id, "member_id": rng.choice(member_ids), "borrowed_at": now} for book_id in chunk
+            ])
+            db.commit()
+        return book_ids, member_ids
+    finally:
+        db.close()
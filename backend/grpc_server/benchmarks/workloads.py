@@ -0,0 +1,55 @@
+"""Benchmark workloads: weighted mixes of RPC operations.
+
+Each operation is ``op(stub, state, rng, record)`` where ``record(method, fn)``
+times one RPC call and classifies its status code.
+"""
+import itertools
+import generated.library_pb2 as library_pb2
+
+_import_batches = itertools.count()
+
+def list_books(stub, state, rng, record):
+    after_id = rng.choice(state.book_ids) if state.book_ids else 0
+    record("ListBooks", lambda: stub.ListBooks(library_pb2.ListRequest(page_size=100, after_id=after_id)))
+
+def list_available_books(stub, state, rng, record):
+    record("ListAvailableBooks", lambda: stub.ListAvailableBooks(library_pb2.ListRequest(page_size=100)))
+
+def list_members(stub, state, rng, record):
+    record("ListMembers", lambda: stub.ListMembers(library_pb2.ListRequest(page_size=100)))
+
+def list_borrowed_books(stub, state, rng, record):
+    member_id = rng.choice(state.member_ids) if state.member_ids else 0
+    record("ListBorrowedBooks", lambda: stub.ListBorrowedBooks(
+        library_pb2.ListBorrowedBooksRequest(page_size=50, member_id=member_id)))
+
+def borrow(stub, state, rng, record):
+    if not state.book_ids or not state.member_ids:
+        return
+    request = library_pb2.Borrowing(book_id=rng.choice(state.book_ids), member_id=rng.choice(state.member_ids))
+    record("BorrowBook", lambda: stub.BorrowBook(request))
+
+def return_one(stub, state, rng, record):
+    if not state.book_ids:
+        return
+    book_id = rng.choice(state.book_ids)
+    response = record("ListBorrowedBooks", lambda: stub.ListBorrowedBooks(
+        library_pb2.ListBorrowedBooksRequest(page_size=1, book_id=book_id)))
+    if response is not None and response.borrowed_books:
+        borrowing_id = response.borrowed_books[0].borrowing_id
+        record("ReturnBook", lambda: stub.ReturnBook(library_pb2.ReturnBookRequest(borrowing_id=borrowing_id)))
+
+def bulk_import(stub, state, rng, record, batch=500):
+    n = next(_import_batches)
+    rows = (library_pb2.Book(title=f"Imported {n}-{i}", author=f"Bench {state.worker}") for i in range(batch))
+    record("ImportBooks", lambda: stub.ImportBooks(rows))
+
+WORKLOADS = {
+    "list-heavy": [(60, list_books), (15, list_available_books), (10, list_members), (15, list_borrowed_books)],
+    "churn": [(50, borrow), (50, return_one)],
+    "import": [(1, bulk_import)],
+    "mixed": [
+        (40, list_books), (10, list_available_books), (5, list_members), (10, list_borrowed_books),
+        (15, borrow), (15, return_one), (5, bulk_import),
+    ],
+}
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rlibrary.proto\x12\x07library\x1a\x1bgoogle/protobuf/empty.proto\"D\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x11\n\tavailable\x18\x04 \x01(\x08\"/\n\tBorrowing\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\"\x14\n\x06\x42ookId\x12\n\n\x02id\x18\x01 \x01(\x05\"\x16\n\x08MemberId\x12\n\n\x02id\x18\x01 \x01(\x05\"\x07\n\x05\x45mpty\"(\n\x08\x42ookList\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\"1\n\x10\x41\x64\x64MemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x02 \x01(\t\"3\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x03 \x01(\t\".\n\nMemberList\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\"\x89\x01\n\x0c\x42orrowedBook\x12\x14\n\x0c\x62orrowing_id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x11\n\tmember_id\x18\x04 \x01(\x05\x12\x13\n\x0bmember_name\x18\x05 \x01(\t\x12\x16\n\x0e\x62orrowing_date\x18\x06 \x01(\t\"F\n\x15\x42orrowedBooksResponse\x12-\n\x0e\x62orrowed_books\x18\x01 \x03(\x0b\x32\x15.library.BorrowedBook\")\n\x11ReturnBookRequest\x12\x14\n\x0c\x62orrowing_id\x18\x01 \x01(\x05\"M\n\x0c\x42ookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1b\n\x04\x62ook\x18\x03 \x01(\x0b\x32\r.library.Book\"@\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x03 \x01(\t2\xd5\x05\n\x0eLibraryService\x12*\n\nCreateBook\x12\r.library.Book\x1a\r.library.Book\x12.\n\tListBooks\x12\x0e.library.Empty\x1a\x11.library.BookList\x12\x30\n\x0c\x43reateMember\x12\x0f.library.Member\x1a\x0f.library.Member\x12\x30\n\nBorrowBook\x12\x12.library.Borrowing\x1a\x0e.library.Empty\x12\x37\n\tAddMember\x12\x19.library.AddMemberRequest\x1a\x0f.library.Member\x12\x32\n\x0bListMembers\x12\x0e.library.Empty\x1a\x13.library.MemberList\x12K\n\x11ListBorrowedBooks\x12\x16.google.protobuf.Empty\x1a\x1e.library.BorrowedBooksResponse\x12@\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\x16.google.protobuf.Empty\x12\x37\n\x12ListAvailableBooks\x12\x0e.library.Empty\x1a\x11.library.BookList\x12*\n\nUpdateBook\x12\r.library.Book\x1a\r.library.Book\x12\x35\n\nDeleteBook\x12\x0f.library.BookId\x1a\x16.google.protobuf.Empty\x12\x30\n\x0cUpdateMember\x12\x0f.library.Member\x1a\x0f.library.Member\x12\x39\n\x0c\x44\x65leteMember\x12\x11.library.MemberId\x1a\x16.google.protobuf.Emptyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rlibrary.proto\x12\x07library\x1a\x1bgoogle/protobuf/empty.proto\"D\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x11\n\tavailable\x18\x04 \x01(\x08\"/\n\tBorrowing\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\"\x14\n\x06\x42ookId\x12\n\n\x02id\x18\x01 \x01(\x05\"\x16\n\x08MemberId\x12\n\n\x02id\x18\x01 \x01(\x05\"\x07\n\x05\x45mpty\"f\n\x08\x42ookList\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x15\n\rnext_after_id\x18\x02 \x01(\x05\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x14\n\x0cnot_modified\x18\x04 \x01(\x08\"F\n\x0bListRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x02 \x01(\x05\x12\x12\n\nif_version\x18\x03 \x01(\t\"p\n\x12SearchBooksRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x0e\n\x06prefix\x18\x02 \x01(\x08\x12\x16\n\x0e\x61vailable_only\x18\x03 \x01(\x08\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x05 \x01(\x05\"9\n\rStreamRequest\x12\x10\n\x08\x61\x66ter_id\x18\x01 \x01(\x05\x12\x16\n\x0eonly_available\x18\x02 \x01(\x08\"1\n\x10\x41\x64\x64MemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x02 \x01(\t\"3\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x03 \x01(\t\"l\n\nMemberList\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12\x15\n\rnext_after_id\x18\x02 \x01(\x05\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x14\n\x0cnot_modified\x18\x04 \x01(\x08\"\x89\x01\n\x0c\x42orrowedBook\x12\x14\n\x0c\x62orrowing_id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x11\n\tmember_id\x18\x04 \x01(\x05\x12\x13\n\x0bmember_name\x18\x05 \x01(\t\x12\x16\n\x0e\x62orrowing_date\x18\x06 \x01(\t\"]\n\x15\x42orrowedBooksResponse\x12-\n\x0e\x62orrowed_books\x18\x01 \x03(\x0b\x32\x15.library.BorrowedBook\x12\x15\n\rnext_after_id\x18\x02 \x01(\x05\"c\n\x18ListBorrowedBooksRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x04 \x01(\x05\"b\n\x17\x42orrowingHistoryRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x04 \x01(\x05\"\xea\x01\n\x0f\x42orrowingRecord\x12\x14\n\x0c\x62orrowing_id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x11\n\tmember_id\x18\x04 \x01(\x05\x12\x13\n\x0bmember_name\x18\x05 \x01(\t\x12\x13\n\x0b\x62orrowed_at\x18\x06 \x01(\t\x12\x13\n\x0breturned_at\x18\x07 \x01(\t\x12\x10\n\x08\x61rchived\x18\x08 \x01(\x08\x12\x0e\n\x06\x64ue_at\x18\t \x01(\t\x12\x14\n\x0coverdue_days\x18\n \x01(\x05\x12\x12\n\nfine_cents\x18\x0b \x01(\x05\"T\n\x10\x42orrowingHistory\x12)\n\x07records\x18\x01 \x03(\x0b\x32\x18.library.BorrowingRecord\x12\x15\n\rnext_after_id\x18\x02 \x01(\x05\"Z\n\x12MemberLoansRequest\x12\x11\n\tmember_id\x18\x01 \x01(\x05\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\"V\n\x10\x42ookLoansRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\"H\n\x08LoanList\x12\'\n\x05loans\x18\x01 \x03(\x0b\x32\x18.library.BorrowingRecord\x12\x13\n\x0bnext_cursor\x18\x02 \x01(\t\"8\n\x13OverdueLoansRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\"\'\n\x12MemberFinesRequest\x12\x11\n\tmember_id\x18\x01 \x01(\x05\"\x89\x01\n\x0bMemberFines\x12\x11\n\tmember_id\x18\x01 \x01(\x05\x12\x13\n\x0btotal_cents\x18\x02 \x01(\x05\x12\x12\n\nopen_cents\x18\x03 \x01(\x05\x12\x15\n\roverdue_loans\x18\x04 \x01(\x05\x12\'\n\x05loans\x18\x05 \x03(\x0b\x32\x18.library.BorrowingRecord\")\n\x11ReturnBookRequest\x12\x14\n\x0c\x62orrowing_id\x18\x01 \x01(\x05\"Q\n\x12\x42orrowBooksRequest\x12\x11\n\tmember_id\x18\x01 \x01(\x05\x12\x10\n\x08\x62ook_ids\x18\x02 \x03(\x05\x12\x16\n\x0e\x61ll_or_nothing\x18\x03 \x01(\x08\"C\n\x12ReturnBooksRequest\x12\x15\n\rborrowing_ids\x18\x01 \x03(\x05\x12\x16\n\x0e\x61ll_or_nothing\x18\x02 \x01(\x08\"P\n\x0f\x42\x61tchItemResult\x12\n\n\x02id\x18\x01 \x01(\x05\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x14\n\x0c\x62orrowing_id\x18\x04 \x01(\x05\"K\n\x0b\x42\x61tchResult\x12)\n\x07results\x18\x01 \x03(\x0b\x32\x18.library.BatchItemResult\x12\x11\n\tcommitted\x18\x02 \x01(\x08\"M\n\x0c\x42ookResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1b\n\x04\x62ook\x18\x03 \x01(\x0b\x32\r.library.Book\"/\n\rImportFailure\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"Y\n\x0cImportResult\x12\x0f\n\x07\x63reated\x18\x01 \x01(\x05\x12\x0e\n\x06\x66\x61iled\x18\x02 \x01(\x05\x12(\n\x08\x66\x61ilures\x18\x03 \x03(\x0b\x32\x16.library.ImportFailure\"(\n\x13LibraryStatsRequest\x12\x11\n\tmember_id\x18\x01 \x01(\x05\"\xc3\x01\n\x0cLibraryStats\x12\r\n\x05\x62ooks\x18\x01 \x01(\x03\x12\x17\n\x0f\x61vailable_books\x18\x02 \x01(\x03\x12\x0f\n\x07members\x18\x03 \x01(\x03\x12\x12\n\nopen_loans\x18\x04 \x01(\x03\x12\x1a\n\x12members_with_loans\x18\x05 \x01(\x03\x12\x18\n\x10loans_per_member\x18\x06 \x01(\x01\x12\x19\n\x11member_open_loans\x18\x07 \x01(\x03\x12\x15\n\rreconciled_at\x18\x08 \x01(\t\"B\n\x0cWatchRequest\x12\x11\n\tafter_seq\x18\x01 \x01(\x03\x12\r\n\x05\x65poch\x18\x02 \x01(\t\x12\x10\n\x08\x65ntities\x18\x03 \x03(\t\"\xba\x01\n\x0eInventoryEvent\x12\x0b\n\x03seq\x18\x01 \x01(\x03\x12\r\n\x05\x65poch\x18\x02 \x01(\t\x12\x0e\n\x06\x65ntity\x18\x03 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x04 \x01(\t\x12\n\n\x02id\x18\x05 \x01(\x05\x12\x1b\n\x04\x62ook\x18\x06 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\x07 \x01(\x0b\x32\x0f.library.Member\x12\x0f\n\x07\x62ook_id\x18\x08 \x01(\x05\x12\x11\n\tmember_id\x18\t \x01(\x05\"0\n\x0bSyncRequest\x12\x0e\n\x06\x63ursor\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\"g\n\x0b\x42ookChanges\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x13\n\x0b\x64\x65leted_ids\x18\x02 \x03(\x05\x12\x13\n\x0bnext_cursor\x18\x03 \x01(\t\x12\x10\n\x08has_more\x18\x04 \x01(\x08\"m\n\rMemberChanges\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12\x13\n\x0b\x64\x65leted_ids\x18\x02 \x03(\x05\x12\x13\n\x0bnext_cursor\x18\x03 \x01(\t\x12\x10\n\x08has_more\x18\x04 \x01(\x08\"@\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontact\x18\x03 \x01(\t2\x91\x0e\n\x0eLibraryService\x12*\n\nCreateBook\x12\r.library.Book\x1a\r.library.Book\x12\x34\n\tListBooks\x12\x14.library.ListRequest\x1a\x11.library.BookList\x12\x30\n\x0c\x43reateMember\x12\x0f.library.Member\x1a\x0f.library.Member\x12\x30\n\nBorrowBook\x12\x12.library.Borrowing\x1a\x0e.library.Empty\x12\x37\n\tAddMember\x12\x19.library.AddMemberRequest\x1a\x0f.library.Member\x12\x38\n\x0bListMembers\x12\x14.library.ListRequest\x1a\x13.library.MemberList\x12V\n\x11ListBorrowedBooks\x12!.library.ListBorrowedBooksRequest\x1a\x1e.library.BorrowedBooksResponse\x12@\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\x16.google.protobuf.Empty\x12=\n\x12ListAvailableBooks\x12\x14.library.ListRequest\x1a\x11.library.BookList\x12*\n\nUpdateBook\x12\r.library.Book\x1a\r.library.Book\x12\x35\n\nDeleteBook\x12\x0f.library.BookId\x1a\x16.google.protobuf.Empty\x12\x30\n\x0cUpdateMember\x12\x0f.library.Member\x1a\x0f.library.Member\x12\x39\n\x0c\x44\x65leteMember\x12\x11.library.MemberId\x1a\x16.google.protobuf.Empty\x12\x36\n\x0bStreamBooks\x12\x16.library.StreamRequest\x1a\r.library.Book0\x01\x12:\n\rStreamMembers\x12\x16.library.StreamRequest\x1a\x0f.library.Member0\x01\x12\x35\n\x0bImportBooks\x12\r.library.Book\x1a\x15.library.ImportResult(\x01\x12\x43\n\rImportMembers\x12\x19.library.AddMemberRequest\x1a\x15.library.ImportResult(\x01\x12=\n\x0bSearchBooks\x12\x1b.library.SearchBooksRequest\x1a\x11.library.BookList\x12@\n\x0b\x42orrowBooks\x12\x1b.library.BorrowBooksRequest\x1a\x14.library.BatchResult\x12@\n\x0bReturnBooks\x12\x1b.library.ReturnBooksRequest\x1a\x14.library.BatchResult\x12\x46\n\x0fGetLibraryStats\x12\x1c.library.LibraryStatsRequest\x1a\x15.library.LibraryStats\x12\x42\n\x0eWatchInventory\x12\x15.library.WatchRequest\x1a\x17.library.InventoryEvent0\x01\x12<\n\x0eListBooksSince\x12\x14.library.SyncRequest\x1a\x14.library.BookChanges\x12@\n\x10ListMembersSince\x12\x14.library.SyncRequest\x1a\x16.library.MemberChanges\x12R\n\x13GetBorrowingHistory\x12 .library.BorrowingHistoryRequest\x1a\x19.library.BorrowingHistory\x12\x41\n\x0fListMemberLoans\x12\x1b.library.MemberLoansRequest\x1a\x11.library.LoanList\x12=\n\rListBookLoans\x12\x19.library.BookLoansRequest\x1a\x11.library.LoanList\x12\x43\n\x10ListOverdueLoans\x12\x1c.library.OverdueLoansRequest\x1a\x11.library.LoanList\x12\x43\n\x0eGetMemberFines\x12\x1b.library.MemberFinesRequest\x1a\x14.library.MemberFinesb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -43,23 +43,75 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_EMPTY']._serialized_start=220
   _globals['_EMPTY']._serialized_end=227
   _globals['_BOOKLIST']._serialized_start=229
-  _globals['_BOOKLIST']._serialized_end=269
-  _globals['_ADDMEMBERREQUEST']._serialized_start=271
-  _globals['_ADDMEMBERREQUEST']._serialized_end=320
-  _globals['_MEMBER']._serialized_start=322
-  _globals['_MEMBER']._serialized_end=373
-  _globals['_MEMBERLIST']._serialized_start=375
-  _globals['_MEMBERLIST']._serialized_end=421
-  _globals['_BORROWEDBOOK']._serialized_start=424
-  _globals['_BORROWEDBOOK']._serialized_end=561
-  _globals['_BORROWEDBOOKSRESPONSE']._serialized_start=563
-  _globals['_BORROWEDBOOKSRESPONSE']._serialized_end=633
-  _globals['_RETURNBOOKREQUEST']._serialized_start=635
-  _globals['_RETURNBOOKREQUEST']._serialized_end=676
-  _globals['_BOOKRESPONSE']._serialized_start=678
-  _globals['_BOOKRESPONSE']._serialized_end=755
-  _globals['_UPDATEMEMBERREQUEST']._serialized_start=757
-  _globals['_UPDATEMEMBERREQUEST']._serialized_end=821
-  _globals['_LIBRARYSERVICE']._serialized_start=824
-  _globals['_LIBRARYSERVICE']._serialized_end=1549
+  _globals['_BOOKLIST']._serialized_end=331
+  _globals['_LISTREQUEST']._serialized_start=333
+  _globals['_LISTREQUEST']._serialized_end=403
+  _globals['_SEARCHBOOKSREQUEST']._serialized_start=405
+  _globals['_SEARCHBOOKSREQUEST']._serialized_end=517
+  _globals['_STREAMREQUEST']._serialized_start=519
+  _globals['_STREAMREQUEST']._serialized_end=576
+  _globals['_ADDMEMBERREQUEST']._serialized_start=578
+  _globals['_ADDMEMBERREQUEST']._serialized_end=627
+  _globals['_MEMBER']._serialized_start=629
+  _globals['_MEMBER']._serialized_end=680
+  _globals['_MEMBERLIST']._serialized_start=682
+  _globals['_MEMBERLIST']._serialized_end=790
+  _globals['_BORROWEDBOOK']._serialized_start=793
+  _globals['_BORROWEDBOOK']._serialized_end=930
+  _globals['_BORROWEDBOOKSRESPONSE']._serialized_start=932
+  _globals['_BORROWEDBOOKSRESPONSE']._serialized_end=1025
+  _globals['_LISTBORROWEDBOOKSREQUEST']._serialized_start=1027
+  _globals['_LISTBORROWEDBOOKSREQUEST']._serialized_end=1126
+  _globals['_BORROWINGHISTORYREQUEST']._serialized_start=1128
+  _globals['_BORROWINGHISTORYREQUEST']._serialized_end=1226
+  _globals['_BORROWINGRECORD']._serialized_start=1229
+  _globals['_BORROWINGRECORD']._serialized_end=1463
+  _globals['_BORROWINGHISTORY']._serialized_start=1465
+  _globals['_BORROWINGHISTORY']._serialized_end=1549
+  _globals['_MEMBERLOANSREQUEST']._serialized_start=1551
+  _globals['_MEMBERLOANSREQUEST']._serialized_end=1641
+  _globals['_BOOKLOANSREQUEST']._serialized_start=1643
+  _globals['_BOOKLOANSREQUEST']._serialized_end=1729
+  _globals['_LOANLIST']._serialized_start=1731
+  _globals['_LOANLIST']._serialized_end=1803
+  _globals['_OVERDUELOANSREQUEST']._serialized_start=1805
+  _globals['_OVERDUELOANSREQUEST']._serialized_end=1861
+  _globals['_MEMBERFINESREQUEST']._serialized_start=1863
+  _globals['_MEMBERFINESREQUEST']._serialized_end=1902
+  _globals['_MEMBERFINES']._serialized_start=1905
+  _globals['_MEMBERFINES']._serialized_end=2042
+  _globals['_RETURNBOOKREQUEST']._serialized_start=2044
+  _globals['_RETURNBOOKREQUEST']._serialized_end=2085
+  _globals['_BORROWBOOKSREQUEST']._serialized_start=2087
+  _globals['_BORROWBOOKSREQUEST']._serialized_end=2168
+  _globals['_RETURNBOOKSREQUEST']._serialized_start=2170
+  _globals['_RETURNBOOKSREQUEST']._serialized_end=2237
+  _globals['_BATCHITEMRESULT']._serialized_start=2239
+  _globals['_BATCHITEMRESULT']._serialized_end=2319
+  _globals['_BATCHRESULT']._serialized_start=2321
+  _globals['_BATCHRESULT']._serialized_end=2396
+  _globals['_BOOKRESPONSE']._serialized_start=2398
+  _globals['_BOOKRESPONSE']._serialized_end=2475
+  _globals['_IMPORTFAILURE']._serialized_start=2477
+  _globals['_IMPORTFAILURE']._serialized_end=2524
+  _globals['_IMPORTRESULT']._serialized_start=2526
+  _globals['_IMPORTRESULT']._serialized_end=2615
+  _globals['_LIBRARYSTATSREQUEST']._serialized_start=2617
+  _globals['_LIBRARYSTATSREQUEST']._serialized_end=2657
+  _globals['_LIBRARYSTATS']._serialized_start=2660
+  _globals['_LIBRARYSTATS']._serialized_end=2855
+  _globals['_WATCHREQUEST']._serialized_start=2857
+  _globals['_WATCHREQUEST']._serialized_end=2923
+  _globals['_INVENTORYEVENT']._serialized_start=2926
+  _globals['_INVENTORYEVENT']._serialized_end=3112
+  _globals['_SYNCREQUEST']._serialized_start=3114
+  _globals['_SYNCREQUEST']._serialized_end=3162
+  _globals['_BOOKCHANGES']._serialized_start=3164
+  _globals['_BOOKCHANGES']._serialized_end=3267
+  _globals['_MEMBERCHANGES']._serialized_start=3269
+  _globals['_MEMBERCHANGES']._serialized_end=3378
+  _globals['_UPDATEMEMBERREQUEST']._serialized_start=3380
+  _globals['_UPDATEMEMBERREQUEST']._serialized_end=3444
+  _globals['_LIBRARYSERVICE']._serialized_start=3447
+  _globals['_LIBRARYSERVICE']._serialized_end=5256
 # @@protoc_insertion_point(module_scope)
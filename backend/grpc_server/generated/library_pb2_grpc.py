@@ -42,7 +42,7 @@ class LibraryServiceStub(object):
                 _registered_method=True)
         self.ListBooks = channel.unary_unary(
                 '/library.LibraryService/ListBooks',
-                request_serializer=library__pb2.Empty.SerializeToString,
+                request_serializer=library__pb2.ListRequest.SerializeToString,
                 response_deserializer=library__pb2.BookList.FromString,
                 _registered_method=True)
         self.CreateMember = channel.unary_unary(
@@ -62,12 +62,12 @@ class LibraryServiceStub(object):
                 _registered_method=True)
         self.ListMembers = channel.unary_unary(
                 '/library.LibraryService/ListMembers',
-                request_serializer=library__pb2.Empty.SerializeToString,
+                request_serializer=library__pb2.ListRequest.SerializeToString,
                 response_deserializer=library__pb2.MemberList.FromString,
                 _registered_method=True)
         self.ListBorrowedBooks = channel.unary_unary(
                 '/library.LibraryService/ListBorrowedBooks',
-                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                request_serializer=library__pb2.ListBorrowedBooksRequest.SerializeToString,
                 response_deserializer=library__pb2.BorrowedBooksResponse.FromString,
                 _registered_method=True)
         self.ReturnBook = channel.unary_unary(
@@ -77,7 +77,7 @@ class LibraryServiceStub(object):
                 _registered_method=True)
         self.ListAvailableBooks = channel.unary_unary(
                 '/library.LibraryService/ListAvailableBooks',
-                request_serializer=library__pb2.Empty.SerializeToString,
+                request_serializer=library__pb2.ListRequest.SerializeToString,
                 response_deserializer=library__pb2.BookList.FromString,
                 _registered_method=True)
         self.UpdateBook = channel.unary_unary(
@@ -100,6 +100,86 @@ class LibraryServiceStub(object):
                 request_serializer=library__pb2.MemberId.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.StreamBooks = channel.unary_stream(
+                '/library.LibraryService/StreamBooks',
+                request_serializer=library__pb2.StreamRequest.SerializeToString,
+                response_deserializer=library__pb2.Book.FromString,
+                _registered_method=True)
+        self.StreamMembers = channel.unary_stream(
+                '/library.LibraryService/StreamMembers',
+                request_serializer=library__pb2.StreamRequest.SerializeToString,
+                response_deserializer=library__pb2.Member.FromString,
+                _registered_method=True)
+        self.ImportBooks = channel.stream_unary(
+                '/library.LibraryService/ImportBooks',
+                request_serializer=library__pb2.Book.SerializeToString,
+                response_deserializer=library__pb2.ImportResult.FromString,
+                _registered_method=True)
+        self.ImportMembers = channel.stream_unary(
+                '/library.LibraryService/ImportMembers',
+                request_serializer=library__pb2.AddMemberRequest.SerializeToString,
+                response_deserializer=library__pb2.ImportResult.FromString,
+                _registered_method=True)
+        self.SearchBooks = channel.unary_unary(
+                '/library.LibraryService/SearchBooks',
+                request_serializer=library__pb2.SearchBooksRequest.SerializeToString,
+                response_deserializer=library__pb2.BookList.FromString,
+                _registered_method=True)
+        self.BorrowBooks = channel.unary_unary(
+                '/library.LibraryService/BorrowBooks',
+                request_serializer=library__pb2.BorrowBooksRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchResult.FromString,
+                _registered_method=True)
+        self.ReturnBooks = channel.unary_unary(
+                '/library.LibraryService/ReturnBooks',
+                request_serializer=library__pb2.ReturnBooksRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchResult.FromString,
+                _registered_method=True)
+        self.GetLibraryStats = channel.unary_unary(
+                '/library.LibraryService/GetLibraryStats',
+                request_serializer=library__pb2.LibraryStatsRequest.SerializeToString,
+                response_deserializer=library__pb2.LibraryStats.FromString,
+                _registered_method=True)
+        self.WatchInventory = channel.unary_stream(
+                '/library.LibraryService/WatchInventory',
+                request_serializer=library__pb2.WatchRequest.SerializeToString,
+                response_deserializer=library__pb2.InventoryEvent.FromString,
+                _registered_method=True)
+        self.ListBooksSince = channel.unary_unary(
+                '/library.LibraryService/ListBooksSince',
+                request_serializer=library__pb2.SyncRequest.SerializeToString,
+                response_deserializer=library__pb2.BookChanges.FromString,
+                _registered_method=True)
+        self.ListMembersSince = channel.unary_unary(
+                '/library.LibraryService/ListMembersSince',
+                request_serializer=library__pb2.SyncRequest.SerializeToString,
+                response_deserializer=library__pb2.MemberChanges.FromString,
+                _registered_method=True)
+        self.GetBorrowingHistory = channel.unary_unary(
+                '/library.LibraryService/GetBorrowingHistory',
+                request_serializer=library__pb2.BorrowingHistoryRequest.SerializeToString,
+                response_deserializer=library__pb2.BorrowingHistory.FromString,
+                _registered_method=True)
+        self.ListMemberLoans = channel.unary_unary(
+                '/library.LibraryService/ListMemberLoans',
+                request_serializer=library__pb2.MemberLoansRequest.SerializeToString,
+                response_deserializer=library__pb2.LoanList.FromString,
+                _registered_method=True)
+        self.ListBookLoans = channel.unary_unary(
+                '/library.LibraryService/ListBookLoans',
+                request_serializer=library__pb2.BookLoansRequest.SerializeToString,
+                response_deserializer=library__pb2.LoanList.FromString,
+                _registered_method=True)
+        self.ListOverdueLoans = channel.unary_unary(
+                '/library.LibraryService/ListOverdueLoans',
+                request_serializer=library__pb2.OverdueLoansRequest.SerializeToString,
+                response_deserializer=library__pb2.LoanList.FromString,
+                _registered_method=True)
+        self.GetMemberFines = channel.unary_unary(
+                '/library.LibraryService/GetMemberFines',
+                request_serializer=library__pb2.MemberFinesRequest.SerializeToString,
+                response_deserializer=library__pb2.MemberFines.FromString,
+                _registered_method=True)
 
 
 class LibraryServiceServicer(object):
@@ -183,6 +263,102 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamMembers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportBooks(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportMembers(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BorrowBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReturnBooks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLibraryStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchInventory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListBooksSince(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListMembersSince(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBorrowingHistory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListMemberLoans(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListBookLoans(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListOverdueLoans(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMemberFines(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_LibraryServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -193,7 +369,7 @@ def add_LibraryServiceServicer_to_server(servicer, server):
             ),
             'ListBooks': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBooks,
-                    request_deserializer=library__pb2.Empty.FromString,
+                    request_deserializer=library__pb2.ListRequest.FromString,
                     response_serializer=library__pb2.BookList.SerializeToString,
             ),
             'CreateMember': grpc.unary_unary_rpc_method_handler(
@@ -213,12 +389,12 @@ def add_LibraryServiceServicer_to_server(servicer, server):
             ),
             'ListMembers': grpc.unary_unary_rpc_method_handler(
                     servicer.ListMembers,
-                    request_deserializer=library__pb2.Empty.FromString,
+                    request_deserializer=library__pb2.ListRequest.FromString,
                     response_serializer=library__pb2.MemberList.SerializeToString,
             ),
             'ListBorrowedBooks': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBorrowedBooks,
-                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    request_deserializer=library__pb2.ListBorrowedBooksRequest.FromString,
                     response_serializer=library__pb2.BorrowedBooksResponse.SerializeToString,
             ),
             'ReturnBook': grpc.unary_unary_rpc_method_handler(
@@ -228,7 +404,7 @@ def add_LibraryServiceServicer_to_server(servicer, server):
             ),
             'ListAvailableBooks': grpc.unary_unary_rpc_method_handler(
                     servicer.ListAvailableBooks,
-                    request_deserializer=library__pb2.Empty.FromString,
+                    request_deserializer=library__pb2.ListRequest.FromString,
                     response_serializer=library__pb2.BookList.SerializeToString,
             ),
             'UpdateBook': grpc.unary_unary_rpc_method_handler(
@@ -251,6 +427,86 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=library__pb2.MemberId.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'StreamBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBooks,
+                    request_deserializer=library__pb2.StreamRequest.FromString,
+                    response_serializer=library__pb2.Book.SerializeToString,
+            ),
+            'StreamMembers': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamMembers,
+                    request_deserializer=library__pb2.StreamRequest.FromString,
+                    response_serializer=library__pb2.Member.SerializeToString,
+            ),
+            'ImportBooks': grpc.stream_unary_rpc_method_handler(
+                    servicer.ImportBooks,
+                    request_deserializer=library__pb2.Book.FromString,
+                    response_serializer=library__pb2.ImportResult.SerializeToString,
+            ),
+            'ImportMembers': grpc.stream_unary_rpc_method_handler(
+                    servicer.ImportMembers,
+                    request_deserializer=library__pb2.AddMemberRequest.FromString,
+                    response_serializer=library__pb2.ImportResult.SerializeToString,
+            ),
+            'SearchBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchBooks,
+                    request_deserializer=library__pb2.SearchBooksRequest.FromString,
+                    response_serializer=library__pb2.BookList.SerializeToString,
+            ),
+            'BorrowBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.BorrowBooks,
+                    request_deserializer=library__pb2.BorrowBooksRequest.FromString,
+                    response_serializer=library__pb2.BatchResult.SerializeToString,
+            ),
+            'ReturnBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReturnBooks,
+                    request_deserializer=library__pb2.ReturnBooksRequest.FromString,
+                    response_serializer=library__pb2.BatchResult.SerializeToString,
+            ),
+            'GetLibraryStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLibraryStats,
+                    request_deserializer=library__pb2.LibraryStatsRequest.FromString,
+                    response_serializer=library__pb2.LibraryStats.SerializeToString,
+            ),
+            'WatchInventory': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchInventory,
+                    request_deserializer=library__pb2.WatchRequest.FromString,
+                    response_serializer=library__pb2.InventoryEvent.SerializeToString,
+            ),
+            'ListBooksSince': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListBooksSince,
+                    request_deserializer=library__pb2.SyncRequest.FromString,
+                    response_serializer=library__pb2.BookChanges.SerializeToString,
+            ),
+            'ListMembersSince': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListMembersSince,
+                    request_deserializer=library__pb2.SyncRequest.FromString,
+                    response_serializer=library__pb2.MemberChanges.SerializeToString,
+            ),
+            'GetBorrowingHistory': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBorrowingHistory,
+                    request_deserializer=library__pb2.BorrowingHistoryRequest.FromString,
+                    response_serializer=library__pb2.BorrowingHistory.SerializeToString,
+            ),
+            'ListMemberLoans': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListMemberLoans,
+                    request_deserializer=library__pb2.MemberLoansRequest.FromString,
+                    response_serializer=library__pb2.LoanList.SerializeToString,
+            ),
+            'ListBookLoans': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListBookLoans,
+                    request_deserializer=library__pb2.BookLoansRequest.FromString,
+                    response_serializer=library__pb2.LoanList.SerializeToString,
+            ),
+            'ListOverdueLoans': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListOverdueLoans,
+                    request_deserializer=library__pb2.OverdueLoansRequest.FromString,
+                    response_serializer=library__pb2.LoanList.SerializeToString,
+            ),
+            'GetMemberFines': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMemberFines,
+                    request_deserializer=library__pb2.MemberFinesRequest.FromString,
+                    response_serializer=library__pb2.MemberFines.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'library.LibraryService', rpc_method_handlers)
@@ -304,7 +560,7 @@ class LibraryService(object):
             request,
             target,
             '/library.LibraryService/ListBooks',
-            library__pb2.Empty.SerializeToString,
+            library__pb2.ListRequest.SerializeToString,
             library__pb2.BookList.FromString,
             options,
             channel_credentials,
@@ -412,7 +668,7 @@ class LibraryService(object):
             request,
             target,
             '/library.LibraryService/ListMembers',
-            library__pb2.Empty.SerializeToString,
+            library__pb2.ListRequest.SerializeToString,
             library__pb2.MemberList.FromString,
             options,
             channel_credentials,
@@ -439,7 +695,7 @@ class LibraryService(object):
             request,
             target,
             '/library.LibraryService/ListBorrowedBooks',
-            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            library__pb2.ListBorrowedBooksRequest.SerializeToString,
             library__pb2.BorrowedBooksResponse.FromString,
             options,
             channel_credentials,
@@ -493,7 +749,7 @@ class LibraryService(object):
             request,
             target,
             '/library.LibraryService/ListAvailableBooks',
-            library__pb2.Empty.SerializeToString,
+            library__pb2.ListRequest.SerializeToString,
             library__pb2.BookList.FromString,
             options,
             channel_credentials,
@@ -612,3 +868,435 @@ class LibraryService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamBooks',
+            library__pb2.StreamRequest.SerializeToString,
+            library__pb2.Book.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamMembers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamMembers',
+            library__pb2.StreamRequest.SerializeToString,
+            library__pb2.Member.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportBooks(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/library.LibraryService/ImportBooks',
+            library__pb2.Book.SerializeToString,
+            library__pb2.ImportResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportMembers(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/library.LibraryService/ImportMembers',
+            library__pb2.AddMemberRequest.SerializeToString,
+            library__pb2.ImportResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SearchBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/SearchBooks',
+            library__pb2.SearchBooksRequest.SerializeToString,
+            library__pb2.BookList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BorrowBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BorrowBooks',
+            library__pb2.BorrowBooksRequest.SerializeToString,
+            library__pb2.BatchResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReturnBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ReturnBooks',
+            library__pb2.ReturnBooksRequest.SerializeToString,
+            library__pb2.BatchResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLibraryStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/GetLibraryStats',
+            library__pb2.LibraryStatsRequest.SerializeToString,
+            library__pb2.LibraryStats.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchInventory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/WatchInventory',
+            library__pb2.WatchRequest.SerializeToString,
+            library__pb2.InventoryEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListBooksSince(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListBooksSince',
+            library__pb2.SyncRequest.SerializeToString,
+            library__pb2.BookChanges.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListMembersSince(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListMembersSince',
+            library__pb2.SyncRequest.SerializeToString,
+            library__pb2.MemberChanges.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetBorrowingHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/GetBorrowingHistory',
+            library__pb2.BorrowingHistoryRequest.SerializeToString,
+            library__pb2.BorrowingHistory.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListMemberLoans(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListMemberLoans',
+            library__pb2.MemberLoansRequest.SerializeToString,
+            library__pb2.LoanList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListBookLoans(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListBookLoans',
+            library__pb2.BookLoansRequest.SerializeToString,
+            library__pb2.LoanList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListOverdueLoans(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListOverdueLoans',
+            library__pb2.OverdueLoansRequest.SerializeToString,
+            library__pb2.LoanList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMemberFines(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/GetMemberFines',
+            library__pb2.MemberFinesRequest.SerializeToString,
+            library__pb2.MemberFines.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,23 +1,76 @@
 import os
+import sys
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
-from app.models import Base
+from app import migrations
 from app.database import get_engine, get_sessionmaker_from_engine
 
+# generated stubs import each other as top-level modules (see app/server.py)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'generated')))
+
+@pytest.fixture(autouse=True)
+def clear_catalog_cache():
+    """The catalog cache is process-wide; never let one test see another's entries."""
+    from app.cache import catalog_cache
+    catalog_cache.invalidate()
+    yield
+    catalog_cache.invalidate()
+
 # Use in-memory SQLite for tests
 @pytest.fixture
-def test_db():
-    """Create a fresh database for each test."""
+def test_engine():
+    """In-memory database built by the migrations, exactly as the server would."""
     engine = get_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    SessionLocal = get_sessionmaker_from_engine(engine)
+    migrations.upgrade(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+@pytest.fixture
+def test_db(test_engine):
+    """Create a fresh database for each test."""
+    SessionLocal = get_sessionmaker_from_engine(test_engine)
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(engine)
+
+@pytest.fixture
+def statements(test_engine):
+    """SQL statements executed on the test engine while the test runs."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(test_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(test_engine, "before_cursor_execute", record)
+
+@pytest.fixture
+def servicer(test_engine, monkeypatch):
+    """LibraryServiceImpl whose sessions are bound to the test database."""
+    from app import service_impl
+    monkeypatch.setattr(service_impl, "SessionLocal", get_sessionmaker_from_engine(test_engine))
+    return service_impl.LibraryServiceImpl()
+
+class FakeContext:
+    """Minimal stand-in for grpc.ServicerContext."""
+    def __init__(self):
+        self.code = None
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+@pytest.fixture
+def context():
+    return FakeContext()
 
 @pytest.fixture
 def sample_book_data():
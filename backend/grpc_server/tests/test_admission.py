@@ -0,0 +1,179 @@
+from concurrent import futures
+import gc
+import threading
+import time
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from app import migrations
+from app.admission import BULK, READ, WRITE, AdaptiveLimit, AdmissionController, method_class
+from app.database import get_engine, get_sessionmaker_from_engine
+from app.interceptors import AdmissionInterceptor, RETRY_PUSHBACK_METADATA_KEY
+
+SHARES = {READ: 1.0, WRITE: 0.8, BULK: 0.5}
+
+def controller(limit=10, method_limits=None, now=lambda: 0.0):
+    return AdmissionController(
+        AdaptiveLimit(initial=limit, min_limit=2, max_limit=limit, target_latency=0.1),
+        SHARES, method_limits or {}, clock=now,
+    )
+
+def test_method_classes():
+    assert method_class("ListBooks") == READ
+    assert method_class("SearchBooks") == READ
+    assert method_class("BorrowBook") == WRITE
+    assert method_class("ImportBooks") == BULK
+
+def test_bulk_is_shed_before_writes_and_writes_before_reads():
+    admission = controller(limit=10)
+    for _ in range(5):
+        assert admission.try_acquire("ListBooks")
+    assert not admission.try_acquire("ImportBooks")
+    for _ in range(3):
+        assert admission.try_acquire("BorrowBook")
+    assert not admission.try_acquire("BorrowBook")
+    assert admission.try_acquire("ListBooks")
+    assert admission.try_acquire("ListBooks")
+    assert not admission.try_acquire("ListBooks")
+    assert admission.stats()["rejected_bulk"] == 1
+    assert admission.stats()["rejected_write"] == 1
+    assert admission.stats()["rejected_read"] == 1
+
+def test_per_method_limit():
+    admission = controller(method_limits={"ImportBooks": 1})
+    assert admission.try_acquire("ImportBooks")
+    assert not admission.try_acquire("ImportBooks")
+    admission.release("ImportBooks")
+    assert admission.try_acquire("ImportBooks")
+
+def test_limit_backs_off_once_per_interval_and_recovers_slowly():
+    clock = [0.0]
+    admission = controller(limit=10, now=lambda: clock[0])
+    for _ in range(5):
+        admission.try_acquire("ListBooks")
+    # a burst of slow calls is one decrease
+    for _ in range(3):
+        admission.release("ListBooks", latency=1.0)
+    assert admission.adaptive.limit == pytest.approx(9.0)
+    clock[0] = 0.2
+    admission.release("ListBooks", latency=1.0)
+    assert admission.adaptive.limit == pytest.approx(8.1)
+
+    for _ in range(8):
+        admission.try_acquire("ListBooks")
+    admission.release("ListBooks", latency=0.01)
+    assert admission.adaptive.limit == pytest.approx(8.1 + 1 / 8.1)
+    assert admission.retry_after_ms() > 100
+
+def test_fast_calls_on_an_idle_server_do_not_grow_the_limit():
+    limit = AdaptiveLimit(initial=4, min_limit=1, max_limit=10, target_latency=0.1)
+    limit.update(0.01, in_flight=1, now=0.0)
+    assert limit.limit == 4
+
+@pytest.fixture
+def admitted_stub(tmp_path, monkeypatch):
+    from app import service_impl
+    engine = get_engine(f"sqlite:///{tmp_path / 'admission.db'}")
+    migrations.upgrade(engine)
+    monkeypatch.setattr(service_impl, "SessionLocal", get_sessionmaker_from_engine(engine))
+    admission = controller(limit=2)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[AdmissionInterceptor(admission)])
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(service_impl.LibraryServiceImpl(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel), admission
+    finally:
+        channel.close()
+        server.stop(None)
+        engine.dispose()
+
+def test_overloaded_server_fails_fast_with_a_retry_hint(admitted_stub):
+    stub, admission = admitted_stub
+    assert admission.try_acquire("ListBooks") and admission.try_acquire("ListBooks")
+
+    with pytest.raises(grpc.RpcError) as err:
+        stub.ListBooks(library_pb2.ListRequest())
+    assert err.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert int(dict(err.value.trailing_metadata())[RETRY_PUSHBACK_METADATA_KEY]) >= 10
+
+    admission.release("ListBooks")
+    stub.ListBooks(library_pb2.ListRequest())
+    assert admission.in_flight == 1
+
+def test_slow_upload_leaves_the_limit_unchanged(admitted_stub):
+    stub, admission = admitted_stub
+    admission.adaptive.min_limit = 1  # room to back off, were the upload counted
+
+    def slow_upload():
+        for i in range(2):
+            time.sleep(0.2)  # twice the target latency per message
+            yield library_pb2.Book(title=f"Book {i}", author="Author")
+    assert stub.ImportBooks(slow_upload()).created == 2
+    assert admission.adaptive.limit == 2
+    assert admission.in_flight == 0
+
+@pytest.fixture
+def one_thread_stub():
+    """A one-thread server whose ListBooks holds its thread until ``unblock`` is set."""
+    from app import service_impl
+    started, unblock = threading.Event(), threading.Event()
+
+    class Blocking(service_impl.LibraryServiceImpl):
+        def ListBooks(self, request, context):
+            started.set()
+            unblock.wait(10)
+            return library_pb2.BookList()
+
+    admission = controller(limit=2)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1), interceptors=[AdmissionInterceptor(admission)])
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(Blocking(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel), admission, started, unblock
+    finally:
+        unblock.set()
+        channel.close()
+        server.stop(None)
+
+def eventually(check, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+        gc.collect()
+
+def test_queued_calls_count_so_shedding_starts_without_waiting(one_thread_stub):
+    stub, admission, started, unblock = one_thread_stub
+    running = stub.ListBooks.future(library_pb2.ListRequest())
+    assert started.wait(5)
+    queued = stub.ListBooks.future(library_pb2.ListRequest())
+    eventually(lambda: admission.in_flight == 2)
+
+    shed = stub.ListBooks.future(library_pb2.ListRequest())
+    # refused on arrival, while the only thread is still busy
+    eventually(lambda: admission.stats()["rejected_read"] == 1)
+    assert not running.done() and not queued.done()
+
+    unblock.set()
+    running.result(timeout=5)
+    queued.result(timeout=5)
+    assert shed.exception(timeout=5).code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert RETRY_PUSHBACK_METADATA_KEY in dict(shed.trailing_metadata())
+    eventually(lambda: admission.in_flight == 0)
+
+def test_call_cancelled_while_queued_gives_its_slot_back(one_thread_stub):
+    stub, admission, started, unblock = one_thread_stub
+    running = stub.ListBooks.future(library_pb2.ListRequest())
+    assert started.wait(5)
+    with pytest.raises(grpc.RpcError) as err:
+        stub.ListBooks(library_pb2.ListRequest(), timeout=0.2)
+    assert err.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+    unblock.set()
+    running.result(timeout=5)
+    eventually(lambda: admission.in_flight == 0)
@@ -0,0 +1,91 @@
+import asyncio
+from concurrent import futures
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from app.models import Base
+from app.database import get_async_engine, get_async_sessionmaker_from_engine
+from app.services.aio import book_service, member_service, borrowing_service
+from app.aio_service_impl import AsyncLibraryServiceImpl
+
+@pytest.fixture
+def async_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'aio.db'}"
+
+def run(async_url, scenario):
+    """Create the schema on a fresh async engine and run ``scenario(session_factory)``."""
+    async def main():
+        engine = get_async_engine(async_url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            return await scenario(get_async_sessionmaker_from_engine(engine))
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+def test_borrow_and_return(async_url):
+    async def scenario(session_factory):
+        async with session_factory() as db:
+            book = await book_service.create_book(db, "Test Book", "Test Author")
+            member = await member_service.create_member(db, "Test Member", "test@example.com")
+            borrowing = await borrowing_service.borrow_book_by_id(db, book.id, member.id)
+            assert await borrowing_service.has_active_borrowings(db, member.id)
+
+            rows = await borrowing_service.list_current_borrowing_rows(db, member_id=member.id)
+            assert [(r.book_title, r.member_name) for r in rows] == [("Test Book", "Test Member")]
+
+            assert await borrowing_service.return_borrowing_by_id(db, borrowing.id) == book.id
+            assert not await borrowing_service.has_active_borrowings(db, member.id)
+            assert (await book_service.get_book(db, book.id)).available
+    run(async_url, scenario)
+
+def test_iter_books(async_url):
+    async def scenario(session_factory):
+        async with session_factory() as db:
+            for i in range(5):
+                await book_service.create_book(db, f"Book {i}", "Author")
+            titles = [b.title async for b in book_service.iter_books(db, after_id=2, batch_size=2)]
+            assert titles == ["Book 2", "Book 3", "Book 4"]
+    run(async_url, scenario)
+
+def test_aio_server_round_trip(async_url):
+    async def scenario(session_factory):
+        server = grpc.aio.server(migration_thread_pool=futures.ThreadPoolExecutor(max_workers=2))
+        library_pb2_grpc.add_LibraryServiceServicer_to_server(AsyncLibraryServiceImpl(session_factory), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                stub = library_pb2_grpc.LibraryServiceStub(channel)
+                await asyncio.gather(*[
+                    stub.CreateBook(library_pb2.Book(title=f"Book {i}", author="Author")) for i in range(10)
+                ])
+                page = await stub.ListBooks(library_pb2.ListRequest(page_size=4))
+                assert len(page.books) == 4 and page.next_after_id
+                streamed = [b async for b in stub.StreamBooks(library_pb2.StreamRequest())]
+                assert len(streamed) == 10
+        finally:
+            await server.stop(None)
+    run(async_url, scenario)
+
+def test_aio_watch_inventory(async_url):
+    async def scenario(session_factory):
+        server = grpc.aio.server()
+        library_pb2_grpc.add_LibraryServiceServicer_to_server(AsyncLibraryServiceImpl(session_factory), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                stub = library_pb2_grpc.LibraryServiceStub(channel)
+                # from now: the headers arrive once the position is fixed
+                watch = stub.WatchInventory(library_pb2.WatchRequest(), timeout=10)
+                await watch.initial_metadata()
+                book = await stub.CreateBook(library_pb2.Book(title="Dune", author="Herbert"))
+                event = await watch.read()
+                assert (event.entity, event.action, event.id) == ("book", "created", book.id)
+                watch.cancel()
+        finally:
+            await server.stop(None)
+    run(async_url, scenario)
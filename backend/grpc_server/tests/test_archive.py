@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import select
+from app import archive
+from app.database import get_sessionmaker_from_engine
+from app.models import ArchivedBorrowing, Borrowing
+from app.services import book_service, borrowing_service, member_service
+
+def _loans(test_db):
+    member = member_service.create_member(test_db, name="Member", contact="m@test.com")
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(4)]
+    results, _ = borrowing_service.borrow_books(test_db, [b.id for b in books], member.id)
+    loan_ids = [borrowing_id for _, _, _, borrowing_id in results]
+    long_ago = datetime.now(UTC) - timedelta(days=400)
+    borrowing_service.return_borrowings(test_db, [loan_ids[0], loan_ids[1], loan_ids[3]], return_time=long_ago)
+    borrowing_service.return_borrowings(test_db, [loan_ids[2]])
+    return member, loan_ids
+
+def test_archive_moves_old_returned_loans_in_batches(test_engine, test_db):
+    member, loan_ids = _loans(test_db)
+
+    moved = archive.archive_returned(get_sessionmaker_from_engine(test_engine), retention_days=365, batch_size=1, pause=0)
+
+    # the newest loan stays even though it is old enough, so SQLite cannot reuse its id
+    assert moved == 2
+    assert test_db.scalars(select(Borrowing.id).order_by(Borrowing.id)).all() == loan_ids[2:]
+    assert test_db.scalars(select(ArchivedBorrowing.id).order_by(ArchivedBorrowing.id)).all() == loan_ids[:2]
+    assert not borrowing_service.has_active_borrowings(test_db, member.id)
+
+def test_history_pages_across_hot_and_archived_loans(test_engine, test_db):
+    member, loan_ids = _loans(test_db)
+    archive.archive_returned(get_sessionmaker_from_engine(test_engine), retention_days=365, pause=0)
+
+    first = borrowing_service.borrowing_history(test_db, member_id=member.id, limit=3)
+    assert [r.borrowing_id for r in first] == loan_ids[:3]
+    assert [r.archived for r in first] == [True, True, False]
+    assert all(r.member_name == "Member" and r.returned_at for r in first)
+
+    rest = borrowing_service.borrowing_history(test_db, member_id=member.id, after_id=loan_ids[1], limit=3)
+    assert [r.borrowing_id for r in rest] == loan_ids[2:]
+    assert borrowing_service.borrowing_history(test_db, member_id=member.id + 1) == []
+
+def test_loan_lists_keep_archived_loans(test_engine, test_db):
+    member, loan_ids = _loans(test_db)
+    archive.archive_returned(get_sessionmaker_from_engine(test_engine), retention_days=365, pause=0)
+    newest_first = loan_ids[::-1]
+
+    first = borrowing_service.list_member_loans(test_db, member.id, "returned", limit=3)
+    assert [r.borrowing_id for r in first] == newest_first[:3]
+    assert [r.archived for r in first] == [False, False, True]
+    rest = borrowing_service.list_member_loans(
+        test_db, member.id, "returned", position=(first[-1].borrowed_at, first[-1].borrowing_id), limit=3,
+    )
+    assert [r.borrowing_id for r in rest] == newest_first[3:]
+    assert all(r.member_name == "Member" and r.book_title for r in first + rest)
+
+    assert [r.borrowing_id for r in borrowing_service.list_member_loans(test_db, member.id)] == newest_first
+    assert [r.archived for r in borrowing_service.list_book_loans(test_db, rest[0].book_id)] == [True]
+    assert borrowing_service.list_member_loans(test_db, member.id, "open") == []
@@ -0,0 +1,15 @@
+from benchmarks.run import percentile, summarize
+
+def test_percentile_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile(values, 100) == 0.1
+    assert percentile([], 50) == 0.0
+
+def test_summarize():
+    summary = summarize([0.002, 0.001, 0.004], {"OK": 3}, elapsed=2.0)
+    assert summary["requests"] == 3
+    assert summary["throughput_rps"] == 1.5
+    assert summary["p50_ms"] == 2.0
+    assert summary["max_ms"] == 4.0
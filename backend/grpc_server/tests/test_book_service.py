@@ -1,6 +1,6 @@
 from datetime import datetime
 import pytest
-from app.services import book_service
+from app.services import book_service, borrowing_service, member_service
 
 def test_create_book(test_db, sample_book_data):
     book = book_service.create_book(test_db, **sample_book_data)
@@ -29,12 +29,128 @@ def test_list_books(test_db, sample_book_data):
 
 def test_update_book(test_db, sample_book_data):
     book = book_service.create_book(test_db, **sample_book_data)
-    updated = book_service.update_book(test_db, book, "New Title", "New Author")
+    updated = book_service.update_book_by_id(test_db, book.id, "New Title", "New Author")
     assert updated.title == "New Title"
     assert updated.author == "New Author"
     assert updated.id == book.id
 
 def test_delete_book(test_db, sample_book_data):
     book = book_service.create_book(test_db, **sample_book_data)
-    book_service.delete_book(test_db, book)
-    assert book_service.get_book(test_db, book.id) is None
\ No newline at end of file
+    book_service.delete_book_by_id(test_db, book.id)
+    assert book_service.get_book(test_db, book.id) is None
+
+def test_list_books_keyset_page(test_db):
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(5)]
+
+    first = book_service.list_books(test_db, limit=2)
+    assert [b.id for b in first] == [books[0].id, books[1].id]
+
+    second = book_service.list_books(test_db, after_id=first[-1].id, limit=2)
+    assert [b.id for b in second] == [books[2].id, books[3].id]
+
+def test_iter_books(test_db):
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(5)]
+    books[1].available = False
+    test_db.commit()
+
+    streamed = list(book_service.iter_books(test_db, only_available=True, batch_size=2))
+    assert [b.id for b in streamed] == [b.id for b in books if b is not books[1]]
+
+def test_import_books_reports_conflicts_without_aborting(test_db, sample_book_data):
+    book_service.create_book(test_db, **sample_book_data)
+    rows = [
+        ("Book 1", "Author"),
+        (sample_book_data["title"], sample_book_data["author"]),  # already in the catalog
+        ("Book 2", "Author"),
+        ("book 1", "author"),  # duplicate within the import
+        ("", "Author"),
+        ("Book 3", "Author"),
+    ]
+    created, failures = book_service.import_books(test_db, rows, batch_size=2)
+    assert created == 3
+    assert [index for index, _ in failures] == [1, 3, 4]
+    assert [b.title for b in book_service.list_books(test_db)] == ["Test Book", "Book 1", "Book 2", "Book 3"]
+
+@pytest.fixture
+def catalog(test_db):
+    rows = [
+        ("The Hobbit", "J. R. R. Tolkien"),
+        ("The Lord of the Rings", "J. R. R. Tolkien"),
+        ("Dune", "Frank Herbert"),
+        ("100% Pure", "Test_Author"),
+        ("Go Set a Watchman", "Harper Lee"),
+    ]
+    book_service.import_books(test_db, rows)
+    return {b.title: b for b in book_service.list_books(test_db)}
+
+def test_search_books_substring(test_db, catalog):
+    assert [b.title for b in book_service.search_books(test_db, "tolk")] == ["The Hobbit", "The Lord of the Rings"]
+    assert [b.title for b in book_service.search_books(test_db, "HERB")] == ["Dune"]
+    assert [b.title for b in book_service.search_books(test_db, "of the")] == ["The Lord of the Rings"]
+
+def test_search_books_prefix(test_db, catalog):
+    assert [b.title for b in book_service.search_books(test_db, "the", prefix=True)] == ["The Hobbit", "The Lord of the Rings"]
+    assert [b.title for b in book_service.search_books(test_db, "obbit", prefix=True)] == []
+
+def test_search_books_short_query_and_wildcards(test_db, catalog):
+    assert [b.title for b in book_service.search_books(test_db, "go", prefix=True)] == ["Go Set a Watchman"]
+    assert [b.title for b in book_service.search_books(test_db, "0%")] == ["100% Pure"]
+    assert [b.title for b in book_service.search_books(test_db, "t_a")] == ["100% Pure"]
+
+def test_search_books_available_only_and_paging(test_db, catalog):
+    catalog["The Hobbit"].available = False
+    test_db.commit()
+    assert [b.title for b in book_service.search_books(test_db, "the", available_only=True)] == ["The Lord of the Rings"]
+
+    first = book_service.search_books(test_db, "the", limit=1)
+    rest = book_service.search_books(test_db, "the", after_id=first[-1].id)
+    assert [b.title for b in first + rest] == ["The Hobbit", "The Lord of the Rings"]
+
+def test_search_index_follows_updates_and_deletes(test_db, catalog):
+    book_service.update_book_by_id(test_db, catalog["Dune"].id, "Dune Messiah", "Frank Herbert")
+    assert [b.title for b in book_service.search_books(test_db, "messiah")] == ["Dune Messiah"]
+    book_service.delete_book_by_id(test_db, catalog["Dune"].id)
+    assert book_service.search_books(test_db, "herbert") == []
+
+def test_writes_are_one_statement_without_read_back(test_db, sample_book_data, statements):
+    book = book_service.create_book(test_db, **sample_book_data)
+    assert (book.id, book.available, book.title) == (book.id, True, sample_book_data["title"])
+    assert book.created_at and book.updated_at
+
+    updated = book_service.update_book_by_id(test_db, book.id, "New Title", "New Author")
+    assert (updated.title, updated.author, updated.available) == ("New Title", "New Author", True)
+    assert updated.updated_at >= book.created_at
+
+    assert [s.split()[0] for s in statements] == ["INSERT", "UPDATE"]
+    assert book_service.update_book_by_id(test_db, 999, "x", "y") is None
+
+def test_delete_leaves_tombstone_and_frees_title(test_db, sample_book_data):
+    book = book_service.create_book(test_db, **sample_book_data)
+    book_service.delete_book_by_id(test_db, book.id)
+    assert book_service.get_book(test_db, book.id) is None
+    assert book_service.list_books(test_db) == []
+    assert book_service.update_book_by_id(test_db, book.id, "x", "y") is None
+    again = book_service.create_book(test_db, **sample_book_data)
+    assert again.id != book.id
+
+def test_list_books_since_returns_changes_and_tombstones(test_db, sample_member_data):
+    member = member_service.create_member(test_db, **sample_member_data)
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(4)]
+    rows, cursor, has_more = book_service.list_books_since(test_db, "", limit=3, settle_seconds=0)
+    assert [b.id for b in rows] == [b.id for b in books[:3]] and has_more
+    rows, cursor, has_more = book_service.list_books_since(test_db, cursor, limit=3, settle_seconds=0)
+    assert [b.id for b in rows] == [books[3].id] and not has_more
+    assert book_service.list_books_since(test_db, cursor, limit=3, settle_seconds=0) == ([], cursor, False)
+
+    book_service.update_book_by_id(test_db, books[0].id, "Renamed", "Author")
+    borrowing_service.borrow_book_by_id(test_db, books[1].id, member.id)
+    book_service.delete_book_by_id(test_db, books[2].id)
+    rows, cursor, _ = book_service.list_books_since(test_db, cursor, limit=10, settle_seconds=0)
+    assert [(b.id, b.deleted_at is not None) for b in rows] == [
+        (books[0].id, False), (books[1].id, False), (books[2].id, True),
+    ]
+    assert rows[1].available is False
+
+def test_list_books_since_holds_back_unsettled_rows(test_db):
+    book_service.create_book(test_db, title="Fresh", author="Author")
+    assert book_service.list_books_since(test_db, "", limit=10, settle_seconds=60)[0] == []
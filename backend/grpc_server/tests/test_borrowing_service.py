@@ -1,5 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import threading
 import pytest
+from app.database import get_engine, get_sessionmaker_from_engine
+from app import migrations
+from sqlalchemy import select, update
+from app.models import Book, Borrowing
 from app.services import borrowing_service, book_service, member_service
 
 @pytest.fixture
@@ -12,7 +18,7 @@ def test_member(test_db, sample_member_data):
 
 def test_borrow_book(test_db, test_book, test_member):
     # Borrow a book
-    borrowing = borrowing_service.borrow_book(test_db, test_book, test_member.id)
+    borrowing = borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id)
     assert borrowing.book_id == test_book.id
     assert borrowing.member_id == test_member.id
     assert borrowing.returned_at is None
@@ -24,10 +30,12 @@ def test_borrow_book(test_db, test_book, test_member):
 
 def test_return_book(test_db, test_book, test_member):
     # Setup: borrow a book
-    borrowing = borrowing_service.borrow_book(test_db, test_book, test_member.id)
+    borrowing = borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id)
     
     # Return the book
-    returned = borrowing_service.return_borrowing(test_db, borrowing)
+    assert borrowing_service.return_borrowing_by_id(test_db, borrowing.id) == test_book.id
+    returned = test_db.get(Borrowing, borrowing.id)
+    test_db.refresh(returned)
     assert isinstance(returned.returned_at, datetime)
     
     # Verify book is available again
@@ -36,16 +44,158 @@ def test_return_book(test_db, test_book, test_member):
 
 def test_list_current_borrowings(test_db, test_book, test_member):
     # Create one current and one returned borrowing
-    borrowing1 = borrowing_service.borrow_book(test_db, test_book, test_member.id)
+    borrowing1 = borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id)
     
     # Create another book and borrow it
     book2 = book_service.create_book(test_db, title="Book 2", author="Author 2")
-    borrowing2 = borrowing_service.borrow_book(test_db, book2, test_member.id)
+    borrowing2 = borrowing_service.borrow_book_by_id(test_db, book2.id, test_member.id)
     
     # Return the second book
-    borrowing_service.return_borrowing(test_db, borrowing2)
+    borrowing_service.return_borrowing_by_id(test_db, borrowing2.id)
     
     # List current borrowings - should only see the first one
-    current = borrowing_service.list_current_borrowings(test_db)
+    current = borrowing_service.list_current_borrowing_rows(test_db)
     assert len(current) == 1
-    assert current[0].id == borrowing1.id
\ No newline at end of file
+    assert current[0].borrowing_id == borrowing1.id
+
+def test_return_is_not_repeatable(test_db, test_book, test_member):
+    borrowing = borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id)
+    assert borrowing_service.return_borrowing_by_id(test_db, borrowing.id) == test_book.id
+    assert borrowing_service.return_borrowing_by_id(test_db, borrowing.id) is None
+
+def test_borrow_unknown_book(test_db, test_member):
+    assert borrowing_service.borrow_book_by_id(test_db, 999, test_member.id) is None
+
+def test_deleted_member_cannot_borrow(test_db, test_book, test_member):
+    member_service.delete_member(test_db, test_member)
+    assert borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id) is None
+    results, committed = borrowing_service.borrow_books(test_db, [test_book.id], 999)
+    assert not committed and not results[0][1]
+    assert book_service.get_book(test_db, test_book.id).available
+
+def test_return_leaves_a_deleted_book_unavailable(test_db, test_book, test_member):
+    borrowing = borrowing_service.borrow_book_by_id(test_db, test_book.id, test_member.id)
+    assert book_service.delete_book_by_id(test_db, test_book.id) is None  # borrowed
+    test_db.execute(update(Book).where(Book.id == test_book.id).values(deleted_at=datetime.now()))
+    test_db.commit()
+    assert borrowing_service.return_borrowing_by_id(test_db, borrowing.id) == test_book.id
+    assert not test_db.scalar(select(Book.available).where(Book.id == test_book.id))
+
+@pytest.fixture
+def file_sessionmaker(tmp_path):
+    """Sessionmaker on a file database so every thread gets its own connection."""
+    engine = get_engine(f"sqlite:///{tmp_path / 'contention.db'}")
+    migrations.upgrade(engine)
+    try:
+        yield get_sessionmaker_from_engine(engine)
+    finally:
+        engine.dispose()
+
+def _hammer(session_factory, workers, fn):
+    barrier = threading.Barrier(workers)
+
+    def run(i):
+        db = session_factory()
+        try:
+            barrier.wait()
+            return fn(db, i)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, range(workers)))
+
+def test_concurrent_borrows_of_one_book(file_sessionmaker):
+    workers = 16
+    with file_sessionmaker() as db:
+        book_id = book_service.create_book(db, "Contended", "Author").id
+        member_ids = [member_service.create_member(db, f"M{i}", f"m{i}@test.com").id for i in range(workers)]
+
+    results = _hammer(
+        file_sessionmaker, workers,
+        lambda db, i: borrowing_service.borrow_book_by_id(db, book_id, member_ids[i]),
+    )
+
+    assert sum(r is not None for r in results) == 1
+    with file_sessionmaker() as db:
+        assert db.query(Borrowing).filter(Borrowing.book_id == book_id).count() == 1
+        assert not book_service.get_book(db, book_id).available
+
+def test_concurrent_returns_of_one_borrowing(file_sessionmaker):
+    with file_sessionmaker() as db:
+        book = book_service.create_book(db, "Contended", "Author")
+        member = member_service.create_member(db, "M", "m@test.com")
+        borrowing_id = borrowing_service.borrow_book_by_id(db, book.id, member.id).id
+
+    results = _hammer(
+        file_sessionmaker, 16,
+        lambda db, i: borrowing_service.return_borrowing_by_id(db, borrowing_id),
+    )
+    assert sum(r is not None for r in results) == 1
+
+def test_list_current_borrowing_rows_filters_and_pages(test_db, test_member):
+    other = member_service.create_member(test_db, name="Other", contact="other@test.com")
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(4)]
+    loans = [
+        borrowing_service.borrow_book_by_id(test_db, book.id, test_member.id if i % 2 == 0 else other.id).id
+        for i, book in enumerate(books)
+    ]
+
+    rows = borrowing_service.list_current_borrowing_rows(test_db, member_id=test_member.id)
+    assert [r.borrowing_id for r in rows] == [loans[0], loans[2]]
+    assert rows[0].book_title == "Book 0"
+    assert rows[0].member_name == test_member.name
+
+    page = borrowing_service.list_current_borrowing_rows(test_db, after_id=loans[0], limit=2)
+    assert [r.borrowing_id for r in page] == loans[1:3]
+    assert [r.borrowing_id for r in borrowing_service.list_current_borrowing_rows(test_db, book_id=books[3].id)] == [loans[3]]
+
+def test_borrow_books_partial(test_db, test_member):
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(3)]
+    borrowing_service.borrow_book_by_id(test_db, books[1].id, test_member.id)
+
+    ids = [books[0].id, books[1].id, books[2].id, books[0].id, 999]
+    results, committed = borrowing_service.borrow_books(test_db, ids, test_member.id)
+    assert committed
+    assert [(i, ok) for i, ok, _, _ in results] == [
+        (books[0].id, True), (books[1].id, False), (books[2].id, True), (books[0].id, False), (999, False),
+    ]
+    assert all(borrowing_id for _, ok, _, borrowing_id in results if ok)
+    assert len(borrowing_service.list_current_borrowing_rows(test_db)) == 3
+
+def test_borrow_books_all_or_nothing_rolls_back(test_db, test_member):
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(2)]
+    results, committed = borrowing_service.borrow_books(test_db, [books[0].id, 999], test_member.id, all_or_nothing=True)
+    assert not committed
+    assert not any(ok for _, ok, _, _ in results)
+    assert book_service.get_book(test_db, books[0].id).available
+    assert borrowing_service.list_current_borrowing_rows(test_db) == []
+
+def test_return_borrowings(test_db, test_member):
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(2)]
+    results, _ = borrowing_service.borrow_books(test_db, [b.id for b in books], test_member.id)
+    loan_ids = [borrowing_id for _, _, _, borrowing_id in results]
+
+    results, committed = borrowing_service.return_borrowings(test_db, loan_ids + [999], all_or_nothing=True)
+    assert not committed
+    assert len(borrowing_service.list_current_borrowing_rows(test_db)) == 2
+
+    results, committed = borrowing_service.return_borrowings(test_db, loan_ids)
+    assert committed and all(ok for _, ok, _, _ in results)
+    assert all(book_service.get_book(test_db, b.id).available for b in books)
+
+def test_member_and_book_loans_page_newest_first(test_db, test_member):
+    other = member_service.create_member(test_db, name="Other", contact="o@test.com")
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(3)]
+    loan_ids = [borrowing_service.borrow_book_by_id(test_db, b.id, test_member.id).id for b in books]
+    borrowing_service.return_borrowing_by_id(test_db, loan_ids[0])
+    borrowing_service.borrow_book_by_id(test_db, books[0].id, other.id)
+
+    first = borrowing_service.list_member_loans(test_db, test_member.id, limit=2)
+    assert [r.borrowing_id for r in first] == [loan_ids[2], loan_ids[1]]
+    rest = borrowing_service.list_member_loans(test_db, test_member.id, position=(first[-1].borrowed_at, first[-1].borrowing_id))
+    assert [r.borrowing_id for r in rest] == [loan_ids[0]]
+
+    assert [r.borrowing_id for r in borrowing_service.list_member_loans(test_db, test_member.id, "returned")] == [loan_ids[0]]
+    assert [r.member_name for r in borrowing_service.list_book_loans(test_db, books[0].id)] == ["Other", test_member.name]
+    assert [r.member_name for r in borrowing_service.list_book_loans(test_db, books[0].id, "open")] == ["Other"]
@@ -0,0 +1,90 @@
+import multiprocessing
+import generated.library_pb2 as library_pb2
+from app.cache import CatalogVersion, TTLCache, catalog_cache
+from app.services import book_service, borrowing_service, member_service
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl=5, clock=clock)
+    cache.put(("books", 1), "page", cache.generation)
+    assert cache.get(("books", 1)) == "page"
+    clock.now = 6
+    assert cache.get(("books", 1)) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 0}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2, ttl=60)
+    for key in ("a", "b"):
+        cache.put(("books", key), key, cache.generation)
+    cache.get(("books", "a"))
+    cache.put(("books", "c"), "c", cache.generation)
+    assert cache.get(("books", "b")) is None
+    assert cache.get(("books", "a")) == "a"
+    assert cache.evictions == 1
+
+def test_invalidate_only_drops_namespace():
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.put(("books", 1), "books", cache.generation)
+    cache.put(("members", 1), "members", cache.generation)
+    cache.invalidate("books")
+    assert cache.get(("books", 1)) is None
+    assert cache.get(("members", 1)) == "members"
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = TTLCache(max_entries=10, ttl=60)
+
+    def loader():
+        cache.invalidate("books")  # a write commits while the page is being built
+        return "stale"
+
+    assert cache.get_or_load(("books", 1), loader) == "stale"
+    assert cache.get(("books", 1)) is None
+
+def test_list_books_served_from_cache_until_write(servicer, context, test_db):
+    book = book_service.create_book(test_db, title="Book 1", author="Author")
+    member = member_service.create_member(test_db, name="Member", contact="m@test.com")
+
+    hits = catalog_cache.hits
+    assert len(servicer.ListAvailableBooks(library_pb2.ListRequest(), context).books) == 1
+    assert len(servicer.ListAvailableBooks(library_pb2.ListRequest(), context).books) == 1
+    assert catalog_cache.hits == hits + 1
+
+    borrowing_service.borrow_book_by_id(test_db, book.id, member.id)
+    assert len(servicer.ListAvailableBooks(library_pb2.ListRequest(), context).books) == 0
+
+def test_catalog_version_bumps_are_seen_by_forked_workers():
+    version = CatalogVersion()
+    before = version.token("books")
+    worker = multiprocessing.get_context("fork").Process(target=version.bump, args=("books",))
+    worker.start()
+    worker.join()
+    assert version.current("books") == 1
+    assert version.token("books") != before
+    assert version.current("members") == 0
+
+def test_list_with_current_version_is_not_modified(servicer, context, test_db, statements):
+    book_service.create_book(test_db, title="Book 1", author="Author")
+    first = servicer.ListBooks(library_pb2.ListRequest(), context)
+    assert len(first.books) == 1 and first.version and not first.not_modified
+
+    catalog_cache.invalidate()  # the fast path must not depend on a cached page
+    statements.clear()
+    again = servicer.ListBooks(library_pb2.ListRequest(if_version=first.version), context)
+    assert again.not_modified and again.version == first.version
+    assert len(again.books) == 0
+    assert statements == []
+
+    member_service.create_member(test_db, name="Member", contact="m@test.com")
+    assert servicer.ListBooks(library_pb2.ListRequest(if_version=first.version), context).not_modified
+
+    book_service.create_book(test_db, title="Book 2", author="Author")
+    changed = servicer.ListBooks(library_pb2.ListRequest(if_version=first.version), context)
+    assert not changed.not_modified and changed.version != first.version
+    assert len(changed.books) == 2
@@ -0,0 +1,149 @@
+from concurrent import futures
+import time
+import grpc
+import pytest
+from sqlalchemy import exc, text
+from app import constants
+from app.database import (
+    RequestAbandoned, RequestDeadline, get_engine, get_sessionmaker_from_engine, pool_stats, request_deadline,
+)
+from app.interceptors import DeadlineInterceptor, MetricsInterceptor
+from app.metrics import RpcMetrics
+
+# a query that runs for minutes unless interrupted
+SLOW_QUERY = text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n")
+
+@pytest.fixture
+def file_engine(tmp_path, monkeypatch):
+    engines = []
+
+    def make(**settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(constants, name, value)
+        engine = get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        engines.append(engine)
+        return engine
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+def test_pool_settings_come_from_constants(file_engine):
+    engine = file_engine(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, DB_POOL_RECYCLE_SECONDS=60)
+    assert engine.pool.size() == 3
+    assert engine.pool._recycle == 60
+    with engine.connect():
+        stats = pool_stats(engine)
+    assert stats["capacity"] == 5
+    assert stats["saturation"] == pytest.approx(0.2)
+    assert stats["checkouts"] == 1 and stats["connects"] == 1
+
+def test_recently_used_connections_are_not_pinged(file_engine):
+    engine = file_engine(DB_PRE_PING_IDLE_SECONDS=30)
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert pool_stats(engine)["pings"] == 0
+
+def test_idle_connection_is_pinged_and_replaced_when_dead(file_engine):
+    engine = file_engine(DB_PRE_PING_IDLE_SECONDS=0)
+    raw = engine.raw_connection()
+    dbapi_connection = raw.dbapi_connection
+    raw.close()
+    # the server side went away while the connection sat in the pool
+    dbapi_connection.close()
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    stats = pool_stats(engine)
+    assert stats["pings"] == 1 and stats["ping_failures"] == 1
+    assert stats["connects"] == 2 and stats["invalidations"] == 1
+
+def test_checkout_timeout_is_counted(file_engine):
+    engine = file_engine(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT_SECONDS=0.05)
+    with engine.connect():
+        assert pool_stats(engine)["saturation"] == 1.0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    stats = pool_stats(engine)
+    assert stats["checkout_timeouts"] == 1
+    assert stats["checkouts"] == 1
+
+def test_expired_deadline_interrupts_a_running_sqlite_query(file_engine):
+    engine = file_engine()
+    session_factory = get_sessionmaker_from_engine(engine)
+    token = request_deadline.set(RequestDeadline(time.monotonic() + 0.1))
+    try:
+        db = session_factory()
+        started = time.monotonic()
+        with pytest.raises(exc.OperationalError, match="interrupted"):
+            db.execute(SLOW_QUERY)
+        db.close()
+    finally:
+        request_deadline.reset(token)
+    assert time.monotonic() - started < 2
+    assert pool_stats(engine)["checkedout"] == 0
+
+    # the handler left with the request; the same pooled connection runs unbounded again
+    db = session_factory()
+    try:
+        bounded = text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 100000) SELECT count(*) FROM n")
+        assert db.execute(bounded).scalar() == 100000
+    finally:
+        db.close()
+    assert pool_stats(engine)["connects"] == 1
+
+def test_cancelled_request_runs_no_further_statements(file_engine):
+    session_factory = get_sessionmaker_from_engine(file_engine())
+    active = [True]
+    token = request_deadline.set(RequestDeadline(is_active=lambda: active[0]))
+    try:
+        db = session_factory()
+        try:
+            assert db.execute(text("SELECT 1")).scalar() == 1
+            active[0] = False
+            with pytest.raises(RequestAbandoned):
+                db.execute(text("SELECT 2"))
+        finally:
+            db.close()
+    finally:
+        request_deadline.reset(token)
+
+def test_deadline_reaches_the_database_and_frees_the_connection(file_engine):
+    engine = file_engine()
+    session_factory = get_sessionmaker_from_engine(engine)
+    finished = []
+
+    def slow(request, context):
+        db = session_factory()
+        try:
+            db.execute(SLOW_QUERY)
+        except Exception as e:
+            finished.append(str(e))
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+        finally:
+            db.close()
+        return b""
+
+    metrics = RpcMetrics()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1),
+                         interceptors=[MetricsInterceptor(metrics), DeadlineInterceptor()])
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        "test.Slow", {"Run": grpc.unary_unary_rpc_method_handler(slow)}),))
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        with pytest.raises(grpc.RpcError) as err:
+            channel.unary_unary("/test.Slow/Run")(b"", timeout=0.2)
+        assert err.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+        for _ in range(100):
+            if 'grpc_method="Run",grpc_code="DEADLINE_EXCEEDED"' in metrics.render():
+                break
+            time.sleep(0.02)
+        assert "interrupted" in finished[0]
+        assert 'grpc_method="Run",grpc_code="DEADLINE_EXCEEDED"' in metrics.render()
+        assert pool_stats(engine)["checkedout"] == 0
+    finally:
+        channel.close()
+        server.stop(None)
@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent import futures
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from app import migrations, server, service_impl
+from app.database import get_engine, get_sessionmaker_from_engine
+from app.events import EventBus, EventsLost, inventory_events
+from app.services import book_service, borrowing_service, member_service
+
+def test_read_returns_events_after_position():
+    bus = EventBus(capacity=10)
+    for i in range(3):
+        bus.publish("book", "created", i + 1, title=f"Book {i}")
+    assert [e.seq for e in bus.read(0)] == [1, 2, 3]
+    assert [e.id for e in bus.read(1)] == [2, 3]
+    assert bus.read(3, timeout=0.01) == []
+
+def test_read_raises_once_position_is_pruned():
+    bus = EventBus(capacity=2)
+    for i in range(4):
+        bus.publish("book", "created", i + 1)
+    assert [e.seq for e in bus.read(2)] == [3, 4]
+    with pytest.raises(EventsLost):
+        bus.read(1)
+    with pytest.raises(EventsLost):
+        bus.read(9)
+
+def test_read_async_wakes_on_publish_from_another_thread():
+    bus = EventBus(capacity=10)
+
+    async def scenario():
+        reader = asyncio.create_task(bus.read_async(0, timeout=5))
+        await asyncio.sleep(0.05)
+        threading.Thread(target=bus.publish, args=("member", "created", 7)).start()
+        return await reader
+    events = asyncio.run(scenario())
+    assert [(e.entity, e.id) for e in events] == [("member", 7)]
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    # server threads need to share one database, which in-memory SQLite cannot do
+    engine = get_engine(f"sqlite:///{tmp_path / 'watch.db'}")
+    migrations.upgrade(engine)
+    monkeypatch.setattr(service_impl, "SessionLocal", get_sessionmaker_from_engine(engine))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(service_impl.LibraryServiceImpl(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel)
+    finally:
+        channel.close()
+        server.stop(None)
+        engine.dispose()
+
+def test_watch_streams_and_resumes(stub):
+    # an explicit position, so the writes cannot race the stream start
+    start = library_pb2.WatchRequest(after_seq=inventory_events.last_seq, entities=["book"])
+    watch = stub.WatchInventory(start, timeout=10)
+    book = stub.CreateBook(library_pb2.Book(title="Dune", author="Herbert"))
+    stub.AddMember(library_pb2.AddMemberRequest(name="Alice", contact="alice@test.com"))
+    stub.UpdateBook(library_pb2.Book(id=book.id, title="Dune Messiah", author="Herbert"))
+
+    created = next(watch)
+    assert (created.entity, created.action, created.book.title) == ("book", "created", "Dune")
+    updated = next(watch)
+    assert (updated.action, updated.book.title) == ("updated", "Dune Messiah")
+    assert updated.seq == created.seq + 2  # the member event was filtered out
+    watch.cancel()
+
+    resumed = stub.WatchInventory(library_pb2.WatchRequest(after_seq=created.seq, epoch=created.epoch), timeout=10)
+    assert next(resumed).entity == "member"
+    resumed.cancel()
+
+def test_watch_from_now_sees_writes_made_once_established(stub):
+    watch = stub.WatchInventory(library_pb2.WatchRequest(entities=["book"]), timeout=10)
+    # what the gateway's "ready" waits for; a list taken now misses nothing
+    watch.initial_metadata()
+    book = stub.CreateBook(library_pb2.Book(title="Dune", author="Herbert"))
+    assert next(watch).id == book.id
+    watch.cancel()
+
+def test_watch_rejects_unknown_epoch(stub):
+    with pytest.raises(grpc.RpcError) as err:
+        next(stub.WatchInventory(library_pb2.WatchRequest(after_seq=1, epoch="other-process")))
+    assert err.value.code() == grpc.StatusCode.OUT_OF_RANGE
+    with pytest.raises(grpc.RpcError) as err:
+        next(stub.WatchInventory(library_pb2.WatchRequest(entities=["shelf"])))
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+def test_borrow_and_return_publish_book_availability(test_db):
+    book = book_service.create_book(test_db, title="Dune", author="Herbert")
+    member = member_service.create_member(test_db, name="Alice", contact="alice@test.com")
+    start = inventory_events.last_seq
+    borrowing = borrowing_service.borrow_book_by_id(test_db, book.id, member.id)
+    borrowing_service.return_borrowings(test_db, [borrowing.id])
+    events = [(e.entity, e.action, e.data.get("available")) for e in inventory_events.read(start)]
+    assert events == [
+        ("book", "updated", False), ("borrowing", "borrowed", None),
+        ("book", "updated", True), ("borrowing", "returned", None),
+    ]
+
+def test_prefork_workers_have_their_own_epoch(servicer, context):
+    inventory_events.publish("book", "created", 1)
+    fork = multiprocessing.get_context("fork")
+    reader, writer = fork.Pipe(duplex=False)
+
+    def worker():
+        server._reset_after_fork()
+        inventory_events.publish("book", "created", 2)
+        writer.send((inventory_events.epoch, inventory_events.last_seq))
+
+    process = fork.Process(target=worker)
+    process.start()
+    epoch, seq = reader.recv()
+    process.join()
+    assert epoch != inventory_events.epoch and seq == 1
+    # a client resuming from that worker's position on this one has to re-sync
+    assert list(servicer.WatchInventory(library_pb2.WatchRequest(after_seq=seq, epoch=epoch), context)) == []
+    assert context.code == grpc.StatusCode.OUT_OF_RANGE
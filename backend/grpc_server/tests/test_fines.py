@@ -0,0 +1,78 @@
+import time
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import select, update
+from app import constants, fines, migrations
+from app.database import get_engine, get_sessionmaker_from_engine
+from app.models import Borrowing
+from app.services import book_service, borrowing_service, member_service
+
+def _overdue_loans(test_db, days_late):
+    member = member_service.create_member(test_db, name="Member", contact="m@test.com")
+    loan_ids = []
+    for i, days in enumerate(days_late):
+        book = book_service.create_book(test_db, title=f"Book {i}", author="Author")
+        loan_id = borrowing_service.borrow_book_by_id(test_db, book.id, member.id).id
+        test_db.execute(update(Borrowing).where(Borrowing.id == loan_id)
+                        .values(due_at=datetime.now(UTC) - timedelta(days=days, hours=1)))
+        loan_ids.append(loan_id)
+    test_db.commit()
+    return member, loan_ids
+
+def _amounts(test_db, loan_ids):
+    rows = test_db.execute(select(Borrowing.overdue_days, Borrowing.fine_cents)
+                           .where(Borrowing.id.in_(loan_ids)).order_by(Borrowing.id))
+    return [tuple(row) for row in rows]
+
+def test_assess_counts_full_days_and_caps_the_fine():
+    due = datetime(2026, 3, 1, tzinfo=UTC)
+    assert fines.assess(due, due + timedelta(hours=23)) == (0, 0)
+    assert fines.assess(due, due + timedelta(days=2)) == (2, 2 * constants.FINE_PER_DAY_CENTS)
+    assert fines.assess(due, due + timedelta(days=10_000)) == (10_000, constants.MAX_FINE_CENTS)
+    # naive values from the database are UTC
+    assert fines.assess(due.replace(tzinfo=None), due + timedelta(days=1))[0] == 1
+
+def test_borrow_sets_due_date(test_db):
+    member = member_service.create_member(test_db, name="Member", contact="m@test.com")
+    book = book_service.create_book(test_db, title="Book", author="Author")
+    loan = borrowing_service.borrow_book_by_id(test_db, book.id, member.id)
+    assert loan.due_at - loan.borrowed_at == timedelta(days=constants.LOAN_PERIOD_DAYS)
+
+def test_scan_updates_only_changed_loans_in_batches(test_engine, test_db, statements):
+    _, loan_ids = _overdue_loans(test_db, [3, 0, -5])
+    session_factory = get_sessionmaker_from_engine(test_engine)
+
+    assert fines.scan_overdue(session_factory, batch_size=1) == 1
+    assert _amounts(test_db, loan_ids) == [(3, 3 * constants.FINE_PER_DAY_CENTS), (0, 0), (0, 0)]
+
+    statements.clear()
+    assert fines.scan_overdue(session_factory, batch_size=10) == 0
+    assert not any(s.startswith("UPDATE") for s in statements)
+
+def test_late_return_fixes_the_final_fine(test_db, statements):
+    _, loan_ids = _overdue_loans(test_db, [4, -3])
+
+    statements.clear()
+    borrowing_service.return_borrowing_by_id(test_db, loan_ids[1])
+    assert [s.split()[0] for s in statements] == ["UPDATE", "UPDATE"]  # no assessment write when on time
+
+    borrowing_service.return_borrowings(test_db, [loan_ids[0]])
+    assert _amounts(test_db, loan_ids) == [(4, 4 * constants.FINE_PER_DAY_CENTS), (0, 0)]
+
+def test_scanner_runs_at_start_up(tmp_path):
+    # the scanner thread needs its own connection to the same database
+    engine = get_engine(f"sqlite:///{tmp_path / 'fines.db'}")
+    migrations.upgrade(engine)
+    session_factory = get_sessionmaker_from_engine(engine)
+    db = session_factory()
+    _, loan_ids = _overdue_loans(db, [2])
+    stop = fines.start_scanner(session_factory, interval=3600)
+    try:
+        for _ in range(100):
+            if _amounts(db, loan_ids) != [(0, 0)]:
+                break
+            time.sleep(0.05)
+        assert _amounts(db, loan_ids) == [(2, 2 * constants.FINE_PER_DAY_CENTS)]
+    finally:
+        stop.set()
+        db.close()
+        engine.dispose()
@@ -0,0 +1,98 @@
+from concurrent import futures
+import threading
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from app import idempotency, migrations
+from app.database import get_engine, get_sessionmaker_from_engine
+from app.idempotency import BUSY, CLAIMED, DONE, MISMATCH, IdempotencyStore
+from app.interceptors import IdempotencyInterceptor
+from app.services import book_service
+
+@pytest.fixture
+def file_sessionmaker(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'idempotency.db'}")
+    migrations.upgrade(engine)
+    try:
+        yield get_sessionmaker_from_engine(engine)
+    finally:
+        engine.dispose()
+
+def test_repeat_waits_for_the_first_call_and_gets_its_response():
+    store = IdempotencyStore(ttl=60, max_entries=10)
+    assert store.begin("CreateBook:k", "fp") == (CLAIMED, None)
+
+    outcome = []
+    repeat = threading.Thread(target=lambda: outcome.append(store.begin("CreateBook:k", "fp")))
+    repeat.start()
+    store.finish("CreateBook:k", "fp", b"response")
+    repeat.join()
+    assert outcome == [(DONE, b"response")]
+    assert store.begin("CreateBook:k", "other") == (MISMATCH, None)
+
+def test_failed_call_releases_its_key():
+    store = IdempotencyStore(ttl=60, max_entries=10, wait_seconds=0.05)
+    assert store.begin("BorrowBook:k", "fp") == (CLAIMED, None)
+    assert store.begin("BorrowBook:k", "fp") == (BUSY, None)
+    store.abort("BorrowBook:k")
+    assert store.begin("BorrowBook:k", "fp") == (CLAIMED, None)
+
+def test_database_backing_is_shared_between_processes(file_sessionmaker):
+    # two stores on one database stand in for two pre-fork workers
+    first = IdempotencyStore(ttl=60, max_entries=10, session_factory=file_sessionmaker)
+    second = IdempotencyStore(ttl=60, max_entries=10, session_factory=file_sessionmaker, wait_seconds=0.1)
+
+    assert first.begin("AddMember:k", "fp") == (CLAIMED, None)
+    assert second.begin("AddMember:k", "fp") == (BUSY, None)
+    first.finish("AddMember:k", "fp", b"member")
+    assert second.begin("AddMember:k", "fp") == (DONE, b"member")
+    assert idempotency.purge_expired(file_sessionmaker, ttl=0) == 1
+
+def test_claim_of_a_dead_call_is_taken_over_after_its_lease(file_sessionmaker):
+    crashed = IdempotencyStore(ttl=60, max_entries=10, session_factory=file_sessionmaker)
+    assert crashed.begin("BorrowBook:k", "fp") == (CLAIMED, None)
+    # the worker dies without finishing or aborting the call
+    waiting = IdempotencyStore(ttl=60, max_entries=10, session_factory=file_sessionmaker, wait_seconds=0.1)
+    assert waiting.begin("BorrowBook:k", "fp") == (BUSY, None)
+    retry = IdempotencyStore(ttl=60, max_entries=10, session_factory=file_sessionmaker, wait_seconds=5,
+                             claim_lease=0.2)
+    assert retry.begin("BorrowBook:k", "fp") == (CLAIMED, None)
+    retry.finish("BorrowBook:k", "fp", b"loan")
+    assert waiting.begin("BorrowBook:k", "fp") == (DONE, b"loan")
+
+@pytest.fixture
+def idempotent_stub(file_sessionmaker, monkeypatch):
+    from app import service_impl
+    monkeypatch.setattr(service_impl, "SessionLocal", file_sessionmaker)
+    store = IdempotencyStore(ttl=60, max_entries=10)
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=2),
+        interceptors=[IdempotencyInterceptor(store, service_impl.IDEMPOTENT_METHODS)],
+    )
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(service_impl.LibraryServiceImpl(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel)
+    finally:
+        channel.close()
+        server.stop(None)
+
+def test_retried_create_returns_the_original_book(idempotent_stub, file_sessionmaker):
+    key = (("idempotency-key", "retry-1"),)
+    book = library_pb2.Book(title="Dune", author="Herbert")
+    first = idempotent_stub.CreateBook(book, metadata=key)
+    again = idempotent_stub.CreateBook(book, metadata=key)
+    assert again.id == first.id
+
+    with pytest.raises(grpc.RpcError) as err:
+        idempotent_stub.CreateBook(library_pb2.Book(title="Emma", author="Austen"), metadata=key)
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    db = file_sessionmaker()
+    try:
+        assert len(book_service.list_books(db)) == 1
+    finally:
+        db.close()
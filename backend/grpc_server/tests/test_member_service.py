@@ -20,7 +20,7 @@ def test_list_members(test_db, sample_member_data):
 
 def test_update_member(test_db, sample_member_data):
     member = member_service.create_member(test_db, **sample_member_data)
-    updated = member_service.update_member(test_db, member, "New Name", "new@test.com")
+    updated = member_service.update_member_by_id(test_db, member.id, "New Name", "new@test.com")
     assert updated.name == "New Name"
     assert updated.contact == "new@test.com"
     assert updated.id == member.id
@@ -28,4 +28,34 @@ def test_update_member(test_db, sample_member_data):
 def test_delete_member(test_db, sample_member_data):
     member = member_service.create_member(test_db, **sample_member_data)
     member_service.delete_member(test_db, member)
-    assert member_service.get_member(test_db, member.id) is None
\ No newline at end of file
+    assert member_service.get_member(test_db, member.id) is None
+
+def test_list_members_keyset_page(test_db):
+    members = [member_service.create_member(test_db, name=f"Member {i}", contact=f"m{i}@test.com") for i in range(3)]
+
+    page = member_service.list_members(test_db, after_id=members[0].id, limit=1)
+    assert [m.id for m in page] == [members[1].id]
+    assert [m.id for m in member_service.iter_members(test_db, batch_size=1)] == [m.id for m in members]
+
+def test_import_members(test_db, sample_member_data):
+    member_service.create_member(test_db, **sample_member_data)
+    rows = [("A", "a@test.com"), ("B", sample_member_data["contact"]), ("C", "c@test.com")]
+    created, failures = member_service.import_members(test_db, rows)
+    assert created == 2
+    assert [index for index, _ in failures] == [1]
+
+def test_writes_are_one_statement_without_read_back(test_db, sample_member_data, statements):
+    member = member_service.create_member(test_db, **sample_member_data)
+    assert member.id and member.created_at
+    updated = member_service.update_member_by_id(test_db, member.id, "New Name", "new@test.com")
+    assert (updated.name, updated.contact) == ("New Name", "new@test.com")
+    assert [s.split()[0] for s in statements] == ["INSERT", "UPDATE"]
+
+def test_delete_member_leaves_tombstone(test_db, sample_member_data):
+    member = member_service.create_member(test_db, **sample_member_data)
+    member_service.delete_member(test_db, member)
+    assert member_service.get_member(test_db, member.id) is None
+    rows, _, _ = member_service.list_members_since(test_db, "", limit=10, settle_seconds=0)
+    assert [(m.id, m.deleted_at is not None) for m in rows] == [(member.id, True)]
+    # the contact is free again
+    assert member_service.create_member(test_db, **sample_member_data).id != member.id
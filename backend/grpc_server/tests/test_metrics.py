@@ -0,0 +1,69 @@
+from concurrent import futures
+import urllib.request
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from app.database import get_engine
+from app.interceptors import MetricsInterceptor
+from app.metrics import RpcMetrics, pool_collector, start_http_server
+from app.service_impl import LibraryServiceImpl
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RpcMetrics(buckets=(0.01, 0.1))
+    metrics.started("ListBooks")
+    metrics.finished("ListBooks", "OK", 0.005)
+    metrics.started("ListBooks")
+    metrics.finished("ListBooks", "OK", 0.05)
+    metrics.started("ListBooks")
+    metrics.finished("ListBooks", "INTERNAL", 3.0)
+    text = metrics.render()
+    assert 'grpc_server_handling_seconds_bucket{grpc_method="ListBooks",le="0.01"} 1' in text
+    assert 'grpc_server_handling_seconds_bucket{grpc_method="ListBooks",le="0.1"} 2' in text
+    assert 'grpc_server_handling_seconds_bucket{grpc_method="ListBooks",le="+Inf"} 3' in text
+    assert 'grpc_server_handled_total{grpc_method="ListBooks",grpc_code="INTERNAL"} 1' in text
+    assert 'grpc_server_in_flight{grpc_method="ListBooks"} 0' in text
+
+def test_pool_collector(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    metrics = RpcMetrics()
+    metrics.add_collector(pool_collector(engine))
+    with engine.connect():
+        assert "db_pool_checkedout 1" in metrics.render()
+    engine.dispose()
+
+@pytest.fixture
+def instrumented_stub():
+    metrics = RpcMetrics()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), interceptors=[MetricsInterceptor(metrics)])
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(LibraryServiceImpl(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel), metrics
+    finally:
+        channel.close()
+        server.stop(None)
+
+def test_interceptor_records_status_codes(instrumented_stub):
+    stub, metrics = instrumented_stub
+    # validation failures answer without touching the database
+    with pytest.raises(grpc.RpcError):
+        stub.CreateBook(library_pb2.Book(title="", author=""))
+    with pytest.raises(grpc.RpcError):
+        list(stub.ListBooks(library_pb2.ListRequest(page_size=10**6)).books)
+    text = metrics.render()
+    assert 'grpc_server_handled_total{grpc_method="CreateBook",grpc_code="INVALID_ARGUMENT"} 1' in text
+    assert 'grpc_server_handled_total{grpc_method="ListBooks",grpc_code="INVALID_ARGUMENT"} 1' in text
+
+def test_http_endpoint_serves_metrics():
+    metrics = RpcMetrics()
+    server = start_http_server(metrics, 0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert b"grpc_server_handled_total" in response.read()
+    finally:
+        server.shutdown()
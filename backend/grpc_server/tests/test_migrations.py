@@ -0,0 +1,85 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from app import migrations
+from app.database import get_engine
+from app.models import Base, Book, Borrowing
+from app.services import book_service, borrowing_service, sync
+
+def test_upgrade_is_idempotent(test_engine):
+    latest = migrations.load_migrations()[-1].VERSION
+    assert migrations.upgrade(test_engine) == []
+    with test_engine.connect() as conn:
+        assert migrations.current_version(conn) == latest
+
+def test_upgrade_adopts_existing_baseline(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    migrations.upgrade(engine, target=1)
+    assert migrations.upgrade(engine) == [v.VERSION for v in migrations.load_migrations()[1:]]
+    engine.dispose()
+
+def test_migrated_schema_has_every_model_index(test_db):
+    # sqlite_master rather than the inspector, which skips expression indexes
+    migrated = set(test_db.scalars(text("SELECT name FROM sqlite_master WHERE type = 'index'")))
+    declared = {ix.name for table in Base.metadata.sorted_tables for ix in table.indexes}
+    assert declared <= migrated
+
+def _plan(db, stmt):
+    sql = str(stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+@pytest.mark.parametrize("build, index", [
+    (lambda: borrowing_service.current_borrowings_select(), "ix_borrowings_open"),
+    (lambda: borrowing_service.current_borrowings_select(member_id=1), "ix_borrowings_member_loans"),
+    (lambda: borrowing_service.current_borrowings_select(book_id=1), "ix_borrowings_book_loans"),
+    (lambda: borrowing_service.has_active_borrowings_select(1), "ix_borrowings_member_loans"),
+    (lambda: borrowing_service.archive_candidates_select(datetime(2026, 1, 1), 1000), "ix_borrowings_returned_at"),
+    (lambda: borrowing_service.history_select(member_id=1, limit=51), "ix_borrowings_archive_member_id"),
+    (lambda: borrowing_service.history_select(book_id=1, limit=51), "ix_borrowings_archive_book_id"),
+], ids=["open-loans", "loans-by-member", "loans-by-book", "delete-member-check", "archive-candidates",
+        "history-by-member", "history-by-book"])
+def test_borrowing_queries_use_index(test_db, build, index):
+    plan = _plan(test_db, build())
+    assert f"INDEX {index}" in plan, plan  # USING INDEX or USING COVERING INDEX
+
+def test_available_books_query_uses_partial_index(test_db):
+    stmt = book_service._books_query(test_db, only_available=True, after_id=10).limit(50).statement
+    plan = _plan(test_db, stmt)
+    assert "USING INDEX ix_books_available" in plan, plan
+
+def test_search_walks_fts_index_in_order(test_db):
+    captured = []
+    real_scalars = test_db.scalars
+    test_db.scalars = lambda stmt: captured.append(stmt) or real_scalars(stmt)
+    book_service.search_books(test_db, "tolkien", after_id=10, limit=51)
+    plan = _plan(test_db, captured[0])
+    assert "books_fts VIRTUAL TABLE" in plan and "TEMP B-TREE" not in plan, plan
+
+def test_sync_query_walks_updated_at_index(test_db):
+    stmt = sync.changes_since_select(Book, "2026-01-01T00:00:00|42", settle_seconds=1).limit(501)
+    plan = _plan(test_db, stmt)
+    assert "USING INDEX ix_books_updated_at_id" in plan and "TEMP B-TREE" not in plan, plan
+
+@pytest.mark.parametrize("owner, index", [
+    (Borrowing.member_id, "ix_borrowings_member_loans"),
+    (Borrowing.book_id, "ix_borrowings_book_loans"),
+], ids=["member", "book"])
+def test_loan_lists_are_index_only_in_page_order(test_db, owner, index):
+    stmt = borrowing_service.loans_select(owner, 1, "open", (datetime(2026, 1, 1), 42), limit=51)
+    plan = _plan(test_db, stmt)
+    assert f"USING COVERING INDEX {index}" in plan and "TEMP B-TREE" not in plan, plan
+
+@pytest.mark.parametrize("owner, indexes", [
+    (Borrowing.member_id, ("ix_borrowings_member_loans", "ix_borrowings_archive_member_loans")),
+    (Borrowing.book_id, ("ix_borrowings_book_loans", "ix_borrowings_archive_book_loans")),
+], ids=["member", "book"])
+def test_returned_loan_lists_read_both_tables_index_only(test_db, owner, indexes):
+    # each side stops at the page size, so the merge sorts at most two pages
+    stmt = borrowing_service.loans_select(owner, 1, "returned", (datetime(2026, 1, 1), 42), limit=51)
+    plan = _plan(test_db, stmt)
+    assert all(f"USING COVERING INDEX {index}" in plan for index in indexes), plan
+
+def test_overdue_query_walks_open_due_index(test_db):
+    stmt = borrowing_service.overdue_loans_select(datetime(2026, 1, 1), (datetime(2025, 12, 1), 42), limit=51)
+    plan = _plan(test_db, stmt)
+    assert "INDEX ix_borrowings_open_due" in plan and "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,51 @@
+import os
+import threading
+import time
+from app.prefork import Supervisor
+
+
+def _crash(index):
+    os._exit(1)
+
+
+def _sleep(index):
+    time.sleep(60)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _run(supervisor):
+    thread = threading.Thread(target=supervisor.run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_supervisor_restarts_crashed_workers():
+    supervisor = Supervisor(_crash, workers=2, restart_delay=0, poll_interval=0.05)
+    thread = _run(supervisor)
+    assert _wait_for(lambda: supervisor.restarts >= 4)
+    supervisor.stop()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert supervisor.pids() == []
+
+
+def test_supervisor_stop_terminates_workers():
+    supervisor = Supervisor(_sleep, workers=2, grace=5, poll_interval=0.05)
+    thread = _run(supervisor)
+    assert _wait_for(lambda: len(supervisor.pids()) == 2)
+    pids = supervisor.pids()
+    started = time.monotonic()
+    supervisor.stop()
+    thread.join(10)
+    assert time.monotonic() - started < 5
+    assert supervisor.restarts == 0
+    for pid in pids:
+        assert not os.path.exists(f"/proc/{pid}")
@@ -0,0 +1,104 @@
+from concurrent import futures
+import grpc
+import pytest
+import generated.library_pb2 as library_pb2
+import generated.library_pb2_grpc as library_pb2_grpc
+from sqlalchemy import select
+from app import migrations
+from app.cache import catalog_cache
+from app.database import get_engine, get_sessionmaker_from_engine, replica_reads
+from app.interceptors import CALLER_METADATA_KEY, ReplicaRoutingInterceptor
+from app.models import Book
+
+@pytest.fixture
+def primary_and_replica(tmp_path):
+    # two SQLite files stand in for a primary and its replica; they hold
+    # different rows so a test can tell where a read went
+    engines = [get_engine(f"sqlite:///{tmp_path / name}") for name in ("primary.db", "replica.db")]
+    for engine, title in zip(engines, ("On the primary", "On the replica")):
+        migrations.upgrade(engine)
+        db = get_sessionmaker_from_engine(engine)()
+        db.add(Book(title=title, author="Someone"))
+        db.commit()
+        db.close()
+    try:
+        yield engines
+    finally:
+        for engine in engines:
+            engine.dispose()
+
+def _titles(db):
+    return db.scalars(select(Book.title)).all()
+
+def test_routing_session_reads_from_a_replica_only_when_allowed(primary_and_replica):
+    primary, replica = primary_and_replica
+    db = get_sessionmaker_from_engine(primary, [replica])()
+    try:
+        assert _titles(db) == ["On the primary"]
+    finally:
+        db.close()
+
+    token = replica_reads.set(True)
+    try:
+        db = get_sessionmaker_from_engine(primary, [replica])()
+        try:
+            assert _titles(db) == ["On the replica"]
+            # writes still reach the primary
+            db.add(Book(title="Written", author="Someone"))
+            db.commit()
+        finally:
+            db.close()
+    finally:
+        replica_reads.reset(token)
+    db = get_sessionmaker_from_engine(primary)()
+    try:
+        assert _titles(db) == ["On the primary", "Written"]
+    finally:
+        db.close()
+
+class FakeVersions:
+    def __init__(self):
+        self.since = {"books": 1000.0, "members": 1000.0}
+
+    def seconds_since_write(self, namespace):
+        return self.since[namespace]
+
+@pytest.fixture
+def routed_stub(primary_and_replica, monkeypatch):
+    from app import service_impl
+    primary, replica = primary_and_replica
+    monkeypatch.setattr(service_impl, "SessionLocal", get_sessionmaker_from_engine(primary, [replica]))
+    versions = FakeVersions()
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=2),
+        interceptors=[ReplicaRoutingInterceptor(service_impl.REPLICA_METHODS, max_lag=60, versions=versions)],
+    )
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(service_impl.LibraryServiceImpl(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    try:
+        yield library_pb2_grpc.LibraryServiceStub(channel), versions
+    finally:
+        channel.close()
+        server.stop(None)
+
+def _search(stub, caller):
+    books = stub.SearchBooks(library_pb2.SearchBooksRequest(query="On the"), metadata=((CALLER_METADATA_KEY, caller),))
+    return [b.title for b in books.books]
+
+def test_callers_read_their_own_writes_from_the_primary(routed_stub):
+    stub, versions = routed_stub
+    assert _search(stub, "alice") == ["On the replica"]
+
+    stub.CreateBook(library_pb2.Book(title="New", author="Someone"), metadata=((CALLER_METADATA_KEY, "alice"),))
+    assert _search(stub, "alice") == ["On the primary"]
+    assert _search(stub, "bob") == ["On the replica"]
+
+def test_catalog_lists_stay_on_the_primary_until_replicas_caught_up(routed_stub):
+    stub, versions = routed_stub
+    assert [b.title for b in stub.ListBooks(library_pb2.ListRequest()).books] == ["On the replica"]
+    # a write a second ago: the list (and the cache entry it replaces) must come from the primary
+    versions.since["books"] = 1.0
+    catalog_cache.invalidate("books")
+    assert [b.title for b in stub.ListBooks(library_pb2.ListRequest()).books] == ["On the primary"]
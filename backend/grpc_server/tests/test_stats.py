@@ -0,0 +1,52 @@
+import multiprocessing
+import generated.library_pb2 as library_pb2
+from app.services import book_service, member_service, borrowing_service
+from app.stats import LibraryStats, library_stats
+
+def test_counters_track_writes_without_drift(test_db):
+    library_stats.reconcile(test_db)
+    books = [book_service.create_book(test_db, title=f"Book {i}", author="Author") for i in range(4)]
+    book_service.import_books(test_db, [("Imported", "Author"), ("Book 0", "Author")])
+    alice = member_service.create_member(test_db, name="Alice", contact="alice@test.com")
+    bob = member_service.create_member(test_db, name="Bob", contact="bob@test.com")
+
+    first = borrowing_service.borrow_book_by_id(test_db, books[0].id, alice.id)
+    borrowing_service.borrow_books(test_db, [books[1].id, books[2].id], bob.id)
+    borrowing_service.borrow_book_by_id(test_db, books[1].id, alice.id)  # already out: no change
+    borrowing_service.return_borrowing_by_id(test_db, first.id)
+    book_service.delete_book_by_id(test_db, books[3].id)
+
+    stats = library_stats.snapshot()
+    assert (stats["books"], stats["available_books"], stats["members"], stats["open_loans"]) == (4, 2, 2, 2)
+    assert stats["loans_per_member"] == 1.0
+    assert library_stats.reconcile(test_db) == {"books": 0, "available_books": 0, "members": 0, "open_loans": 0}
+    assert library_stats.snapshot()["members_with_loans"] == 1
+    assert borrowing_service.count_open_loans(test_db, bob.id) == 2
+
+def test_reconcile_corrects_drift(test_db):
+    book_service.create_book(test_db, title="Book", author="Author")
+    stats = LibraryStats()
+    assert stats.reconcile(test_db)["books"] == 1
+    assert stats.snapshot()["books"] == 1 and stats.reconciled_at is not None
+
+def test_get_library_stats_rpc(servicer, context, test_db):
+    library_stats.reconcile(test_db)
+    book_service.create_book(test_db, title="Book", author="Author")
+    response = servicer.GetLibraryStats(library_pb2.LibraryStatsRequest(), context)
+    assert response.books == 1 and response.available_books == 1
+    assert response.reconciled_at
+
+def test_get_library_stats_counts_member_loans(servicer, context, test_db):
+    book = book_service.create_book(test_db, title="Book", author="Author")
+    member = member_service.create_member(test_db, name="Alice", contact="alice@test.com")
+    borrowing_service.borrow_book_by_id(test_db, book.id, member.id)
+    response = servicer.GetLibraryStats(library_pb2.LibraryStatsRequest(member_id=member.id), context)
+    assert response.member_open_loans == 1
+
+def test_counters_are_shared_with_forked_workers():
+    stats = LibraryStats()
+    worker = multiprocessing.get_context("fork").Process(target=stats.borrowed, args=(3,))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+    assert stats.snapshot()["open_loans"] == 3
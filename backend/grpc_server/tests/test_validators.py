@@ -29,4 +29,15 @@ def test_validate_positive_int():
     with pytest.raises(ValueError):
         validators.validate_positive_int("test", -1)
     with pytest.raises(ValueError):
-        validators.validate_positive_int("test", "123")  # wrong type
\ No newline at end of file
+        validators.validate_positive_int("test", "123")  # wrong type
+
+
+def test_validate_id_list():
+    validators.validate_id_list("ids", [1, 2, 3], max_items=3)
+
+    with pytest.raises(ValueError):
+        validators.validate_id_list("ids", [], max_items=3)
+    with pytest.raises(ValueError):
+        validators.validate_id_list("ids", [1, 2, 3, 4], max_items=3)
+    with pytest.raises(ValueError):
+        validators.validate_id_list("ids", [1, 0], max_items=3)
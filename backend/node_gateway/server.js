@@ -1,3 +1,4 @@
+import { randomUUID } from "crypto";
 import express from "express";
 import cors from "cors";
 import dotenv from "dotenv";
@@ -26,13 +27,41 @@ const client = new libraryProto.LibraryService(
 
 const app = express();
 app.use(express.json());
-app.use(cors());
+app.use(cors({ exposedHeaders: ["ETag"] }));
+
+// Conditional list reads: the catalog version is the ETag, so a matching
+// If-None-Match is answered 304 without the backend touching the database.
+function listWithVersion(req, res, rpc, field) {
+  const ifVersion = (req.get("If-None-Match") || "").replace(/^W\//, "").replace(/"/g, "");
+  client[rpc]({ if_version: ifVersion }, (err, response) => {
+    if (err) return res.status(500).json({ error: err.details || err.message });
+    res.set("ETag", `"${response.version}"`);
+    if (response.not_modified) return res.status(304).end();
+    res.json(response[field]);
+  });
+}
+
+// Create/borrow calls carry an idempotency key (the client's Idempotency-Key
+// header, or a fresh one) and are retried with it on transient errors: the
+// server answers a retry of a call that did go through with its first response.
+const RETRYABLE = new Set([grpc.status.UNAVAILABLE, grpc.status.ABORTED]);
+function callIdempotent(req, rpc, request, callback, attempts = 3) {
+  const metadata = new grpc.Metadata();
+  metadata.set("idempotency-key", req.get("Idempotency-Key") || randomUUID());
+  const attempt = (left) => {
+    client[rpc](request, metadata, (err, response) => {
+      if (err && RETRYABLE.has(err.code) && left > 1) return setTimeout(() => attempt(left - 1), 200);
+      callback(err, response);
+    });
+  };
+  attempt(attempts);
+}
 
 // ------------------- BOOK ROUTES -------------------
 
 // Create a new book
 app.post("/books", (req, res) => {
-  client.CreateBook(req.body, (err, response) => {
+  callIdempotent(req, "CreateBook", req.body, (err, response) => {
     if (err) return res.status(500).json({ error: err.details || err.message });
     res.json(response);
   });
@@ -40,9 +69,21 @@ app.post("/books", (req, res) => {
 
 // List all books
 app.get("/books", (req, res) => {
-  client.ListBooks({}, (err, response) => {
-    if (err) return res.status(500).json({ error: err.details || err.message });
-    res.json(response.books); // return the array of books
+  listWithVersion(req, res, "ListBooks", "books");
+});
+
+// Search books by title/author (substring, or prefix=true)
+app.get("/books/search", (req, res) => {
+  const grpcRequest = {
+    query: req.query.q || "",
+    prefix: req.query.prefix === "true",
+    available_only: req.query.available_only === "true",
+    page_size: Number(req.query.page_size || 0),
+    after_id: Number(req.query.after_id || 0),
+  };
+  client.SearchBooks(grpcRequest, (err, response) => {
+    if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+    res.json(response);
   });
 });
 
@@ -84,7 +125,7 @@ app.post("/borrow", (req, res) => {
     member_id: Number(req.body.member_id),
   };
 
-  client.BorrowBook(grpcRequest, (err, response) => {
+  callIdempotent(req, "BorrowBook", grpcRequest, (err, response) => {
     if (err) {
       console.error("gRPC error:", err);
       return res.status(500).json({ error: err.details || "Borrow failed" });
@@ -98,7 +139,7 @@ app.post("/borrow", (req, res) => {
 // Add new member
 app.post("/members", (req, res) => {
   const grpcRequest = { name: req.body.name, contact: req.body.contact };
-  client.AddMember(grpcRequest, (err, response) => {
+  callIdempotent(req, "AddMember", grpcRequest, (err, response) => {
     if (err) return res.status(500).json({ error: err.details || err.message });
     res.json(response);
   });
@@ -106,10 +147,7 @@ app.post("/members", (req, res) => {
 
 // List all members
 app.get("/members", (req, res) => {
-  client.ListMembers({}, (err, response) => {
-    if (err) return res.status(500).json({ error: err.details || err.message });
-    res.json(response.members);
-  });
+  listWithVersion(req, res, "ListMembers", "members");
 });
 
 // Update member
@@ -147,6 +185,56 @@ app.get("/borrowed", (req, res) => {
   });
 });
 
+// Loan history (open, returned and archived), paged on borrowing id
+app.get("/history", (req, res) => {
+  const grpcRequest = {
+    member_id: Number(req.query.member_id || 0),
+    book_id: Number(req.query.book_id || 0),
+    page_size: Number(req.query.page_size || 0),
+    after_id: Number(req.query.after_id || 0),
+  };
+  client.GetBorrowingHistory(grpcRequest, (err, response) => {
+    if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+    res.json(response);
+  });
+});
+
+// One member's / one book's loans, newest first; status=open|returned, paged by cursor
+for (const [path, rpc, field] of [["/members/:id/loans", "ListMemberLoans", "member_id"], ["/books/:id/loans", "ListBookLoans", "book_id"]]) {
+  app.get(path, (req, res) => {
+    const grpcRequest = {
+      [field]: Number(req.params.id),
+      status: req.query.status || "",
+      page_size: Number(req.query.page_size || 0),
+      cursor: req.query.cursor || "",
+    };
+    client[rpc](grpcRequest, (err, response) => {
+      if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+      res.json(response);
+    });
+  });
+}
+
+// Open loans past due, longest overdue first
+app.get("/overdue", (req, res) => {
+  const grpcRequest = { page_size: Number(req.query.page_size || 0), cursor: req.query.cursor || "" };
+  client.ListOverdueLoans(grpcRequest, (err, response) => {
+    if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+    res.json(response);
+  });
+});
+
+// Fines owed by a member
+app.get("/members/:id/fines", (req, res) => {
+  client.GetMemberFines({ member_id: Number(req.params.id) }, (err, response) => {
+    if (err) {
+      if (err.code === grpc.status.NOT_FOUND) return res.status(404).json({ error: err.details });
+      return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+    }
+    res.json(response);
+  });
+});
+
 // Return a borrowed book
 app.post("/return", (req, res) => {
   const grpcRequest = { borrowing_id: Number(req.body.borrowing_id) };
@@ -158,10 +246,61 @@ app.post("/return", (req, res) => {
 
 // List all available books
 app.get("/availablebooks", (req, res) => {
-  client.ListAvailableBooks({}, (err, response) => {
-    if (err) return res.status(500).json({ error: err.details || err.message });
-    res.json(response.books); // return the array of books
+  listWithVersion(req, res, "ListAvailableBooks", "books");
+});
+
+// Delta sync: rows changed (and ids deleted) since the cursor of the previous call
+for (const [path, rpc] of [["/books/changes", "ListBooksSince"], ["/members/changes", "ListMembersSince"]]) {
+  app.get(path, (req, res) => {
+    const grpcRequest = { cursor: req.query.cursor || "", page_size: Number(req.query.page_size || 0) };
+    client[rpc](grpcRequest, (err, response) => {
+      if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+      res.json(response);
+    });
+  });
+}
+
+// Library counters (books, availability, members, open loans)
+app.get("/stats", (req, res) => {
+  client.GetLibraryStats({ member_id: Number(req.query.member_id || 0) }, (err, response) => {
+    if (err) return res.status(err.code === grpc.status.INVALID_ARGUMENT ? 400 : 500).json({ error: err.details || err.message });
+    res.json(response);
+  });
+});
+
+// Suggested wait before reopening /events after it failed, by gRPC status; the
+// client doubles it on each failure in a row. The watcher cap is the slow one.
+const WATCH_RETRY_MS = { [grpc.status.OUT_OF_RANGE]: 0, [grpc.status.RESOURCE_EXHAUSTED]: 5000 };
+const DEFAULT_WATCH_RETRY_MS = 1000;
+
+// Inventory change feed as Server-Sent Events. The event id is "epoch:seq", so a
+// reconnecting EventSource resumes via Last-Event-ID. "ready" means a new feed
+// is established and the client should list now; "resync" means the feed
+// failed and may have lost events, so the client should re-list and reopen
+// it after retry_ms.
+app.get("/events", (req, res) => {
+  const [epoch, seq] = (req.get("Last-Event-ID") || "").split(":");
+  const entities = req.query.entities ? String(req.query.entities).split(",") : [];
+  res.set({ "Content-Type": "text/event-stream", "Cache-Control": "no-cache", Connection: "keep-alive" });
+  res.flushHeaders();
+
+  const call = client.WatchInventory({ after_seq: seq || 0, epoch: seq ? epoch : "", entities });
+  // the server sends its headers once the stream's position is fixed
+  call.on("metadata", () => {
+    if (!seq) res.write("event: ready\ndata: {}\n\n");
+  });
+  call.on("data", (event) => {
+    res.write(`id: ${event.epoch}:${event.seq}\ndata: ${JSON.stringify(event)}\n\n`);
+  });
+  call.on("error", (err) => {
+    if (err.code !== grpc.status.CANCELLED) {
+      const retryMs = WATCH_RETRY_MS[err.code] ?? DEFAULT_WATCH_RETRY_MS;
+      res.write(`event: resync\ndata: ${JSON.stringify({ retry_ms: retryMs })}\n\n`);
+    }
+    res.end();
   });
+  call.on("end", () => res.end());
+  req.on("close", () => call.cancel());
 });
 
 // Start server
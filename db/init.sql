@@ -1,3 +1,7 @@
+-- Baseline schema (migration 0001 in backend/grpc_server/app/migrations).
+-- Everything after the baseline is applied by the gRPC server's migrations
+-- on start-up; do not add schema changes here.
+
 CREATE TABLE IF NOT EXISTS books (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -45,4 +45,35 @@ export const returnBook = async (data) => handleRequest(api.post("/return", data
 
 export const getAvailableBooks = async () => handleRequest(api.get("/availablebooks"));
 
-
+// Longest wait before reopening a feed the server keeps refusing
+const MAX_WATCH_BACKOFF_MS = 60000;
+
+// Live inventory changes (Server-Sent Events from the gateway's /events).
+// onResync runs whenever the caller should (re-)list: once a new feed is
+// established ("ready"), so no write between the list and the feed is missed,
+// and whenever the feed broke and may have lost events ("resync"). After a
+// resync the feed reopens, backing off while the server asks it to.
+// Returns a function that stops watching.
+export const watchInventory = (entities, onEvent, onResync) => {
+  const url = `${process.env.REACT_APP_API_BASE_URL}/events?entities=${entities.join(",")}`;
+  let source, timer;
+  let failures = 0;
+  let listed = false;
+  const relist = () => { listed = true; onResync(); };
+  const open = () => {
+    source = new EventSource(url);
+    source.onmessage = (e) => onEvent(JSON.parse(e.data));
+    source.addEventListener("ready", () => { failures = 0; relist(); });
+    source.addEventListener("resync", (e) => {
+      source.close();
+      relist();
+      const { retry_ms: retryMs = 0 } = JSON.parse(e.data || "{}");
+      failures += 1;
+      timer = setTimeout(open, retryMs && Math.min(MAX_WATCH_BACKOFF_MS, retryMs * 2 ** (failures - 1)));
+    });
+    // gateway unreachable: show the list anyway while EventSource keeps retrying
+    source.onerror = () => { if (!listed) relist(); };
+  };
+  open();
+  return () => { clearTimeout(timer); source.close(); };
+};
@@ -2,9 +2,16 @@ import React from "react";
 import EntityForm from "./EntityForm.jsx";
 import CrudTable from "./CrudTable.jsx";
 import "../styles/Library.css";
-import { getBooks, createBook, updateBook, deleteBook } from "../api";
+import { getBooks, createBook, updateBook, deleteBook, watchInventory } from "../api";
 import { toast } from "react-toastify";
 
+// Apply one WatchInventory book event to the list held in state
+const applyBookEvent = (books, event) => {
+  if (event.action === "deleted") return books.filter(b => b.id !== event.id);
+  if (books.some(b => b.id === event.id)) return books.map(b => (b.id === event.id ? event.book : b));
+  return [...books, event.book];
+};
+
 export default function Books() {
   // reuse logic from BookList.jsx
   const [books, setBooks] = React.useState([]);
@@ -29,7 +36,12 @@ export default function Books() {
     }
   };
 
-  React.useEffect(() => { fetchBooks(); }, []);
+  // watch first and list once the feed is established (and again whenever it restarts), so no
+  // write lands between the list and the feed; other clients' writes then arrive as events
+  React.useEffect(
+    () => watchInventory(["book"], (event) => setBooks(prev => applyBookEvent(prev, event)), fetchBooks),
+    [],
+  );
 
   const handleAddBook = async (values) => {
     setIsAdding(true);